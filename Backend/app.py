@@ -4,12 +4,45 @@
 # 2. Manual Build - User selects each component manually
 # 3. Performance Prediction - Predicts gaming FPS and performance
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, g, render_template, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-import pandas as pd
-import joblib
+import itertools
+import json
+import logging
+import math
 import os
+import threading
+import time
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from asset_snapshot import SNAPSHOT_DIR, read_dataset, snapshot_path
+from build_solver import (BuildSolver, COMPONENTS, DEFAULT_TIME_LIMIT, OBJECTIVES,
+                          compatible_case_form_factors, component_index)
+from build_validation import iter_validate, summarize
+from catalog_cache import CatalogCache, DEFAULT_TTL
+from catalog_query import (CatalogQuery, CatalogQueryError, DEFAULT_PAGE_CACHE_SIZE, PageCache,
+                           choose_encoding, encode_body, etag_matches, make_etag)
+from compact_dataset import compact_builds
+from component_store import FirestoreStore, SQLiteStore
+from fps_lookup import FpsLookupIndex, NearestFpsIndex
+from hardware_resolver import HardwareNameResolver
+from metrics import CACHE_EVENTS, NAME_MATCHES, REGISTRY, REQUEST_SECONDS, STAGE_SECONDS
+from model_runtime import COMPILED_DIR, compiled_path, is_current, load_compiled, load_pickle
+from prediction_table import TABLE_DIR, PredictionTable, input_fingerprint
+from recommendation_index import RecommendationIndex, USE_CASE_LOGIC
+from response_cache import DEFAULT_CACHE_SIZE, ResponseCache, SQLiteCacheBackend
+from startup import AssetLoader
+from streaming import NDJSON_MIMETYPE, compress_chunks, ndjson_chunks
+from upgrade_analyzer import PART_KINDS, UpgradeCandidates, gain_per_dollar, rank_upgrades
+
+# Leveled logging: LOG_LEVEL=DEBUG shows per-request details (name
+# matches, CSV matches, model fallbacks); at INFO they cost nothing
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
+                    format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+logger = logging.getLogger('unicorn_pc')
 
 # Try to import Firebase for Manual Build database
 # Firebase stores all hardware components (CPU, GPU, RAM, etc.)
@@ -19,49 +52,276 @@ try:
     FIREBASE_AVAILABLE = True
 except ImportError:
     FIREBASE_AVAILABLE = False
-    print("Warning: Firebase not available. Manual Build will use mock data.")
+    logger.warning("Firebase not available. Manual Build will use mock data.")
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider with serialization time recorded"""
+
+    def dumps(self, obj, **kwargs):
+        with STAGE_SECONDS.time(stage='json_serialization'):
+            return super().dumps(obj, **kwargs)
 
 app = Flask(__name__)
+app.json = TimedJSONProvider(app)
 CORS(app)
 
+# Streamed NDJSON responses (see streaming.py): opt in per request with
+# "Accept: application/x-ndjson"
+def wants_ndjson():
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+# Serializes like jsonify (compact, same key order and types); one encoder
+# for every line instead of a new one per json.dumps call
+ndjson_dumps = json.JSONEncoder(default=app.json.default, ensure_ascii=app.json.ensure_ascii,
+                                sort_keys=app.json.sort_keys, separators=(',', ':')).encode
+
+def ndjson_response(rows, encoding=None):
+    """Streamed response for an iterable of rows (compressed if encoding is given)"""
+    response = Response(stream_with_context(compress_chunks(ndjson_chunks(rows, ndjson_dumps), encoding)),
+                        mimetype=NDJSON_MIMETYPE)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
 # ============================================================================
 # DATA LOADING - Load all necessary files
 # ============================================================================
+# Every dataset, index, model and database client is a named asset (see
+# startup.py). ASSET_LOADING picks how they load:
+#   eager      - all in parallel before the app starts serving (default)
+#   background - all in parallel while the app already serves (/readyz
+#                reports progress)
+#   lazy       - each one on first use
+# Request handlers fetch what they need with assets.get(name).
+
+ASSET_LOADING = os.environ.get('ASSET_LOADING', 'eager')
+assets = AssetLoader(max_workers=int(os.environ.get('ASSET_LOADER_THREADS', 4)))
+
+# CSV datasets are read from their compiled snapshot (scripts/compile_assets.py)
+# when it is newer than the CSV: no parsing, and memory-mapped so workers
+# share one copy. ASSET_SNAPSHOT=off always reads the CSVs.
+ASSET_SNAPSHOT_DIR = os.environ.get('ASSET_SNAPSHOT_DIR', SNAPSHOT_DIR)
+USE_ASSET_SNAPSHOT = os.environ.get('ASSET_SNAPSHOT', 'auto') != 'off'
+
+def load_dataset(csv_path):
+    return read_dataset(csv_path, ASSET_SNAPSHOT_DIR, use_snapshot=USE_ASSET_SNAPSHOT)
+
+def dataset_sources(csv_path):
+    """Files a dataset can be loaded from (for the asset version tag)"""
+    return [csv_path, os.path.join(snapshot_path(csv_path, ASSET_SNAPSHOT_DIR), 'manifest.json')]
 
 # Load dataset for AI recommendations (contains pre-built PC configurations)
-try:
-    intelligent_df = pd.read_csv('data/final_ruleset_data.csv')
-    print("SUCCESS: Intelligent Build data loaded successfully")
-except FileNotFoundError:
-    print("ERROR: 'data/final_ruleset_data.csv' not found")
-    intelligent_df = None
+# Held in the compact layout of compact_dataset.py: categorical text
+# columns, narrow ints and the use-case flags packed into one bit column
+def load_intelligent_df():
+    try:
+        df, source = load_dataset('data/final_ruleset_data.csv')
+        df = compact_builds(df)
+        logger.info("Intelligent Build data loaded (%s)", source)
+        return df
+    except FileNotFoundError:
+        logger.error("'data/final_ruleset_data.csv' not found")
+        raise
 
-# Also load the full dataset for exact FPS lookups
-try:
-    fps_lookup_df = pd.read_csv('data/final_ruleset_data.csv')
-    print("SUCCESS: FPS lookup data loaded successfully")
-except FileNotFoundError:
-    print("ERROR: FPS lookup data not found")
-    fps_lookup_df = None
+# Pre-sorted partitions so recommendations don't scan the whole dataset
+def build_recommendation_index(intelligent_df):
+    return RecommendationIndex(intelligent_df) if intelligent_df is not None else None
+
+# Index the same dataset for exact FPS lookups (no second copy of the CSV)
+def build_fps_lookup_index(intelligent_df):
+    return FpsLookupIndex(intelligent_df) if intelligent_df is not None else None
+
+# ...and for nearest-neighbour FPS of hardware that isn't in it exactly
+def build_fps_nearest_index(intelligent_df):
+    return NearestFpsIndex(intelligent_df) if intelligent_df is not None else None
 
 # Load machine learning models for performance prediction
-# These models predict FPS, gaming suitability, and rendering performance
+# These models predict FPS, gaming suitability, and rendering performance.
+# A compiled copy (scripts/compile_models.py) is used while it is newer than
+# the .pkl: same predictions, evaluated with NumPy only, so sklearn is never
+# imported. COMPILED_MODELS=off always unpickles.
 MODEL_DIR = 'models'
-fps_model = gaming_model = render_model = None
-try:
-    # Try loading with protocol 4 for better compatibility
-    import pickle
-    with open(os.path.join(MODEL_DIR, 'fps_model.pkl'), 'rb') as f:
-        fps_model = pickle.load(f)
-    with open(os.path.join(MODEL_DIR, 'gaming_model.pkl'), 'rb') as f:
-        gaming_model = pickle.load(f)
-    with open(os.path.join(MODEL_DIR, 'render_model.pkl'), 'rb') as f:
-        render_model = pickle.load(f)
-    print("SUCCESS: ML Models loaded successfully (Python 3.13 compatible)")
-except Exception as e:
-    print(f"WARNING: Error loading models: {e}")
-    print("WARNING: Performance prediction will use simplified calculations")
-    fps_model = gaming_model = render_model = None
+COMPILED_MODEL_DIR = os.environ.get('COMPILED_MODEL_DIR', COMPILED_DIR)
+USE_COMPILED_MODELS = os.environ.get('COMPILED_MODELS', 'auto') != 'off'
+
+def model_sources(name):
+    """Files a model can be loaded from (for the asset version tag)"""
+    pkl_path = os.path.join(MODEL_DIR, f'{name}.pkl')
+    return [pkl_path, compiled_path(pkl_path, COMPILED_MODEL_DIR)]
+
+def model_loader(name):
+    pkl_path, path = model_sources(name)
+    def load_model():
+        try:
+            if USE_COMPILED_MODELS and is_current(path, pkl_path):
+                model = load_compiled(path)
+                logger.info("ML model '%s' loaded (compiled)", name)
+                return model
+            model = load_pickle(pkl_path)
+            logger.info("ML model '%s' loaded", name)
+            return model
+        except Exception:
+            logger.warning("Performance prediction will use simplified calculations")
+            raise
+    return load_model
+
+# Precomputed /api/performance/predict answers for every known CPU x GPU x
+# RAM combination (scripts/build_prediction_table.py). Only used while it
+# was built from the current datasets, models and prediction code; other
+# builds, and every build when there is no table, are predicted live.
+# PREDICTION_TABLE=off always predicts live.
+PREDICTION_TABLE_DIR = os.environ.get('PREDICTION_TABLE_DIR', TABLE_DIR)
+USE_PREDICTION_TABLE = os.environ.get('PREDICTION_TABLE', 'auto') != 'off'
+PREDICTION_TABLE_DATA = [
+    'data/final_ruleset_data.csv', 'data/hardware_lookup.csv',
+] + model_sources('fps_model') + model_sources('gaming_model')
+# asset_snapshot.py and compact_dataset.py read and reshape the dataset the
+# predictions look FPS up in, fps_lookup.py computes the measured/nearest-
+# neighbour FPS, model_runtime.py evaluates the compiled models
+PREDICTION_TABLE_INPUTS = [
+    'asset_snapshot.py', 'compact_dataset.py', 'fps_lookup.py', 'model_runtime.py',
+] + PREDICTION_TABLE_DATA
+# The prediction code in app.py (multipliers, suitability formula, ...).
+# Only these definitions are fingerprinted, so other edits keep the table.
+PREDICTION_TABLE_CODE = {'app.py': [
+    'find_exact_fps_all_resolutions', 'CSV_RESOLUTIONS', 'find_measured_fps_all_resolutions',
+    'bottleneck_cpu_weight', 'calculate_bottleneck', 'MAX_FPS_FOR_SUITABILITY', 'MAX_CPU_SCORE',
+    'MAX_GPU_SCORE', 'MAX_RAM_GB', 'RESOLUTION_FPS_MULTIPLIERS', 'PREDICTION_RESOLUTIONS',
+    '_predict_uncached', 'resolution_fps', '_build_prediction',
+]}
+
+def prediction_table_fingerprint():
+    return input_fingerprint(PREDICTION_TABLE_INPUTS, PREDICTION_TABLE_CODE)
+
+def load_prediction_table():
+    if not USE_PREDICTION_TABLE:
+        return None
+    if not os.path.exists(os.path.join(PREDICTION_TABLE_DIR, 'manifest.json')):
+        logger.info("No prediction table in %s, predictions are computed live", PREDICTION_TABLE_DIR)
+        return None
+    table = PredictionTable(PREDICTION_TABLE_DIR)
+    if table.fingerprint != prediction_table_fingerprint():
+        logger.warning("Prediction table %s is out of date, predictions are computed live "
+                       "(run scripts/build_prediction_table.py)", PREDICTION_TABLE_DIR)
+        return None
+    logger.info("Prediction table loaded (%s builds)", len(table))
+    return table
+
+# Load hardware scores database (contains performance scores for CPUs and GPUs)
+# Used to calculate performance predictions
+def load_hw_db():
+    try:
+        lookup_df, _ = load_dataset('data/hardware_lookup.csv')
+        lookup_df['clean_name'] = lookup_df['name'].astype(str).str.lower().str.replace(" ", "")
+        hw_db = lookup_df.set_index('clean_name')['score'].to_dict()
+        logger.info("Hardware lookup database loaded")
+        return hw_db
+    except FileNotFoundError:
+        logger.error("'data/hardware_lookup.csv' not found")
+        raise
+
+def build_hw_resolver(hw_db):
+    return HardwareNameResolver(hw_db or {})
+
+# Priced CPU/GPU candidates for the upgrade analyzer
+def build_upgrade_candidates(intelligent_df, hw_db):
+    return UpgradeCandidates(intelligent_df, hw_db) if intelligent_df is not None and hw_db else None
+
+# Initialize Firebase connection for Manual Build Mode
+# Firebase stores all hardware components in cloud database.
+# Loaded per process: the gRPC client must not be shared across fork().
+def connect_firebase():
+    if not FIREBASE_AVAILABLE:
+        logger.warning("Run: pip install firebase-admin")
+        raise RuntimeError("firebase-admin package not installed")
+    cred_path = 'serviceAccountKey.json'
+    if not os.path.exists(cred_path):
+        logger.warning("Manual Build will NOT work without Firebase")
+        raise FileNotFoundError("serviceAccountKey.json not found")
+    try:
+        cred = credentials.Certificate(cred_path)
+        # One Firebase app per process (a forked worker can't reuse its parent's)
+        firebase_app = firebase_admin.initialize_app(cred, name=f'unicorn-pc-{os.getpid()}')
+        db = firestore.client(firebase_app)
+    except Exception:
+        logger.warning("Manual Build will NOT work without Firebase")
+        raise
+    logger.info("Firebase Firestore connected, Manual Build will use the real database")
+    return db
+
+# Component store for Manual Build Mode
+# CATALOG_BACKEND: "firestore", "sqlite" or "auto" (Firestore when connected,
+# otherwise the local SQLite snapshot made by scripts/catalog_snapshot.py)
+CATALOG_BACKEND = os.environ.get('CATALOG_BACKEND', 'auto')
+CATALOG_SQLITE_PATH = os.environ.get('CATALOG_SQLITE_PATH', 'data/catalog.sqlite')
+
+def open_catalog(db):
+    """Pick the component store that serves /api/manual/*"""
+    if CATALOG_BACKEND in ('firestore', 'auto') and db:
+        # In-memory cache of the Firestore catalog so Manual Build filters
+        # run locally instead of streaming a collection on every request
+        store = FirestoreStore(db, version_doc=os.environ.get('CATALOG_VERSION_DOC') or None)
+        return CatalogCache(store, ttl=float(os.environ.get('CATALOG_CACHE_TTL', DEFAULT_TTL)))
+    if CATALOG_BACKEND in ('sqlite', 'auto') and os.path.exists(CATALOG_SQLITE_PATH):
+        logger.info("Manual Build will use local catalog %s", CATALOG_SQLITE_PATH)
+        return SQLiteStore(CATALOG_SQLITE_PATH)
+    raise RuntimeError(f"No catalog backend available (CATALOG_BACKEND={CATALOG_BACKEND})")
+
+assets.register('intelligent_df', load_intelligent_df, required=True,
+                sources=dataset_sources('data/final_ruleset_data.csv'))
+assets.register('recommendation_index', build_recommendation_index, depends_on=['intelligent_df'], required=True)
+assets.register('fps_lookup_index', build_fps_lookup_index, depends_on=['intelligent_df'], required=True)
+assets.register('fps_nearest_index', build_fps_nearest_index, depends_on=['intelligent_df'], required=True)
+assets.register('hw_db', load_hw_db, required=True, sources=dataset_sources('data/hardware_lookup.csv'))
+assets.register('hw_resolver', build_hw_resolver, depends_on=['hw_db'], required=True)
+assets.register('upgrade_candidates', build_upgrade_candidates, depends_on=['intelligent_df', 'hw_db'])
+for model_name in ['fps_model', 'gaming_model', 'render_model']:
+    assets.register(model_name, model_loader(model_name), sources=model_sources(model_name))
+assets.register('prediction_table', load_prediction_table,
+                sources=[os.path.join(PREDICTION_TABLE_DIR, 'manifest.json')] + PREDICTION_TABLE_DATA)
+assets.register('db', connect_firebase, per_process=True)
+assets.register('catalog', open_catalog, depends_on=['db'], per_process=True)
+
+# ASSET_PER_PROCESS=worker leaves the per-process assets (Firebase) out of
+# startup loading: a forking server (wsgi.py) connects them in each worker
+ASSET_PER_PROCESS = os.environ.get('ASSET_PER_PROCESS', 'startup')
+assets.load(ASSET_LOADING, assets.names(per_process=False) if ASSET_PER_PROCESS == 'worker' else None)
+
+# Optional token for admin endpoints (cache invalidation)
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+# Hot reload: poll data/model files every ASSET_WATCH_INTERVAL seconds
+# (0 = off) and swap in fresh copies when they change. Each request is
+# served from the asset set that was live when it started.
+ASSET_WATCH_INTERVAL = float(os.environ.get('ASSET_WATCH_INTERVAL', 0))
+
+@app.before_request
+def pin_assets():
+    g.request_start = time.perf_counter()
+    assets.watch(ASSET_WATCH_INTERVAL)  # no-op after the first call in a process
+    assets.pin()
+
+@app.after_request
+def record_latency(response):
+    start = g.get('request_start')
+    if start is not None:
+        REQUEST_SECONDS.observe(
+            time.perf_counter() - start, method=request.method,
+            route=request.url_rule.rule if request.url_rule else 'unmatched', status=response.status_code)
+    return response
+
+@app.teardown_request
+def unpin_assets(exception=None):
+    assets.unpin()
+
+# Cache of recommend/predict responses (see response_cache.py)
+# RESPONSE_CACHE_SIZE=0 disables it; RESPONSE_CACHE_PATH adds a SQLite
+# file shared by all workers on this machine
+RESPONSE_CACHE_PATH = os.environ.get('RESPONSE_CACHE_PATH')
+response_cache = ResponseCache(
+    maxsize=int(os.environ.get('RESPONSE_CACHE_SIZE', DEFAULT_CACHE_SIZE)),
+    shared=SQLiteCacheBackend(RESPONSE_CACHE_PATH) if RESPONSE_CACHE_PATH else None
+)
 
 # ============================================================================
 # HELPER FUNCTION - Find exact FPS from CSV data
@@ -72,62 +332,134 @@ def find_exact_fps_from_csv(cpu_score, gpu_score, ram_gb, resolution_name):
     Try to find exact FPS match from CSV data.
     Returns FPS if exact match found, None otherwise.
     """
-    if fps_lookup_df is None:
+    fps_lookup_index = assets.get('fps_lookup_index')
+    if fps_lookup_index is None:
         return None
     
     # CSV stores resolutions as strings: "1080P", "1440P", "4K"
     # We need to convert our input format to match
-    resolution_csv_format = resolution_name.upper().replace('P', 'P')  # "1080p" -> "1080P"
+    resolution_csv_format = resolution_name.upper()  # "1080p" -> "1080P"
     
     # Look for exact match (with small tolerance for floating point)
-    tolerance = 0.1
-    matches = fps_lookup_df[
-        (abs(fps_lookup_df['cpu_score'] - cpu_score) < tolerance) &
-        (abs(fps_lookup_df['gpu_score'] - gpu_score) < tolerance) &
-        (fps_lookup_df['ram_gb'] == ram_gb) &
-        (fps_lookup_df['resolution'] == resolution_csv_format)
-    ]
-    
-    if len(matches) > 0:
-        fps = matches.iloc[0]['fps']
-        print(f"  ✓ CSV Exact Match: {resolution_name} = {fps} FPS")
+    with STAGE_SECONDS.time(stage='csv_match'):
+        fps = fps_lookup_index.lookup(cpu_score, gpu_score, ram_gb, resolution_csv_format)
+    if fps is not None:
+        logger.debug("CSV exact match: %s = %s FPS", resolution_name, fps)
         return int(fps)
     
     return None
 
-# Load hardware scores database (contains performance scores for CPUs and GPUs)
-# Used to calculate performance predictions
-try:
-    lookup_df = pd.read_csv('data/hardware_lookup.csv')
-    lookup_df['clean_name'] = lookup_df['name'].astype(str).str.lower().str.replace(" ", "")
-    hw_db = lookup_df.set_index('clean_name')['score'].to_dict()
-    print("SUCCESS: Hardware lookup database loaded")
-except FileNotFoundError:
-    print("ERROR: 'data/hardware_lookup.csv' not found")
-    hw_db = {}
+def find_exact_fps_all_resolutions(cpu_score, gpu_score, ram_gb):
+    """
+    Exact FPS matches from CSV data for every resolution in one lookup.
+    Returns a dict keyed like the CSV ("1080P", "1440P", "4K").
+    """
+    fps_lookup_index = assets.get('fps_lookup_index')
+    if fps_lookup_index is None:
+        return {}
+    with STAGE_SECONDS.time(stage='csv_match'):
+        return fps_lookup_index.lookup_all(cpu_score, gpu_score, ram_gb)
 
-# Initialize Firebase connection for Manual Build Mode
-# Firebase stores all hardware components in cloud database
-db = None
-if FIREBASE_AVAILABLE:
-    try:
-        cred_path = 'serviceAccountKey.json'
-        if os.path.exists(cred_path):
-            cred = credentials.Certificate(cred_path)
-            firebase_admin.initialize_app(cred)
-            db = firestore.client()
-            print("SUCCESS: Firebase Firestore connected successfully")
-            print("SUCCESS: Manual Build will use real database")
-        else:
-            print("ERROR: serviceAccountKey.json not found")
-            print("WARNING: Manual Build will NOT work without Firebase")
-    except Exception as e:
-        print(f"ERROR: Firebase initialization error: {e}")
-        print("WARNING: Manual Build will NOT work without Firebase")
-        db = None
-else:
-    print("ERROR: firebase-admin package not installed")
-    print("WARNING: Run: pip install firebase-admin")
+CSV_RESOLUTIONS = ['1080P', '1440P', '4K']
+
+def find_measured_fps_all_resolutions(cpu_score, gpu_score, ram_gb):
+    """
+    FPS from CSV data for every resolution: the exact match where there is
+    one, otherwise interpolated from the nearest measured builds (see
+    NearestFpsIndex). Resolutions with neither are left out.
+    """
+    found = {res: int(fps) for res, fps in find_exact_fps_all_resolutions(cpu_score, gpu_score, ram_gb).items()}
+    missing = [res for res in CSV_RESOLUTIONS if res not in found]
+    fps_nearest_index = assets.get('fps_nearest_index')
+    if missing and fps_nearest_index is not None:
+        with STAGE_SECONDS.time(stage='nearest_match'):
+            nearest = fps_nearest_index.interpolate_all(cpu_score, gpu_score, ram_gb, missing)
+        logger.debug("CSV nearest-neighbour FPS: %s", nearest)
+        found.update(nearest)
+    return found
+
+# ============================================================================
+# HEALTH CHECKS
+# ============================================================================
+
+# Liveness: the process is up and serving requests
+@app.route('/healthz')
+def healthz():
+    return jsonify({"status": "ok"})
+
+# Readiness: every required asset is loaded (per-asset state and load times)
+@app.route('/readyz')
+def readyz():
+    ready = assets.ready()
+    return jsonify({
+        "ready": ready,
+        "loading_mode": ASSET_LOADING,
+        "generation": assets.generation,
+        "last_reload": assets.last_reload,
+        "assets": assets.report()
+    }), 200 if ready else 503
+
+# API: Reload datasets/models from disk without restarting
+# (this worker only - with several workers, use ASSET_WATCH_INTERVAL)
+@app.route('/api/admin/reload', methods=['POST'])
+def reload_assets():
+    """Body (optional): {"assets": ["hw_db"], "wait": true}
+    
+    Without "assets" every data/model file is reloaded. Indexes built from
+    a reloaded dataset are rebuilt too. With "wait" the response reports
+    the outcome; otherwise the reload runs in the background (202).
+    """
+    if ADMIN_TOKEN and request.headers.get('X-Admin-Token') != ADMIN_TOKEN:
+        return jsonify({"error": "Unauthorized"}), 401
+    data = request.get_json(silent=True) or {}
+    names = data.get('assets')
+    if names is not None and (not isinstance(names, list) or not names):
+        return jsonify({"error": "'assets' must be a non-empty list"}), 400
+    unknown = [n for n in names or [] if n not in assets.report()]
+    if unknown:
+        return jsonify({"error": f"Unknown assets: {unknown}"}), 400
+
+    if not data.get('wait'):
+        assets.reload_in_background(names)
+        return jsonify({"reloading": names or "all", "generation": assets.generation}), 202
+
+    assets.reload(names)
+    return jsonify({
+        "generation": assets.generation,
+        "last_reload": assets.last_reload,
+        "assets": assets.report()
+    }), 200 if assets.last_reload['swapped'] else 500
+
+# Response cache hit/miss counters
+@app.route('/api/cache/stats')
+def cache_stats():
+    return jsonify({"responses": response_cache.stats()})
+
+@REGISTRY.collector
+def collect_cache_stats():
+    """Hit/miss numbers the caches already keep, read at scrape time"""
+    families = []
+    stats = response_cache.stats()
+    families.append(('unicorn_response_cache_lookups_total', 'counter', 'Response cache lookups by result', [
+        ({'result': result}, stats[result]) for result in ('hits', 'shared_hits', 'misses', 'stale')
+    ]))
+    catalog = assets.peek('catalog')
+    if hasattr(catalog, 'hits'):  # CatalogCache (SQLiteStore keeps no counters)
+        families.append(('unicorn_catalog_cache_lookups_total', 'counter', 'Catalog collection lookups by result', [
+            ({'result': 'hits'}, catalog.hits), ({'result': 'misses'}, catalog.misses)
+        ]))
+    resolver = assets.peek('hw_resolver')
+    if resolver is not None:
+        info = resolver.cache_info()
+        families.append(('unicorn_name_resolver_cache_lookups_total', 'counter', 'Hardware name cache lookups by result', [
+            ({'result': 'hits'}, info.hits), ({'result': 'misses'}, info.misses)
+        ]))
+    return families
+
+# Prometheus scrape endpoint (numbers are per worker process)
+@app.route('/metrics')
+def metrics():
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
 
 # ============================================================================
 # HOMEPAGE ROUTE
@@ -148,50 +480,71 @@ def intelligent_build():
     return render_template('intelligent_build.html')
 
 # Find best PC configuration based on user requirements
-def get_recommendation(budget, resolution, use_case, fps=None):
+def describe_builds(intelligent_df, rows, use_case):
+    """Recommendation fields for a list of dataset rows"""
+    builds = intelligent_df.iloc[rows]
+    columns = zip(*(builds[name].tolist() for name in
+                    ['cpu', 'gpu', 'ram_gb', 'price', 'resolution', 'cpu_score', 'gpu_score', 'fps']))
+    return [
+        {
+            'CPU': cpu,
+            'GPU': gpu,
+            'RAM': f"{ram_gb}GB",
+            'Price': f"${price}",
+            'Resolution': resolution,
+            'CPU_Score': float(cpu_score),
+            'GPU_Score': float(gpu_score),
+            'FPS': int(fps) if use_case == 'Gaming' else None,
+            'ram_gb': int(ram_gb)
+        }
+        for cpu, gpu, ram_gb, price, resolution, cpu_score, gpu_score, fps in columns
+    ]
+
+def describe_build(intelligent_df, row, use_case):
+    """Recommendation fields for one dataset row"""
+    return describe_builds(intelligent_df, [row], use_case)[0]
+
+def get_recommendation(budget, resolution, use_case, fps=None, top_k=None, pareto=None):
     """Recommend PC based on budget, resolution, use case, and target FPS
     
     ENHANCED ALGORITHM - Finds EXACT MATCH for resolution & FPS target:
     1. Prioritize EXACT resolution match first (must match)
     2. For gaming with FPS target: find closest match to target FPS
     3. Select best build within budget that matches these criteria
+    
+    All lookups go through recommendation_index (built once at startup),
+    so each request is a binary search instead of a full dataset scan.
+
+    Optional extras (added next to the usual fields):
+    - top_k:  'Top_Builds' - the top_k builds in the same ranking order
+    - pareto: 'Pareto_Front' - cheapest-first builds within budget where
+              each beats every cheaper build on 'score' or 'fps'
     """
+    intelligent_df = assets.get('intelligent_df')
+    recommendation_index = assets.get('recommendation_index')
     if intelligent_df is None:
         return {"error": "Dataset not loaded"}
-    
-    # Define ranking strategy for each use case
-    # Gaming focuses on GPU, Productivity on CPU, others on combined score
-    use_case_logic = {
-        'Gaming': {'filter_col': 'is_good_for_gaming', 'rank_by': 'gpu_score'},
-        'Productivity': {'filter_col': 'is_good_for_productivity', 'rank_by': 'cpu_score'},
-        'Design/Render': {'filter_col': 'is_good_for_design_render', 'rank_by': 'combined_score'},
-        'Workstation': {'filter_col': 'is_good_for_workstation', 'rank_by': 'combined_score'}
-    }
-
-    if use_case not in use_case_logic:
-        return {"error": f"Invalid use_case. Choose from {list(use_case_logic.keys())}"}
 
-    logic = use_case_logic[use_case]
+    if use_case not in USE_CASE_LOGIC:
+        return {"error": f"Invalid use_case. Choose from {list(USE_CASE_LOGIC.keys())}"}
     
-    # Step 1: Filter PCs suitable for selected use case
-    use_case_df = intelligent_df[intelligent_df[logic['filter_col']] == 1].copy()
-    if use_case_df.empty:
+    # Step 1: PCs suitable for selected use case
+    available_resolutions = recommendation_index.available_resolutions(use_case)
+    if not available_resolutions:
         return {"error": f"No PC found for '{use_case}' in dataset."}
     
-    # Step 2: CRITICAL - Filter by EXACT resolution first (MUST MATCH)
-    resolution_filtered = use_case_df[use_case_df['resolution'] == resolution].copy()
-    if resolution_filtered.empty:
+    # Step 2: CRITICAL - EXACT resolution (MUST MATCH)
+    partition = recommendation_index.partition(use_case, resolution)
+    if partition is None:
         return {
             "error": f"No {use_case} PC found for {resolution} resolution.",
-            "suggestion": f"Try a different resolution. Available: {', '.join(use_case_df['resolution'].unique())}"
+            "suggestion": f"Try a different resolution. Available: {', '.join(available_resolutions)}"
         }
     
-    # Step 3: Filter by user's budget
-    filtered_df = resolution_filtered[resolution_filtered['price'] <= budget].copy()
-    if filtered_df.empty:
+    # Step 3: User's budget
+    if partition.count_within(budget) == 0:
         # Show cheapest option for this resolution if budget is too low
-        cheapest = resolution_filtered.sort_values('price').iloc[0]
-        cheapest_price = int(cheapest['price'])
+        cheapest_price = partition.min_price
         shortage = cheapest_price - budget
         return {
             "error": f"No {use_case} PC found for {resolution} within ${budget} budget.",
@@ -199,59 +552,40 @@ def get_recommendation(budget, resolution, use_case, fps=None):
         }
     
     # Step 4: ENHANCED FPS MATCHING - Find best match for target FPS
+    # Prefer builds that meet or slightly exceed the target (not overly
+    # powerful = waste of budget), then the highest GPU score
     if use_case == 'Gaming' and fps is not None:
-        # Calculate FPS difference from target
-        filtered_df['fps_diff'] = abs(filtered_df['fps'] - fps)
-        
-        # Strategy: Find builds that meet or slightly exceed the FPS target
-        # Prefer builds close to target (not overly powerful = waste of budget)
-        meets_target = filtered_df[filtered_df['fps'] >= fps].copy()
-        
-        if not meets_target.empty:
-            # Found builds that meet target - select closest to target FPS
-            meets_target = meets_target.sort_values('fps_diff')
-            filtered_df = meets_target
-        else:
-            # No build meets target - get the highest FPS available
-            max_fps_available = filtered_df['fps'].max()
+        best_row = partition.best_for_fps(budget, fps)
+        if best_row is None:
+            # No build meets target - report the highest FPS available
+            max_fps_available = partition.max_fps_within(budget)
             return {
                 "error": f"Cannot achieve {fps} FPS at {resolution} within ${budget} budget.",
                 "suggestion": f"Maximum achievable: {int(max_fps_available)} FPS at {resolution}. Increase budget or lower FPS target."
             }
+    else:
+        # Step 5: Best performance score within budget
+        best_row = partition.best_within(budget)
     
-    # Step 5: Rank remaining PCs and select the best one
-    rank_col = logic['rank_by']
-    if rank_col == 'combined_score':
-        # Calculate combined CPU + GPU score
-        filtered_df['combined_score'] = filtered_df['cpu_score'] + filtered_df['gpu_score']
+    recommendation = describe_build(intelligent_df, best_row, use_case)
 
-    # For gaming with FPS target, prioritize closest FPS match over pure GPU score
-    if use_case == 'Gaming' and fps is not None:
-        # Sort by: 1) FPS difference (closest to target) 2) GPU score (higher is better)
-        ranked_df = filtered_df.sort_values(by=['fps_diff', rank_col], ascending=[True, False])
-    else:
-        # Sort by performance score (higher is better)
-        ranked_df = filtered_df.sort_values(by=rank_col, ascending=False)
-    
-    best_pc = ranked_df.iloc[0]
-    
-    recommendation = {
-        'CPU': best_pc['cpu'],
-        'GPU': best_pc['gpu'],
-        'RAM': f"{best_pc['ram_gb']}GB",
-        'Price': f"${best_pc['price']}",
-        'Resolution': best_pc['resolution'],
-        'CPU_Score': float(best_pc['cpu_score']),
-        'GPU_Score': float(best_pc['gpu_score']),
-        'FPS': int(best_pc['fps']) if use_case == 'Gaming' else None,
-        'ram_gb': int(best_pc['ram_gb'])
-    }
+    # Step 6 (optional): runner-up builds and the price/performance frontier
+    if top_k is not None:
+        if use_case == 'Gaming' and fps is not None:
+            rows = partition.top_for_fps(budget, fps, top_k)
+        else:
+            rows = partition.top_within(budget, top_k)
+        recommendation['Top_Builds'] = describe_builds(intelligent_df, rows, use_case)
+    if pareto is not None:
+        rows = partition.pareto_within(budget, pareto)
+        recommendation['Pareto_Front'] = describe_builds(intelligent_df, rows, use_case)
     
     return recommendation
 
 # API: Get available options for dropdown menus
 @app.route('/api/intelligent/options', methods=['GET'])
 def intelligent_options():
+    intelligent_df = assets.get('intelligent_df')
     if intelligent_df is None:
         return jsonify({"error": "Dataset not loaded"})
     
@@ -266,6 +600,13 @@ def intelligent_options():
         'max_price': int(intelligent_df['price'].max())
     })
 
+# Limits for the optional extras of /api/intelligent/recommend
+MAX_TOP_K = 50
+PARETO_METRICS = ('score', 'fps')
+
+# Budget curves kept in memory, one per (use case, resolution, FPS level)
+BUDGET_CURVE_CACHE_SIZE = 256
+
 # API: Get PC recommendation based on user input
 @app.route('/api/intelligent/recommend', methods=['POST'])
 def intelligent_recommend():
@@ -278,14 +619,136 @@ def intelligent_recommend():
     
     if fps is not None:
         fps = int(fps)
+
+    # Optional: top_k alternatives and/or the Pareto front ("score" or "fps")
+    top_k = data.get('top_k')
+    if top_k is not None:
+        try:
+            top_k = int(top_k)
+        except (TypeError, ValueError):
+            return jsonify({"error": "top_k must be an integer"}), 400
+        if not 1 <= top_k <= MAX_TOP_K:
+            return jsonify({"error": f"top_k must be between 1 and {MAX_TOP_K}"}), 400
+    pareto = data.get('pareto')
+    if pareto is True:
+        pareto = 'score'
+    elif pareto is False:
+        pareto = None
+    if pareto is not None and pareto not in PARETO_METRICS:
+        return jsonify({"error": f"pareto must be one of {list(PARETO_METRICS)}"}), 400
     
-    result = get_recommendation(budget, resolution, use_case, fps)
+    # Same inputs + same dataset version = same answer
+    key = response_cache.make_key('recommend', budget, resolution, use_case, fps, top_k, pareto)
+    result = response_cache.get_or_compute(
+        key, assets.version('intelligent_df', 'recommendation_index'),
+        lambda: get_recommendation(budget, resolution, use_case, fps, top_k=top_k, pareto=pareto)
+    )
     return jsonify(result)
 
+# API: Best build for every budget, so the budget slider can be drawn
+# client-side from one response
+@app.route('/api/intelligent/budget-curve', methods=['GET'])
+def intelligent_budget_curve():
+    use_case = request.args.get('use_case', 'Gaming')
+    resolution = request.args.get('resolution', '1080P')
+    fps = request.args.get('fps', type=int)
+
+    recommendation_index = assets.get('recommendation_index')
+    if recommendation_index is None:
+        return jsonify({"error": "Dataset not loaded"}), 500
+    if use_case not in USE_CASE_LOGIC:
+        return jsonify({"error": f"Invalid use_case. Choose from {list(USE_CASE_LOGIC.keys())}"}), 400
+    partition = recommendation_index.partition(use_case, resolution)
+    if partition is None:
+        available = recommendation_index.available_resolutions(use_case)
+        return jsonify({
+            "error": f"No {use_case} PC found for {resolution} resolution.",
+            "suggestion": f"Try a different resolution. Available: {', '.join(available)}"
+        }), 404
+
+    # FPS targets only matter for Gaming (same as /recommend); targets that
+    # land on the same FPS level share one cached curve
+    fps_level = None
+    if use_case == 'Gaming' and fps is not None:
+        fps_level = partition.fps_level_for(fps)
+        if fps_level is None:
+            return jsonify({
+                "error": f"Cannot achieve {fps} FPS at {resolution}.",
+                "suggestion": f"Maximum achievable: {int(partition.max_fps[-1])} FPS at {resolution}."
+            }), 404
+
+    steps = budget_curve(recommendation_index, use_case, resolution, fps_level)
+    return jsonify({
+        'use_case': use_case,
+        'resolution': resolution,
+        'fps': fps,
+        'steps': steps,
+    })
+
+@lru_cache(maxsize=BUDGET_CURVE_CACHE_SIZE)
+def budget_curve(recommendation_index, use_case, resolution, fps_level):
+    """Step function [{min_budget, build fields...}] (cached per parameters;
+    keyed on the index object, so a rebuilt index starts a fresh curve)"""
+    partition = recommendation_index.partition(use_case, resolution)
+    steps = partition.budget_curve(fps_level)
+    builds = describe_builds(recommendation_index.df, [row for _, row in steps], use_case)
+    return [{'min_budget': price, **build} for (price, _), build in zip(steps, builds)]
+
+# Curves hold the index they were built from; drop them when it is replaced
+assets.on_swap(lambda names: budget_curve.cache_clear() if 'recommendation_index' in names else None)
+
 # ============================================================================
 # MANUAL BUILD MODE - User selects each component step by step
 # ============================================================================
 
+# Encoded component list responses, keyed by ETag (see catalog_query.py)
+catalog_pages = PageCache(int(os.environ.get('CATALOG_PAGE_CACHE_SIZE', DEFAULT_PAGE_CACHE_SIZE)))
+
+def jsonify_text(body):
+    """What jsonify(body) would send, as text"""
+    return app.json.response(body).get_data(as_text=True)
+
+def catalog_list(catalog, collection, fetch):
+    """Component list response for fetch() (documents of `collection`)
+    
+    Applies the filter/sort/fields/limit/cursor parameters, compresses the
+    body for the client, and tags it with an ETag computed before anything
+    is fetched or serialized: a client whose copy is current gets a 304.
+    With "Accept: application/x-ndjson" the documents are streamed one per
+    line. Raises CatalogQueryError for invalid parameters, always before
+    the ETag check (routes validate their own parameters before calling).
+    """
+    query = CatalogQuery(request.args)
+    etag = make_etag(catalog.data_version(collection), request.path, request.args)
+    stream = wants_ndjson()
+    if stream:
+        etag = f"{etag}-ndjson"
+    if etag_matches(request.headers.get('If-None-Match'), etag):
+        CACHE_EVENTS.inc(cache='catalog_pages', result='not_modified')
+        response = Response(status=304)
+    elif stream:
+        # Serialized while it is sent; never kept in the page cache
+        encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+        response = ndjson_response(query.rows(fetch()), encoding)
+        if encoding:
+            etag = f"{etag}-{encoding}"
+    else:
+        encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+        entry = catalog_pages.get((etag, encoding))
+        CACHE_EVENTS.inc(cache='catalog_pages', result='hit' if entry is not None else 'miss')
+        if entry is None:
+            entry = encode_body(query.apply(fetch()), encoding, jsonify_text)
+            catalog_pages.put((etag, encoding), entry)
+        body, used = entry
+        response = Response(body, mimetype='application/json')
+        if used:
+            response.headers['Content-Encoding'] = used
+            etag = f"{etag}-{used}"
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept, Accept-Encoding'
+    response.cache_control.no_cache = True  # always revalidate (cheap 304)
+    return response
+
 # Show manual build page
 @app.route('/manual-build')
 def manual_build():
@@ -299,24 +762,17 @@ def get_cpus():
     if not brand:
         return jsonify({"error": "Brand is required"}), 400
     
-    if not db:
+    catalog = assets.get('catalog')
+    if catalog is None:
         return jsonify({"error": "Database not available"}), 500
     
     try:
-        cpus_ref = db.collection('cpus')
-        all_cpus = cpus_ref.stream()
-        cpus = []
-        
-        for doc in all_cpus:
-            cpu_data = doc.to_dict()
-            # Filter by brand (check if brand name is in CPU name)
-            if brand.lower() in cpu_data.get('Name', '').lower():
-                cpu_data['id'] = doc.id
-                cpus.append(cpu_data)
-        
-        return jsonify(cpus)
+        # Filter by brand (check if brand name is in CPU name)
+        return catalog_list(catalog, 'cpus', lambda: catalog.cpus_by_brand(brand))
+    except CatalogQueryError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        print(f"Error fetching CPUs: {e}")
+        logger.exception("Error fetching CPUs")
         return jsonify({"error": f"Error fetching CPUs: {str(e)}"}), 500
 
 # API: Get compatible motherboards based on CPU socket type
@@ -327,42 +783,32 @@ def get_motherboards():
     if not socket:
         return jsonify({"error": "Socket is required"}), 400
     
-    if not db:
+    catalog = assets.get('catalog')
+    if catalog is None:
         return jsonify({"error": "Database not available"}), 500
     
     try:
-        query = db.collection('motherboards').where('Socket', '==', socket)
-        motherboards = []
-        
-        for doc in query.stream():
-            mb_data = doc.to_dict()
-            mb_data['id'] = doc.id
-            motherboards.append(mb_data)
-        
-        return jsonify(motherboards)
+        return catalog_list(catalog, 'motherboards', lambda: catalog.where('motherboards', 'Socket', socket))
+    except CatalogQueryError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        print(f"Error fetching Motherboards: {e}")
+        logger.exception("Error fetching Motherboards")
         return jsonify({"error": f"Error fetching Motherboards: {str(e)}"}), 500
 
 # API: Get all available graphics cards
 @app.route("/api/manual/gpus", methods=["GET"])
 def get_gpus():
     """Get list of all GPUs from Firebase database"""
-    if not db:
+    catalog = assets.get('catalog')
+    if catalog is None:
         return jsonify({"error": "Database not available"}), 500
     
     try:
-        gpus_ref = db.collection('gpus')
-        gpus = []
-        
-        for doc in gpus_ref.stream():
-            gpu_data = doc.to_dict()
-            gpu_data['id'] = doc.id
-            gpus.append(gpu_data)
-        
-        return jsonify(gpus)
+        return catalog_list(catalog, 'gpus', lambda: catalog.all('gpus'))
+    except CatalogQueryError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        print(f"Error fetching GPUs: {e}")
+        logger.exception("Error fetching GPUs")
         return jsonify({"error": f"Error fetching GPUs: {str(e)}"}), 500
 
 # API: Get compatible RAM based on motherboard RAM type
@@ -373,21 +819,16 @@ def get_ram():
     if not ram_type:
         return jsonify({"error": "RAM Type is required"}), 400
     
-    if not db:
+    catalog = assets.get('catalog')
+    if catalog is None:
         return jsonify({"error": "Database not available"}), 500
     
     try:
-        query = db.collection('ram').where('RAM_Type', '==', ram_type)
-        ram_list = []
-        
-        for doc in query.stream():
-            ram_data = doc.to_dict()
-            ram_data['id'] = doc.id
-            ram_list.append(ram_data)
-        
-        return jsonify(ram_list)
+        return catalog_list(catalog, 'ram', lambda: catalog.where('ram', 'RAM_Type', ram_type))
+    except CatalogQueryError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        print(f"Error fetching RAM: {e}")
+        logger.exception("Error fetching RAM")
         return jsonify({"error": f"Error fetching RAM: {str(e)}"}), 500
 
 # API: Get compatible CPU coolers based on socket type
@@ -398,107 +839,176 @@ def get_coolers():
     if not socket:
         return jsonify({"error": "Socket is required"}), 400
     
-    if not db:
+    catalog = assets.get('catalog')
+    if catalog is None:
         return jsonify({"error": "Database not available"}), 500
     
     try:
-        coolers_ref = db.collection('coolers')
-        # Query for coolers that support this socket (array-contains)
-        query = coolers_ref.where(field_path='Supported_Sockets', op_string='array_contains', value=socket)
-        coolers = []
-        
-        for doc in query.stream():
-            cooler_data = doc.to_dict()
-            cooler_data['id'] = doc.id
-            coolers.append(cooler_data)
-        
-        return jsonify(coolers)
+        # Coolers that support this socket (Supported_Sockets array contains it)
+        return catalog_list(catalog, 'coolers', lambda: catalog.where('coolers', 'Supported_Sockets', socket))
+    except CatalogQueryError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        print(f"Error fetching Coolers: {e}")
+        logger.exception("Error fetching Coolers")
         return jsonify({"error": f"Error fetching Coolers: {str(e)}"}), 500
 
 # API: Get all storage options (SSD/HDD)
 @app.route("/api/manual/storage", methods=["GET"])
 def get_storage():
     """Get list of all storage devices from Firebase database"""
-    if not db:
+    catalog = assets.get('catalog')
+    if catalog is None:
         return jsonify({"error": "Database not available"}), 500
     
     try:
-        storage_list = []
-        for doc in db.collection('storage').stream():
-            storage_data = doc.to_dict()
-            storage_data['id'] = doc.id
-            storage_list.append(storage_data)
-        
-        return jsonify(storage_list)
+        return catalog_list(catalog, 'storage', lambda: catalog.all('storage'))
+    except CatalogQueryError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        print(f"Error fetching Storage: {e}")
+        logger.exception("Error fetching Storage")
         return jsonify({"error": f"Error fetching Storage: {str(e)}"}), 500
 
 # API: Get all power supply units
 @app.route("/api/manual/psus", methods=["GET"])
 def get_psus():
     """Get list of all PSUs from Firebase database"""
-    if not db:
+    catalog = assets.get('catalog')
+    if catalog is None:
         return jsonify({"error": "Database not available"}), 500
     
     try:
-        psu_list = []
-        for doc in db.collection('psus').stream():
-            psu_data = doc.to_dict()
-            psu_data['id'] = doc.id
-            psu_list.append(psu_data)
-        
-        return jsonify(psu_list)
+        return catalog_list(catalog, 'psus', lambda: catalog.all('psus'))
+    except CatalogQueryError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        print(f"Error fetching PSUs: {e}")
+        logger.exception("Error fetching PSUs")
         return jsonify({"error": f"Error fetching PSUs: {str(e)}"}), 500
 
+def parse_case_filters(form_factor, gpu_length):
+    """(gpu_length as a number, None), or (None, error message) when a
+    case query's form_factor or gpu_length is missing or invalid"""
+    if not form_factor:
+        return None, "Form Factor is required"
+    if not gpu_length:
+        return None, "GPU Length is required"
+    try:
+        gpu_length = float(gpu_length)
+    except ValueError:
+        return None, "GPU Length must be a number"
+    if not math.isfinite(gpu_length) or gpu_length < 0:
+        return None, "GPU Length must be a non-negative number"
+    return gpu_length, None
+
 # API: Get compatible cases based on motherboard size and GPU length
 @app.route("/api/manual/cases", methods=["GET"])
 def get_cases():
     """Get cases that fit the motherboard and GPU"""
     form_factor = request.args.get('form_factor')
-    gpu_length = request.args.get('gpu_length')
-    
-    if not form_factor:
-        return jsonify({"error": "Form Factor is required"}), 400
-    if not gpu_length:
-        return jsonify({"error": "GPU Length is required"}), 400
+    # Parsed before catalog_list's ETag check, so bad input is never a 304
+    gpu_length, error = parse_case_filters(form_factor, request.args.get('gpu_length'))
+    if error:
+        return jsonify({"error": error}), 400
     
-    if not db:
+    catalog = assets.get('catalog')
+    if catalog is None:
         return jsonify({"error": "Database not available"}), 500
     
     try:
-        cases_ref = db.collection('cases')
-        
-        # Determine compatible form factors
-        compatible_form_factors = ['ATX']
-        if form_factor == "Micro-ATX":
-            compatible_form_factors.append('Micro-ATX')
-        elif form_factor == "Mini-ITX":
-            compatible_form_factors.extend(['Micro-ATX', 'Mini-ITX'])
-        
-        # Query by form factor
-        query = cases_ref.where('Form_Factor', 'in', compatible_form_factors)
-        
-        # Filter by GPU length in Python
-        cases = []
-        for doc in query.stream():
-            case_data = doc.to_dict()
-            case_max_length = case_data.get('Max_GPU_Length_cm', 0)
-            
-            # Check if case can fit the GPU
-            if case_max_length >= float(gpu_length):
-                case_data['id'] = doc.id
-                cases.append(case_data)
-        
-        return jsonify(cases)
+        # Cases with a compatible form factor that can fit the GPU
+        return catalog_list(catalog, 'cases', lambda: catalog.cases_for(
+            compatible_case_form_factors(form_factor), gpu_length))
+    except CatalogQueryError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        print(f"Error fetching Cases: {e}")
+        logger.exception("Error fetching Cases")
         return jsonify({"error": f"Error fetching Cases: {str(e)}"}), 500
 
+# API: Every component list the wizard needs, in one request
+# Each list is fetched as soon as its inputs are known, all of them at the
+# same time, so a cold catalog costs about one Firestore round trip
+# instead of eight in a row (and one busy worker instead of eight).
+
+# Component list -> (required query parameters, query)
+WIZARD_QUERIES = {
+    'cpus': (['brand'], lambda catalog, p: catalog.cpus_by_brand(p['brand'])),
+    'motherboards': (['socket'], lambda catalog, p: catalog.where('motherboards', 'Socket', p['socket'])),
+    'gpus': ([], lambda catalog, p: catalog.all('gpus')),
+    'ram': (['ram_type'], lambda catalog, p: catalog.where('ram', 'RAM_Type', p['ram_type'])),
+    'coolers': (['socket'], lambda catalog, p: catalog.where('coolers', 'Supported_Sockets', p['socket'])),
+    'storage': ([], lambda catalog, p: catalog.all('storage')),
+    'psus': ([], lambda catalog, p: catalog.all('psus')),
+    'cases': (['form_factor', 'gpu_length'], lambda catalog, p: catalog.cases_for(
+        compatible_case_form_factors(p['form_factor']), p['gpu_length'])),
+}
+
+# Threads per worker process for wizard queries (created after fork)
+WIZARD_THREADS = int(os.environ.get('WIZARD_THREADS', 8))
+_wizard_pool = None
+_wizard_pool_pid = None
+_wizard_pool_lock = threading.Lock()
+
+def wizard_pool():
+    global _wizard_pool, _wizard_pool_pid
+    if _wizard_pool_pid != os.getpid():
+        # One pool per process, even when its first requests arrive together
+        with _wizard_pool_lock:
+            if _wizard_pool_pid != os.getpid():
+                _wizard_pool = ThreadPoolExecutor(max_workers=WIZARD_THREADS, thread_name_prefix='wizard')
+                _wizard_pool_pid = os.getpid()
+    return _wizard_pool
+
+@app.route("/api/manual/wizard", methods=["GET"])
+def manual_wizard():
+    """Query (all optional): brand, socket, ram_type, form_factor, gpu_length
+    
+    Returns one key per component list whose inputs were given (gpus,
+    storage and psus always), the same lists the /api/manual/<component>
+    routes return. Lists that fail are reported under "errors".
+    form_factor and gpu_length go together (as for /api/manual/cases):
+    one without the other, or a bad gpu_length, is a 400.
+    """
+    params = {name: request.args.get(name) for name in ['brand', 'socket', 'ram_type', 'form_factor', 'gpu_length']}
+    if params['form_factor'] or params['gpu_length']:
+        params['gpu_length'], error = parse_case_filters(params['form_factor'], params['gpu_length'])
+        if error:
+            return jsonify({"error": error}), 400
+
+    catalog = assets.get('catalog')
+    if catalog is None:
+        return jsonify({"error": "Database not available"}), 500
+
+    futures = {
+        component: wizard_pool().submit(query, catalog, params)
+        for component, (required, query) in WIZARD_QUERIES.items()
+        if all(params[name] not in (None, '') for name in required)
+    }
+
+    result = {}
+    errors = {}
+    for component, future in futures.items():
+        try:
+            result[component] = future.result()
+        except Exception as e:
+            logger.exception("Error fetching %s", component)
+            errors[component] = str(e)
+    if errors:
+        result['errors'] = errors
+    return jsonify(result)
+
+# API: Drop cached catalog data so it is reloaded from Firestore
+@app.route("/api/manual/cache/invalidate", methods=["POST"])
+def invalidate_catalog_cache():
+    """Body (optional): {"collection": "gpus"} - omit to drop everything"""
+    if ADMIN_TOKEN and request.headers.get('X-Admin-Token') != ADMIN_TOKEN:
+        return jsonify({"error": "Unauthorized"}), 401
+    catalog = assets.get('catalog')
+    if catalog is None:
+        return jsonify({"error": "Database not available"}), 500
+    
+    data = request.get_json(silent=True) or {}
+    catalog.invalidate(data.get('collection'))
+    return jsonify({"invalidated": data.get('collection') or "all", "cache": catalog.stats()})
+
 # API: Check if all selected components are compatible
 @app.route("/api/manual/validate", methods=["POST"])
 def validate_build():
@@ -538,6 +1048,188 @@ def validate_build():
     is_valid = len(errors) == 0
     return jsonify({"isValid": is_valid, "errors": errors, "warnings": warnings})
 
+# Largest JSON batch for /api/manual/validate/batch (NDJSON input has no limit)
+MAX_VALIDATE_BUILDS = 10000
+
+def read_ndjson_builds(stream, errors):
+    """Builds from an NDJSON request body, one per line. Unreadable lines
+    become None and their message is stored in errors[index]."""
+    index = 0
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            build = json.loads(line)
+        except ValueError as e:
+            errors[index] = f"Invalid JSON: {e}"
+            build = None
+        index += 1
+        yield build
+
+# API: Check many builds at once
+@app.route("/api/manual/validate/batch", methods=["POST"])
+def validate_builds():
+    """Body: {"builds": [{"cpu": {...}, "motherboard": {...}, ...}, ...]}
+    
+    Returns {"results": [...], "summary": {...}} in input order. Each result
+    is {"isValid", "errors": [{"code", "message"}], "warnings": [...]}.
+    Besides the PSU and GPU length checks of /api/manual/validate, builds
+    are checked for CPU/motherboard socket, RAM type, cooler socket and
+    case form factor (see build_validation.py).
+    
+    For very large inputs send one build per line with Content-Type
+    application/x-ndjson: results stream back as NDJSON lines
+    ({"index", ...}) while the body is read, then a {"summary": ...} line.
+    A JSON body gets the same NDJSON output with
+    "Accept: application/x-ndjson".
+    """
+    if request.mimetype == NDJSON_MIMETYPE:
+        read_errors = {}
+        return ndjson_response(validation_rows(read_ndjson_builds(request.stream, read_errors), read_errors))
+
+    data = request.get_json(silent=True)
+    builds = data.get('builds') if isinstance(data, dict) else None
+    if not isinstance(builds, list):
+        return jsonify({"error": "'builds' must be a list"}), 400
+    if len(builds) > MAX_VALIDATE_BUILDS:
+        return jsonify({"error": f"Too many builds (max {MAX_VALIDATE_BUILDS} per request); "
+                                 "send application/x-ndjson to stream larger inputs"}), 400
+    if wants_ndjson():
+        return ndjson_response(validation_rows(builds))
+    results = list(iter_validate(builds))
+    return jsonify({"results": results, "summary": summarize(results)})
+
+def validation_rows(builds, read_errors=None):
+    """NDJSON rows for /api/manual/validate/batch: {"index", ...} per build,
+    then {"summary"}. read_errors holds unreadable NDJSON input lines."""
+    read_errors = read_errors if read_errors is not None else {}
+    summary = {'builds': 0, 'valid': 0, 'invalid': 0, 'with_warnings': 0}
+    for i, result in enumerate(iter_validate(builds)):
+        if i in read_errors:
+            result = {'isValid': False, 'errors': [{'code': 'invalid_json', 'message': read_errors.pop(i)}],
+                      'warnings': []}
+        for key, value in summarize([result]).items():
+            summary[key] += value
+        yield {'index': i, **result}
+    yield {'summary': summary}
+
+# Catalog collection for each build component
+COMPONENT_COLLECTIONS = {
+    'cpu': 'cpus', 'motherboard': 'motherboards', 'gpu': 'gpus', 'ram': 'ram',
+    'cooler': 'coolers', 'storage': 'storage', 'psu': 'psus', 'case': 'cases',
+}
+
+# Longest search /api/manual/complete may run
+MAX_SOLVER_TIME_LIMIT = 5.0
+
+# Solver indexes over whole catalog collections: component -> (key, index),
+# where key is the collection's data_version (plus the hardware scores for
+# CPUs and GPUs). Only the latest version of each is kept. 'platforms' holds
+# the platform() memo shared by solvers over the same motherboard, RAM and
+# case indexes.
+_solver_indexes = {}
+
+
+def solver_indexes(catalog, components, score_part):
+    """Prebuilt BuildSolver indexes for the components searched over the full
+    catalog, and the platform memo to share (None if a platform part is fixed)"""
+    indexes, keys = {}, {}
+    scores_version = assets.version('hw_resolver')
+    for component in components:
+        collection = COMPONENT_COLLECTIONS[component]
+        key = (catalog.data_version(collection), scores_version if component in ('cpu', 'gpu') else None)
+        cached = _solver_indexes.get(component)
+        if cached is None or cached[0] != key:
+            cached = (key, component_index(component, catalog.all(collection), score_part))
+            _solver_indexes[component] = cached
+        indexes[component] = cached[1]
+        keys[component] = key
+
+    platforms = None
+    if all(component in keys for component in ('motherboard', 'ram', 'case')):
+        key = (keys['motherboard'], keys['ram'], keys['case'])
+        cached = _solver_indexes.get('platforms')
+        if cached is None or cached[0] != key:
+            cached = (key, {})
+            _solver_indexes['platforms'] = cached
+        platforms = cached[1]
+    return indexes, platforms
+
+
+# API: Fill in the missing parts of a build within a budget
+@app.route("/api/manual/complete", methods=["POST"])
+def complete_build():
+    """Body: {"build": {"cpu": {...}, ...}, "budget": 1500,
+              "objective": "performance", "time_limit": 0.5}
+    
+    Parts in "build" are kept (a full document, or {"id": ...} / an id
+    string to use the catalog entry); the others are chosen so the whole
+    build is compatible and within budget. Objectives: performance
+    (CPU + GPU score), gaming (GPU-weighted), productivity (CPU score) or
+    cheapest. Parts without a score are the cheapest compatible option.
+    """
+    data = request.get_json(silent=True) or {}
+    partial = data.get('build') or {}
+    objective = data.get('objective', 'performance')
+    if not isinstance(partial, dict) or any(key not in COMPONENTS for key in partial):
+        return jsonify({"error": f"'build' must be an object with keys from {COMPONENTS}"}), 400
+    invalid = [component for component, part in partial.items() if part is not None and not isinstance(part, (str, dict))]
+    if invalid:
+        return jsonify({"error": f"Parts in 'build' must be a document, {{\"id\": ...}} or an id string "
+                                 f"(invalid: {', '.join(invalid)})"}), 400
+    if objective not in OBJECTIVES:
+        return jsonify({"error": f"Invalid objective. Choose from {list(OBJECTIVES)}"}), 400
+    try:
+        if isinstance(data.get('budget'), bool) or isinstance(data.get('time_limit'), bool):
+            raise TypeError
+        budget = float(data['budget'])
+        time_limit = float(data.get('time_limit', DEFAULT_TIME_LIMIT))
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "'budget' (number) is required; 'time_limit' must be a number"}), 400
+    # "nan" and "inf" parse as floats but aren't budgets or time limits
+    if not math.isfinite(budget):
+        return jsonify({"error": "'budget' must be a finite number"}), 400
+    if not math.isfinite(time_limit) or time_limit <= 0:
+        return jsonify({"error": "'time_limit' must be a positive number of seconds"}), 400
+    time_limit = min(time_limit, MAX_SOLVER_TIME_LIMIT)
+
+    catalog = assets.get('catalog')
+    if catalog is None:
+        return jsonify({"error": "Database not available"}), 500
+
+    try:
+        candidates = {}
+        for component, collection in COMPONENT_COLLECTIONS.items():
+            chosen = partial.get(component)
+            if not chosen:
+                candidates[component] = catalog.all(collection)
+                continue
+            doc_id = chosen if isinstance(chosen, str) else chosen.get('id')
+            if isinstance(chosen, dict) and set(chosen) - {'id'}:
+                candidates[component] = [chosen]
+            else:
+                matches = [doc for doc in catalog.all(collection) if doc.get('id') == doc_id]
+                if not matches:
+                    return jsonify({"error": f"{component} '{doc_id}' not found in {collection}"}), 404
+                candidates[component] = matches
+
+        hw_resolver = assets.get('hw_resolver')
+        score_part = hw_resolver.score if hw_resolver else (lambda name: 0)
+        indexes, platforms = solver_indexes(
+            catalog, [component for component in COMPONENTS if not partial.get(component)], score_part
+        )
+        solver = BuildSolver(candidates, score_part, indexes, platforms)
+        best, search = solver.solve(budget, objective, time_limit)
+    except Exception as e:
+        logger.exception("Error completing build")
+        return jsonify({"error": f"Error completing build: {str(e)}"}), 500
+
+    if best is None:
+        message = "No compatible build found within budget" if search['complete'] else \
+            "No compatible build found within the time limit"
+        return jsonify({"error": message, "search": search}), 404
+    return jsonify({**best, "objective": objective, "search": search})
+
 # ============================================================================
 # PERFORMANCE PREDICTION - Predict FPS and gaming performance
 # ============================================================================
@@ -549,78 +1241,38 @@ def performance_predict():
 
 # Get performance score for a CPU or GPU
 def get_score(part_name):
-    """Find hardware score from database using fuzzy matching"""
+    """Find hardware score from database using fuzzy matching
+    
+    Matching (normalized exact -> substring -> model number) is done by
+    hw_resolver, which is built once at load time and caches results.
+    """
+    hw_db = assets.get('hw_db')
     if not part_name or not hw_db:
         return 0
-    
-    # Remove spaces and special characters for matching
-    clean_input = str(part_name).lower().replace(" ", "").replace("-", "")
-    
-    # Try to find exact match first
-    if clean_input in hw_db:
-        return hw_db[clean_input]
-    
-    # Try partial matching - find if any database entry is contained in the input
-    for db_name, score in hw_db.items():
-        # Remove special characters for comparison
-        clean_db_name = db_name.replace("-", "")
-        clean_search = clean_input.replace("-", "")
-        
-        # Check if database name is in the component name or vice versa
-        if clean_db_name in clean_search or clean_search in clean_db_name:
-            print(f"✓ Matched '{part_name}' with '{db_name}' (score: {score})")
-            return score
-    
-    # If still not found, try matching key parts (for CPUs and GPUs)
-    # Extract model numbers and key identifiers
-    import re
-    
-    # For CPUs: look for patterns like i5-12400, Ryzen5, etc.
-    cpu_patterns = [
-        r'i[3579]-?\d+',  # Intel i3, i5, i7, i9
-        r'ryzen[3579]',    # AMD Ryzen 3, 5, 7, 9
-    ]
-    
-    # For GPUs: look for patterns like RTX3060, RX6600, etc.
-    gpu_patterns = [
-        r'rtx\d+',        # NVIDIA RTX
-        r'gtx\d+',        # NVIDIA GTX
-        r'rx\d+',         # AMD RX
-    ]
-    
-    all_patterns = cpu_patterns + gpu_patterns
-    
-    for pattern in all_patterns:
-        match_input = re.search(pattern, clean_input)
-        if match_input:
-            matched_part = match_input.group()
-            # Search in database
-            for db_name, score in hw_db.items():
-                if re.search(pattern, db_name):
-                    db_match = re.search(pattern, db_name)
-                    if db_match and db_match.group() == matched_part:
-                        print(f"✓ Pattern matched '{part_name}' with '{db_name}' (score: {score})")
-                        return score
-    
-    print(f"⚠ No match found for: {part_name}")
-    return 0
+    with STAGE_SECONDS.time(stage='score_lookup'):
+        match = assets.get('hw_resolver').resolve(part_name)
+    NAME_MATCHES.inc(match=match[2] if match else 'none')
+    return match[1] if match else 0
 
 # Calculate system bottleneck (which component limits performance)
-def calculate_bottleneck(c_score, g_score, res_code):
-    """Calculate bottleneck percentage and identify limiting component"""
-    MAX_CPU_SCORE = 30000.0
-    MAX_GPU_SCORE = 30000.0
-    
+def bottleneck_cpu_weight(res_code):
+    """Share of the load on the CPU at a resolution code"""
     # Different resolutions stress CPU vs GPU differently
     # 1080P: CPU matters more, 4K: GPU matters more
     if res_code == 2:  # 1080P
-        cpu_weight = 0.55
+        return 0.55
     elif res_code == 4:  # 4K
-        cpu_weight = 0.30
+        return 0.30
     elif res_code == 3:  # 1440P
-        cpu_weight = 0.425
-    else:
-        cpu_weight = 0.50
+        return 0.425
+    return 0.50
+
+def calculate_bottleneck(c_score, g_score, res_code):
+    """Calculate bottleneck percentage and identify limiting component"""
+    MAX_CPU_SCORE = 30000.0
+    MAX_GPU_SCORE = 30000.0
+    
+    cpu_weight = bottleneck_cpu_weight(res_code)
     
     # Normalize scores to 0-1 range
     cpu_norm = min(c_score / MAX_CPU_SCORE, 1.0)
@@ -643,152 +1295,550 @@ def calculate_bottleneck(c_score, g_score, res_code):
     bottleneck_pct = min(int(percentage_loss * 100 * 0.40), 99)
     return bottleneck_pct, bottleneck_type
 
-# API: Predict gaming performance for a PC build
-@app.route('/api/performance/predict', methods=['POST'])
-def predict_performance():
-    try:
-        # Get PC components from request
-        data = request.json
-        cpu_name = data.get('cpu')
-        gpu_name = data.get('gpu')
-        ram_gb = int(data.get('ram', 16))
+BOTTLENECK_TYPES = np.array(["CPU", "GPU", "Balanced"], dtype=object)
 
-        print(f"\n=== Performance Prediction Request ===")
-        print(f"CPU: {cpu_name}")
-        print(f"GPU: {gpu_name}")
-        print(f"RAM: {ram_gb}GB")
+def calculate_bottleneck_array(c_scores, g_scores, res_code):
+    """calculate_bottleneck for arrays of scores: (pct, type) arrays,
+    element for element the same numbers"""
+    cpu_weight = bottleneck_cpu_weight(res_code)
+    cpu_eff = np.minimum(np.asarray(c_scores) / MAX_CPU_SCORE, 1.0) / cpu_weight
+    gpu_eff = np.minimum(np.asarray(g_scores) / MAX_GPU_SCORE, 1.0) / (1 - cpu_weight)
 
-        # Look up performance scores for CPU and GPU
-        c_score = get_score(cpu_name)
-        g_score = get_score(gpu_name)
+    gpu_limited = cpu_eff > gpu_eff
+    cpu_limited = gpu_eff > cpu_eff
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percentage_loss = np.where(gpu_limited, np.abs(1 - gpu_eff / cpu_eff), np.abs(1 - cpu_eff / gpu_eff))
+    bottleneck_pct = np.where(gpu_limited | cpu_limited,
+                              np.minimum(np.trunc(percentage_loss * 100 * 0.40), 99), 0).astype(np.int64)
+    bottleneck_type = BOTTLENECK_TYPES[np.where(gpu_limited, 1, np.where(cpu_limited, 0, 2))]
+    return bottleneck_pct, bottleneck_type
 
-        print(f"CPU Score: {c_score}")
-        print(f"GPU Score: {g_score}")
+# Normalization limits used for suitability scores (values scaled to 0-1)
+MAX_FPS_FOR_SUITABILITY = 150.0
+MAX_CPU_SCORE = 30000.0
+MAX_GPU_SCORE = 30000.0
+MAX_RAM_GB = 64.0
 
-        # Check if components were found in database
-        if c_score == 0 and g_score == 0:
-            return jsonify({
-                "error": "Both CPU and GPU not found in database",
-                "details": f"CPU: '{cpu_name}' and GPU: '{gpu_name}' are not in the hardware database. Please add them to data/hardware_lookup.csv"
-            }), 404
-        elif c_score == 0:
-            return jsonify({
-                "error": "CPU not found in database",
-                "details": f"CPU '{cpu_name}' not found. Please add it to data/hardware_lookup.csv"
-            }), 404
-        elif g_score == 0:
-            return jsonify({
-                "error": "GPU not found in database", 
-                "details": f"GPU '{gpu_name}' not found. Please add it to data/hardware_lookup.csv"
-            }), 404
+# Resolution FPS multipliers based on real-world performance
+# These are applied as post-processing to base 1080p predictions
+RESOLUTION_FPS_MULTIPLIERS = {
+    '1080p': 1.0,      # Baseline
+    '1440p': 0.65,     # ~35% FPS reduction
+    '4K': 0.42         # ~58% FPS reduction
+}
 
-        # Normalize all values to 0-1 range for calculations
-        MAX_FPS_FOR_SUITABILITY = 150.0
-        MAX_CPU_SCORE = 30000.0
-        MAX_GPU_SCORE = 30000.0
-        MAX_RAM_GB = 64.0
-        
-        N_CPU = min(c_score / MAX_CPU_SCORE, 1.0)
-        N_GPU = min(g_score / MAX_GPU_SCORE, 1.0)
-        N_RAM = min(ram_gb / MAX_RAM_GB, 1.0)
-        
-        bottleneck_pct_static, bottleneck_type_static = calculate_bottleneck(c_score, g_score, 2)
-
-        # Resolution FPS multipliers based on real-world performance
-        # These are applied as post-processing to base 1080p predictions
-        resolution_fps_multipliers = {
-            '1080p': 1.0,      # Baseline
-            '1440p': 0.65,     # ~35% FPS reduction
-            '4K': 0.42         # ~58% FPS reduction
-        }
+PREDICTION_RESOLUTIONS = [
+    {"name": "1080p", "code": 2},
+    {"name": "1440p", "code": 3},
+    {"name": "4K", "code": 4}
+]
 
-        resolutions = [
-            {"name": "1080p", "code": 2},
-            {"name": "1440p", "code": 3},
-            {"name": "4K", "code": 4}
+# Largest number of builds accepted by the batch endpoint
+MAX_BATCH_BUILDS = 1000
+
+def score_build(data):
+    """Look up CPU and GPU scores for one build request
+    
+    Returns (build, None) when both parts are found, otherwise
+    (None, (error_body, status_code)).
+    """
+    cpu_name = data.get('cpu')
+    gpu_name = data.get('gpu')
+    ram_gb = int(data.get('ram', 16))
+
+    # Look up performance scores for CPU and GPU
+    c_score = get_score(cpu_name)
+    g_score = get_score(gpu_name)
+
+    # Check if components were found in database
+    if c_score == 0 and g_score == 0:
+        return None, ({
+            "error": "Both CPU and GPU not found in database",
+            "details": f"CPU: '{cpu_name}' and GPU: '{gpu_name}' are not in the hardware database. Please add them to data/hardware_lookup.csv"
+        }, 404)
+    elif c_score == 0:
+        return None, ({
+            "error": "CPU not found in database",
+            "details": f"CPU '{cpu_name}' not found. Please add it to data/hardware_lookup.csv"
+        }, 404)
+    elif g_score == 0:
+        return None, ({
+            "error": "GPU not found in database", 
+            "details": f"GPU '{gpu_name}' not found. Please add it to data/hardware_lookup.csv"
+        }, 404)
+
+    build = {
+        "cpu": cpu_name,
+        "gpu": gpu_name,
+        "ram": ram_gb,
+        "c_score": c_score,
+        "g_score": g_score
+    }
+    return build, None
+
+def nearest_measured_builds(build):
+    """The measured builds nearest to this one for each resolution (as
+    NearestFpsIndex finds them), {"1080P": [{"cpu_score", "gpu_score",
+    "ram_gb", "fps", "distance"}, ...], ...}, nearest first"""
+    fps_nearest_index = assets.get('fps_nearest_index')
+    if fps_nearest_index is None:
+        return {res: [] for res in CSV_RESOLUTIONS}
+    return {
+        res: fps_nearest_index.neighbours(build['c_score'], build['g_score'], build['ram'], res)
+        for res in CSV_RESOLUTIONS
+    }
+
+def wants_neighbours(data):
+    """The request's optional "neighbours" flag: (flag, None), or
+    (None, (error_body, status_code)) when it isn't a boolean"""
+    neighbours = data.get('neighbours', False)
+    if not isinstance(neighbours, bool):
+        return None, ({"error": "'neighbours' must be true or false"}, 400)
+    return neighbours, None
+
+def with_neighbours(prediction, build, neighbours):
+    """The prediction plus 'neighbours' when the request asked for them"""
+    if not neighbours:
+        return prediction
+    return {**prediction, "neighbours": nearest_measured_builds(build)}
+
+def predict_builds(builds):
+    """Predict performance for a list of scored builds (from score_build)
+    
+    Known parts are looked up in the prediction table. Cached predictions
+    are reused (keyed on scores + RAM, so every spelling of a part name
+    shares one entry); the rest are computed together. Results come back
+    in input order.
+    """
+    if not builds:
+        return []
+
+    table = assets.get('prediction_table')
+    version = assets.version('intelligent_df', 'fps_lookup_index', 'fps_nearest_index', 'fps_model', 'gaming_model')
+    predictions = [None] * len(builds)
+    missing = []
+    for i, build in enumerate(builds):
+        if table is not None:
+            predictions[i] = table.lookup(build)
+            CACHE_EVENTS.inc(cache='prediction_table', result='miss' if predictions[i] is None else 'hit')
+            if predictions[i] is not None:
+                continue
+        cached = response_cache.get(prediction_key(build), version)
+        if cached is not None:
+            # Echo this request's part names, not the ones first cached
+            predictions[i] = {**cached, "build_info": {**cached["build_info"], "cpu": build['cpu'], "gpu": build['gpu']}}
+        else:
+            missing.append(i)
+
+    computed = _predict_uncached([builds[i] for i in missing])
+    for i, prediction in zip(missing, computed):
+        response_cache.put(prediction_key(builds[i]), version, prediction)
+        predictions[i] = prediction
+    return predictions
+
+def predict_fps_array(c_scores, g_scores, rams):
+    """FPS [build, resolution] for arrays of scores and RAM sizes, the same
+    numbers /api/performance/predict returns. Table hits are one vectorized
+    lookup; the rest go through predict_builds together."""
+    fps = np.zeros((len(c_scores), len(PREDICTION_RESOLUTIONS)), dtype=np.int64)
+    missing = np.arange(len(c_scores))
+    table = assets.get('prediction_table')
+    if table is not None:
+        fps, found = table.lookup_fps(c_scores, g_scores, rams)
+        CACHE_EVENTS.inc(int(found.sum()), cache='prediction_table', result='hit')
+        CACHE_EVENTS.inc(int(len(found) - found.sum()), cache='prediction_table', result='miss')
+        missing = np.flatnonzero(~found)
+    if len(missing):
+        builds = [
+            {"cpu": "", "gpu": "", "ram": ram, "c_score": c_score, "g_score": g_score}
+            for c_score, g_score, ram in zip(np.asarray(c_scores)[missing].tolist(),
+                                              np.asarray(g_scores)[missing].tolist(),
+                                              np.asarray(rams)[missing].tolist())
         ]
-        
-        results = []
-        
-        # Strategy: Try CSV exact match first, fallback to model prediction
-        print("\n--- FPS Prediction Strategy: CSV First → Model Fallback ---")
-        
-        # First, predict base FPS at 1080p using the model
+        for i, prediction in zip(missing, predict_builds(builds)):
+            fps[i] = [result['fps'] for result in prediction['results']]
+    return fps
+
+def prediction_key(build):
+    return response_cache.make_key('predict', build['c_score'], build['g_score'], build['ram'])
+
+def _predict_uncached(builds):
+    """Model predictions for scored builds
+    
+    FPS comes from measured builds (exact or nearest-neighbour matches)
+    wherever they can answer; the FPS model is only called for the builds
+    they can't, once for all of them. The gaming model is called once for
+    every build x resolution row. Results come back in input order.
+    """
+    if not builds:
+        return []
+
+    fps_model = assets.get('fps_model')
+    gaming_model = assets.get('gaming_model')
+
+    scores = np.array([[b['c_score'], b['g_score'], b['ram']] for b in builds], dtype=float)
+    multipliers = np.array([RESOLUTION_FPS_MULTIPLIERS[res['name']] for res in PREDICTION_RESOLUTIONS])
+
+    # Measured FPS first; builds it can't fully answer need a base prediction
+    measured = [find_measured_fps_all_resolutions(b['c_score'], b['g_score'], b['ram']) for b in builds]
+    fps = [resolution_fps(m, None) for m in measured]
+    need_model = [i for i, build_fps in enumerate(fps) if build_fps is None]
+
+    if need_model:
+        need_scores = scores[need_model]
         if fps_model and gaming_model:
             # Use 1080p baseline (multiplier = 1.0) for prediction
-            base_features = [[c_score, g_score, ram_gb, 1.0]]
-            base_fps_1080 = fps_model.predict(base_features)[0]
+            base_features = np.column_stack([need_scores, np.ones(len(need_model))])
+            with STAGE_SECONDS.time(stage='model_inference'):
+                base_fps_1080 = fps_model.predict(base_features)
         else:
             # Fallback calculation if model not loaded
-            base_fps_1080 = 120 * (N_GPU * 0.6 + N_CPU * 0.4)
+            n_cpu = np.minimum(need_scores[:, 0] / MAX_CPU_SCORE, 1.0)
+            n_gpu = np.minimum(need_scores[:, 1] / MAX_GPU_SCORE, 1.0)
+            base_fps_1080 = 120 * (n_gpu * 0.6 + n_cpu * 0.4)
+        for i, base in zip(need_model, base_fps_1080):
+            fps[i] = resolution_fps(measured[i], base)
+
+    # Gaming suitability for every build x resolution row in one call
+    gaming_flags = None
+    if gaming_model:
+        gaming_features = np.column_stack([
+            np.repeat(scores, len(multipliers), axis=0),
+            np.tile(multipliers, len(builds))
+        ])
+        with STAGE_SECONDS.time(stage='model_inference'):
+            gaming_flags = gaming_model.predict(gaming_features).reshape(len(builds), len(multipliers))
+
+    return [
+        _build_prediction(build, fps[i], gaming_flags[i] if gaming_flags is not None else None)
+        for i, build in enumerate(builds)
+    ]
+
+def resolution_fps(measured, base_fps_1080):
+    """FPS for each of PREDICTION_RESOLUTIONS
+    
+    A measured value (from find_measured_fps_all_resolutions) is used
+    while FPS keeps falling with resolution (1080p > 1440p > 4K); anything
+    else is the model's 1080p prediction times the resolution multiplier.
+    Returns None when the model is needed but base_fps_1080 is None.
+    """
+    result = []
+    previous_res_fps = None  # Track previous resolution FPS for validation
+    for res in PREDICTION_RESOLUTIONS:
+        res_name = res['name']
+        pred_fps = measured.get(res_name.upper())
+        if pred_fps is None or (previous_res_fps is not None and pred_fps >= previous_res_fps):
+            # No CSV match, or CSV data violates resolution ordering - use model
+            if base_fps_1080 is None:
+                return None
+            if pred_fps is not None:
+                logger.debug("CSV invalid (%s=%s >= previous=%s), using model",
+                             res_name, pred_fps, previous_res_fps)
+            pred_fps = int(base_fps_1080 * RESOLUTION_FPS_MULTIPLIERS[res_name])
+            logger.debug("Model prediction: %s = %s FPS", res_name, pred_fps)
+        result.append(pred_fps)
+        previous_res_fps = pred_fps  # Update for next iteration
+    return result
+
+def _build_prediction(build, resolution_fps_values, gaming_flags):
+    """Per-resolution results for one build, given its FPS and model outputs"""
+    c_score = build['c_score']
+    g_score = build['g_score']
+    ram_gb = build['ram']
+
+    N_CPU = min(c_score / MAX_CPU_SCORE, 1.0)
+    N_GPU = min(g_score / MAX_GPU_SCORE, 1.0)
+    N_RAM = min(ram_gb / MAX_RAM_GB, 1.0)
+    
+    bottleneck_pct_static, bottleneck_type_static = calculate_bottleneck(c_score, g_score, 2)
+    
+    results = []
+    for i, res in enumerate(PREDICTION_RESOLUTIONS):
+        pred_fps = resolution_fps_values[i]
         
-        # Now generate predictions for each resolution by applying multipliers
-        previous_res_fps = None  # Track previous resolution FPS for validation
+        # Predict gaming suitability
+        if gaming_flags is not None:
+            is_gaming_good = gaming_flags[i]
+        else:
+            is_gaming_good = 1 if pred_fps > 60 else 0
         
-        for res in resolutions:
-            res_name = res['name']
-            multiplier = resolution_fps_multipliers[res_name]
-            
-            # Calculate model prediction for comparison
-            model_pred_fps = int(base_fps_1080 * multiplier)
-            
-            # Try to find exact match in CSV first
-            exact_fps = find_exact_fps_from_csv(c_score, g_score, ram_gb, res_name)
-            
-            # Validation: CSV FPS should follow correct ordering
-            # Higher resolution = Lower FPS (1080p > 1440p > 4K)
-            use_csv = False
-            if exact_fps is not None:
-                # Check if CSV data follows correct ordering
-                if previous_res_fps is None or exact_fps < previous_res_fps:
-                    # CSV data looks valid
-                    pred_fps = exact_fps
-                    use_csv = True
-                else:
-                    # CSV data violates resolution ordering - use model instead
-                    pred_fps = model_pred_fps
-                    print(f"  ⚠ CSV Invalid ({res_name}={exact_fps} >= previous={previous_res_fps}) → Using Model: {pred_fps} FPS")
-            else:
-                # No CSV match - use model
-                pred_fps = model_pred_fps
-                print(f"  → Model Prediction: {res_name} = {pred_fps} FPS")
-            
-            previous_res_fps = pred_fps  # Update for next iteration
-            
-            # Predict gaming suitability
-            if gaming_model:
-                features = [[c_score, g_score, ram_gb, multiplier]]
-                is_gaming_good = gaming_model.predict(features)[0]
-            else:
-                is_gaming_good = 1 if pred_fps > 60 else 0
-            
-            # Simple suitability calculation
-            N_FPS = min(pred_fps / MAX_FPS_FOR_SUITABILITY, 1.0)
-            final_pct = int(((N_FPS * 0.5) + (N_CPU * 0.15) + (N_GPU * 0.3) + (N_RAM * 0.05)) * 100)
-            
-            results.append({
-                "resolution": res['name'],
-                "fps": pred_fps,
-                "gaming_rating": "Excellent" if is_gaming_good == 1 else "Average",
-                "suitability_score": final_pct,
-                "bottleneck_pct": bottleneck_pct_static,
-                "bottleneck_type": bottleneck_type_static
-            })
-
-        return jsonify({
-            "build_info": {
-                "cpu": cpu_name,
-                "gpu": gpu_name,
-                "ram": ram_gb,
-                "total_score": int(c_score + g_score)
-            },
-            "results": results
+        # Simple suitability calculation
+        N_FPS = min(pred_fps / MAX_FPS_FOR_SUITABILITY, 1.0)
+        final_pct = int(((N_FPS * 0.5) + (N_CPU * 0.15) + (N_GPU * 0.3) + (N_RAM * 0.05)) * 100)
+        
+        results.append({
+            "resolution": res['name'],
+            "fps": pred_fps,
+            "gaming_rating": "Excellent" if is_gaming_good == 1 else "Average",
+            "suitability_score": final_pct,
+            "bottleneck_pct": bottleneck_pct_static,
+            "bottleneck_type": bottleneck_type_static
         })
 
+    return {
+        "build_info": {
+            "cpu": build['cpu'],
+            "gpu": build['gpu'],
+            "ram": ram_gb,
+            "total_score": int(c_score + g_score)
+        },
+        "results": results
+    }
+
+# API: Predict gaming performance for a PC build
+@app.route('/api/performance/predict', methods=['POST'])
+def predict_performance():
+    try:
+        # Get PC components from request
+        data = request.json
+
+        logger.debug("Performance prediction request: CPU=%s GPU=%s RAM=%sGB",
+                     data.get('cpu'), data.get('gpu'), data.get('ram', 16))
+
+        neighbours, error = wants_neighbours(data)
+        if error:
+            return jsonify(error[0]), error[1]
+        build, error = score_build(data)
+        if error:
+            return jsonify(error[0]), error[1]
+
+        logger.debug("CPU score: %s, GPU score: %s", build['c_score'], build['g_score'])
+
+        # Strategy: Try CSV exact match first, fallback to model prediction
+        return jsonify(with_neighbours(predict_builds([build])[0], build, neighbours))
+
     except Exception as e:
-        print("Server Error:", e)
+        logger.exception("Server Error")
         return jsonify({"error": "Internal Server Error", "details": str(e)}), 500
 
+# API: Predict performance for many builds in one request
+@app.route('/api/performance/predict/batch', methods=['POST'])
+def predict_performance_batch():
+    """Body: {"builds": [{"cpu": ..., "gpu": ..., "ram": 16}, ...]}
+    
+    Returns {"results": [...]} in input order. Each entry is exactly what
+    /api/performance/predict returns for that build (including error bodies).
+    
+    With "Accept: application/x-ndjson" the results stream back as
+    {"index", ...} lines, computed PREDICT_STREAM_GROUP builds at a time.
+    An application/x-ndjson body (one build per line) has no size limit
+    and always gets NDJSON back.
+    """
+    try:
+        if request.mimetype == NDJSON_MIMETYPE:
+            read_errors = {}
+            return ndjson_response(prediction_rows(read_ndjson_builds(request.stream, read_errors), read_errors))
+
+        data = request.json
+        builds = data.get('builds') if isinstance(data, dict) else None
+        if not isinstance(builds, list):
+            return jsonify({"error": "'builds' must be a list"}), 400
+        if len(builds) > MAX_BATCH_BUILDS:
+            return jsonify({"error": f"Too many builds (max {MAX_BATCH_BUILDS} per request); "
+                                     "send application/x-ndjson to stream larger inputs"}), 400
+        if wants_ndjson():
+            return ndjson_response(prediction_rows(builds))
+
+        return jsonify({"results": predict_batch(builds)})
+
+    except Exception as e:
+        logger.exception("Server Error")
+        return jsonify({"error": "Internal Server Error", "details": str(e)}), 500
+
+# Builds scored and predicted together per NDJSON stream step
+PREDICT_STREAM_GROUP = 100
+
+def predict_batch(builds):
+    """/api/performance/predict bodies for a list of request builds, in order"""
+    responses = [None] * len(builds)
+    scored_builds = []
+    positions = []
+    neighbour_flags = []
+    for i, build_data in enumerate(builds):
+        try:
+            neighbours, error = wants_neighbours(build_data)
+            if not error:
+                build, error = score_build(build_data)
+        except Exception as e:
+            responses[i] = {"error": "Internal Server Error", "details": str(e)}
+            continue
+        if error:
+            responses[i] = error[0]
+        else:
+            scored_builds.append(build)
+            positions.append(i)
+            neighbour_flags.append(neighbours)
+
+    # One predict call per model for all valid builds
+    for i, build, neighbours, prediction in zip(positions, scored_builds, neighbour_flags,
+                                                predict_builds(scored_builds)):
+        responses[i] = with_neighbours(prediction, build, neighbours)
+    return responses
+
+def prediction_rows(builds, read_errors=None):
+    """NDJSON rows {"index", ...} for any iterable of request builds,
+    predicted PREDICT_STREAM_GROUP at a time. read_errors holds unreadable
+    NDJSON input lines."""
+    read_errors = read_errors if read_errors is not None else {}
+    builds = iter(builds)
+    start = 0
+    while True:
+        group = list(itertools.islice(builds, PREDICT_STREAM_GROUP))
+        if not group:
+            return
+        for offset, response in enumerate(predict_batch(group)):
+            index = start + offset
+            if index in read_errors:
+                response = {"error": "Invalid JSON", "details": read_errors.pop(index)}
+            yield {'index': index, **response}
+        start += len(group)
+
+# ============================================================================
+# UPGRADE ANALYZER - Best CPU/GPU upgrades for a build within a budget
+# ============================================================================
+
+DEFAULT_UPGRADE_RESULTS = 10
+MAX_UPGRADE_RESULTS = 50
+
+# API: Rank every possible CPU/GPU upgrade for a build
+@app.route('/api/performance/upgrades', methods=['POST'])
+def performance_upgrades():
+    """Body: {"cpu": ..., "gpu": ..., "ram": 16, "budget": 300,
+              "parts": ["CPU", "GPU"], "resolution": "1080p", "limit": 10}
+    
+    Every faster CPU and GPU whose estimated extra cost is within budget
+    replaces the current part in turn; all of them are predicted in one
+    pass. Upgrades are ranked by FPS gain per dollar at "resolution", and
+    each lists FPS, gain and bottleneck (with its shift from the current
+    build) for all three resolutions.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        # JSON true/false would otherwise pass as 1/0
+        if isinstance(data.get('budget'), bool) or isinstance(data.get('limit'), bool):
+            raise TypeError
+        budget = float(data['budget'])
+        limit = int(data.get('limit', DEFAULT_UPGRADE_RESULTS))
+    except (KeyError, TypeError, ValueError, OverflowError):
+        return jsonify({"error": "'budget' (number) is required; 'limit' must be an integer"}), 400
+    # "nan" and "inf" parse as floats but aren't budgets (nor valid JSON to echo back)
+    if not math.isfinite(budget):
+        return jsonify({"error": "'budget' must be a finite number"}), 400
+    if budget < 0:
+        return jsonify({"error": "'budget' must not be negative"}), 400
+    try:
+        ram = int(data.get('ram', 16))
+    except (TypeError, ValueError, OverflowError):
+        return jsonify({"error": "'ram' must be an integer (GB)"}), 400
+    if ram <= 0:
+        return jsonify({"error": "'ram' must be positive"}), 400
+    if not 1 <= limit <= MAX_UPGRADE_RESULTS:
+        return jsonify({"error": f"'limit' must be between 1 and {MAX_UPGRADE_RESULTS}"}), 400
+    parts = data.get('parts', list(PART_KINDS))
+    if not isinstance(parts, list) or not parts or any(part not in PART_KINDS for part in parts):
+        return jsonify({"error": f"'parts' must be a list from {list(PART_KINDS)}"}), 400
+    rank_by = data.get('resolution', '1080p')
+    if rank_by not in RESOLUTION_FPS_MULTIPLIERS:
+        return jsonify({"error": f"Invalid resolution. Choose from {list(RESOLUTION_FPS_MULTIPLIERS)}"}), 400
+
+    candidates = assets.get('upgrade_candidates')
+    if candidates is None:
+        return jsonify({"error": "Upgrade analysis not available"}), 503
+
+    try:
+        build, error = score_build(data)
+        if error:
+            return jsonify(error[0]), error[1]
+        with STAGE_SECONDS.time(stage='upgrade_analysis'):
+            result = analyze_upgrades(candidates, build, budget, parts, rank_by, limit)
+        return jsonify(result)
+    except Exception as e:
+        logger.exception("Server Error")
+        return jsonify({"error": "Internal Server Error", "details": str(e)}), 500
+
+def analyze_upgrades(candidates, build, budget, parts, rank_by, limit):
+    """Ranked upgrades for a scored build (see performance_upgrades)"""
+    resolver = assets.get('hw_resolver')
+    current = {'CPU': (build['cpu'], build['c_score']), 'GPU': (build['gpu'], build['g_score'])}
+
+    # Row 0 is the current build, then one row per candidate
+    c_scores = [np.array([build['c_score']])]
+    g_scores = [np.array([build['g_score']])]
+    kinds, names, scores, costs = [], [], [], []
+    unpriced = []
+    for kind in parts:
+        name, score = current[kind]
+        key = resolver.resolve(name)[0]
+        if candidates.price(kind, key) is None:
+            unpriced.append(kind)
+            continue
+        kind_names, kind_scores, kind_costs = candidates.select(kind, key, score, budget)
+        c_scores.append(kind_scores if kind == 'CPU' else np.full(len(kind_scores), build['c_score']))
+        g_scores.append(kind_scores if kind == 'GPU' else np.full(len(kind_scores), build['g_score']))
+        kinds += [kind] * len(kind_names)
+        names.append(kind_names)
+        scores.append(kind_scores)
+        costs.append(kind_costs)
+    c_scores = np.concatenate(c_scores)
+    g_scores = np.concatenate(g_scores)
+    names = np.concatenate(names) if names else np.array([], dtype=object)
+    scores = np.concatenate(scores) if scores else np.array([], dtype=np.int64)
+    costs = np.concatenate(costs) if costs else np.array([])
+
+    fps = predict_fps_array(c_scores, g_scores, np.full(len(c_scores), build['ram']))
+    bottlenecks = [calculate_bottleneck_array(c_scores, g_scores, res['code']) for res in PREDICTION_RESOLUTIONS]
+
+    gains = fps[1:] - fps[0]
+    resolution_names = [res['name'] for res in PREDICTION_RESOLUTIONS]
+    order = rank_upgrades(gains[:, resolution_names.index(rank_by)], costs)
+    per_dollar = gain_per_dollar(gains, costs)
+
+    upgrades = []
+    for i in order[:limit].tolist():
+        row = i + 1
+        upgrades.append({
+            "part": kinds[i],
+            "name": names[i],
+            "score": int(scores[i]),
+            "estimated_cost": int(round(costs[i])),
+            "results": [
+                {
+                    "resolution": res_name,
+                    "fps": int(fps[row, r]),
+                    "fps_gain": int(gains[i, r]),
+                    # None for upgrades that cost nothing
+                    "fps_gain_per_dollar": round(float(per_dollar[i, r]), 4) if costs[i] > 0 else None,
+                    "bottleneck_pct": int(bottlenecks[r][0][row]),
+                    "bottleneck_type": bottlenecks[r][1][row],
+                    "bottleneck_shift": int(bottlenecks[r][0][row] - bottlenecks[r][0][0])
+                }
+                for r, res_name in enumerate(resolution_names)
+            ]
+        })
+
+    return {
+        "build_info": {
+            "cpu": build['cpu'],
+            "gpu": build['gpu'],
+            "ram": build['ram'],
+            "total_score": int(build['c_score'] + build['g_score'])
+        },
+        "budget": budget,
+        "rank_by": rank_by,
+        "current": [
+            {
+                "resolution": res_name,
+                "fps": int(fps[0, r]),
+                "bottleneck_pct": int(bottlenecks[r][0][0]),
+                "bottleneck_type": bottlenecks[r][1][0]
+            }
+            for r, res_name in enumerate(resolution_names)
+        ],
+        "evaluated": len(names),
+        "unpriced_parts": unpriced,
+        "upgrades": upgrades
+    }
+
 # ============================================================================
 # RUN APPLICATION
 # ============================================================================
@@ -0,0 +1,127 @@
+# Compiled Dataset Snapshots
+# The CSV datasets (final_ruleset_data.csv, hardware_lookup.csv) can be
+# compiled into a column-oriented binary snapshot that loads without any
+# parsing:
+#
+#   models/snapshot/final_ruleset_data/manifest.json
+#   models/snapshot/final_ruleset_data/price.npy
+#   models/snapshot/final_ruleset_data/cpu.codes.npy
+#   ...
+#
+# - Numeric columns are stored as .npy files with their CSV dtype
+# - Text columns (cpu, gpu, resolution, ...) are stored as categorical
+#   codes; the categories are kept in manifest.json
+#
+# The .npy files are memory-mapped on load, so gunicorn workers share the
+# same page-cache pages instead of each holding a private parsed copy.
+# A snapshot is only used while it is newer than its CSV; otherwise the
+# CSV is read as before.
+#
+# Compile with: python scripts/compile_assets.py
+
+import json
+import logging
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = 'models/snapshot'
+SNAPSHOT_FORMAT = 1
+
+
+def snapshot_path(csv_path, snapshot_dir=SNAPSHOT_DIR):
+    """Snapshot folder for a CSV ("data/x.csv" -> "models/snapshot/x")"""
+    return os.path.join(snapshot_dir, os.path.splitext(os.path.basename(csv_path))[0])
+
+
+def is_current(path, csv_path):
+    """True if the snapshot exists and was compiled after the CSV last changed"""
+    manifest = os.path.join(path, 'manifest.json')
+    if not os.path.exists(manifest):
+        return False
+    return not os.path.exists(csv_path) or os.path.getmtime(manifest) >= os.path.getmtime(csv_path)
+
+
+# ============================================================================
+# Writing
+# ============================================================================
+
+def compile_csv(csv_path, snapshot_dir=SNAPSHOT_DIR):
+    """Compile one CSV into its snapshot folder (replaced as a whole)"""
+    df = pd.read_csv(csv_path)
+    path = snapshot_path(csv_path, snapshot_dir)
+    tmp_path = path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    columns = []
+    for name in df.columns:
+        column = df[name]
+        if pd.api.types.is_numeric_dtype(column) or pd.api.types.is_bool_dtype(column):
+            np.save(os.path.join(tmp_path, f'{name}.npy'), column.to_numpy())
+            columns.append({'name': name, 'kind': 'numeric', 'dtype': str(column.dtype)})
+        else:
+            categorical = pd.Categorical(column)
+            np.save(os.path.join(tmp_path, f'{name}.codes.npy'), categorical.codes)
+            columns.append({'name': name, 'kind': 'categorical',
+                            'categories': categorical.categories.tolist()})
+
+    manifest = {
+        'format': SNAPSHOT_FORMAT,
+        'source': csv_path,
+        'source_size': os.path.getsize(csv_path),
+        'rows': len(df),
+        'columns': columns,
+    }
+    # Manifest last: its mtime is what is compared against the CSV
+    with open(os.path.join(tmp_path, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    # Swap the new folder in (old one removed after the rename)
+    old_path = path + '.old'
+    shutil.rmtree(old_path, ignore_errors=True)
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+    return path, manifest
+
+
+# ============================================================================
+# Reading
+# ============================================================================
+
+def load_snapshot(path):
+    """DataFrame backed by the memory-mapped snapshot arrays (read-only)"""
+    with open(os.path.join(path, 'manifest.json'), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported snapshot format in {path}: {manifest.get('format')}")
+
+    data = {}
+    for column in manifest['columns']:
+        name = column['name']
+        if column['kind'] == 'numeric':
+            data[name] = np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+        else:
+            codes = np.load(os.path.join(path, f'{name}.codes.npy'), mmap_mode='r')
+            data[name] = pd.Categorical.from_codes(codes, column['categories'])
+    # copy=False keeps one block per column, still pointing at the memmaps
+    return pd.DataFrame(data, copy=False)
+
+
+def read_dataset(csv_path, snapshot_dir=SNAPSHOT_DIR, use_snapshot=True):
+    """Load a dataset, from its snapshot when current, else from the CSV.
+    Returns (DataFrame, path it was loaded from)"""
+    if use_snapshot:
+        path = snapshot_path(csv_path, snapshot_dir)
+        if is_current(path, csv_path):
+            return load_snapshot(path), path
+        if os.path.exists(path):
+            logger.warning("Snapshot %s is older than %s, reading the CSV (run scripts/compile_assets.py)",
+                           path, csv_path)
+    return pd.read_csv(csv_path), csv_path
@@ -0,0 +1,98 @@
+# Benchmark: build completion solver (/api/manual/complete)
+#
+# 1. Parity: on small random sub-catalogs, the solver's best build has the
+#    same objective value and price as an exhaustive search over every
+#    combination of parts.
+# 2. Latency: full solve on the fake catalog at growing sizes, with the
+#    number of CPU x GPU pairs that had to be evaluated.
+#
+# The fake catalog's part names are not in hardware_lookup.csv, so CPU/GPU
+# scores come from a stable hash of the name.
+#
+# Run from the Backend folder:
+#   python benchmarks/bench_build_solver.py
+
+import hashlib
+import itertools
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(BACKEND_DIR)
+
+from build_solver import (BuildSolver, OBJECTIVES, PSU_HEADROOM_W,  # noqa: E402
+                          compatible_case_form_factors, parse_price)
+from fake_firestore import sample_catalog  # noqa: E402
+
+COLLECTIONS = {'cpu': 'cpus', 'motherboard': 'motherboards', 'gpu': 'gpus', 'ram': 'ram',
+               'cooler': 'coolers', 'storage': 'storage', 'psu': 'psus', 'case': 'cases'}
+
+
+def score(name):
+    return int(hashlib.md5(str(name).encode('utf-8')).hexdigest(), 16) % 20000 + 5000
+
+
+def candidates_from(catalog):
+    return {component: [dict(doc, id=doc_id) for doc_id, doc in sorted(catalog[collection].items())]
+            for component, collection in COLLECTIONS.items()}
+
+
+def exhaustive(candidates, budget, objective):
+    """(objective value, -price) of the best build, trying every combination"""
+    cpu_weight, gpu_weight = OBJECTIVES[objective]
+    storage = min(candidates['storage'], key=lambda d: parse_price(d['Price']))
+    best = None
+    parts = [candidates[k] for k in ['cpu', 'gpu', 'motherboard', 'ram', 'case', 'cooler', 'psu']]
+    for cpu, gpu, board, ram, case, cooler, psu in itertools.product(*parts):
+        if board['Socket'] != cpu['Socket'] or ram['RAM_Type'] != board['RAM_Type']:
+            continue
+        if cpu['Socket'] not in cooler['Supported_Sockets']:
+            continue
+        if case['Form_Factor'] not in compatible_case_form_factors(board['Form_Factor']):
+            continue
+        if case['Max_GPU_Length_cm'] < gpu['Length_cm'] or psu['Wattage'] < cpu['TDP'] + gpu['TDP'] + PSU_HEADROOM_W:
+            continue
+        total = sum(parse_price(d['Price']) for d in [cpu, gpu, board, ram, case, cooler, psu, storage])
+        if total > budget:
+            continue
+        key = (cpu_weight * score(cpu['Name']) + gpu_weight * score(gpu['Name']), -round(total, 2))
+        if best is None or key > best:
+            best = key
+    return best
+
+
+def main():
+    rng = random.Random(1)
+    full = candidates_from(sample_catalog(seed=7))
+    trials = 40
+    mismatches = 0
+    for _ in range(trials):
+        subset = {k: rng.sample(docs, 7 if k in ('cpu', 'gpu', 'motherboard') else 5) for k, docs in full.items()}
+        budget = rng.choice([900, 1300, 1800, 2500, 4000])
+        objective = rng.choice(list(OBJECTIVES))
+        expected = exhaustive(subset, budget, objective)
+        best, _ = BuildSolver(subset, score).solve(budget, objective, time_limit=5)
+        got = None if best is None else (best['score'], -best['total_price'])
+        if (expected is None) != (got is None) or (got and (
+                abs(expected[0] - got[0]) > 1e-9 or abs(expected[1] - got[1]) > 0.011)):
+            mismatches += 1
+    print(f"Parity with exhaustive search: {trials - mismatches}/{trials} identical")
+
+    print(f"{'catalog':>10} {'CPUxGPU pairs':>14} {'objective':>13} {'budget':>7} {'evaluated':>10} {'time':>9}")
+    for scale in [1, 10, 50]:
+        candidates = candidates_from(sample_catalog(seed=3, scale=scale))
+        pairs = len(candidates['cpu']) * len(candidates['gpu'])
+        for objective, budget in [('performance', 1200), ('gaming', 2000), ('cheapest', 2000)]:
+            start = time.perf_counter()
+            best, stats = BuildSolver(candidates, score).solve(budget, objective, time_limit=5)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{'x' + str(scale):>10} {pairs:>14} {objective:>13} {budget:>7} "
+                  f"{stats['pairs_evaluated']:>10} {elapsed:>7.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+# Dataset layout benchmark: final_ruleset_data.csv as read by pandas vs.
+# the compact layout of compact_dataset.py
+#
+# 1. Memory of the DataFrame, per column and in total (deep: includes the
+#    Python strings of object columns)
+# 2. Filter timings: the use-case, resolution and budget filters as string
+#    and int64 comparisons vs. bit tests and categorical codes
+# 3. Load-time scans over the whole dataset (FPS indexes, upgrade price
+#    fit), run on both layouts
+#
+# Run from the Backend folder:
+#   python benchmarks/bench_dataset.py
+
+import os
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from compact_dataset import category_mask, compact_builds, use_case_mask  # noqa: E402
+from fps_lookup import FpsLookupIndex, NearestFpsIndex  # noqa: E402
+from upgrade_analyzer import estimate_part_prices  # noqa: E402
+
+DATASET = 'data/final_ruleset_data.csv'
+
+
+def median_us(function, min_seconds=0.5):
+    """Median microseconds per call"""
+    function()
+    samples = []
+    deadline = time.perf_counter() + min_seconds
+    while time.perf_counter() < deadline or len(samples) < 5:
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+def memory(before, after):
+    old = before.memory_usage(deep=True, index=False)
+    new = after.memory_usage(deep=True, index=False)
+    print(f"Memory ({len(before)} rows, deep):")
+    print(f"  {'column':28s} {'pandas':>16s} {'compact':>18s}")
+    for name in before.columns:
+        if name in after.columns:
+            print(f"  {name:28s} {str(before[name].dtype):>7s} {old[name] / 1024:6.1f} KB "
+                  f"{str(after[name].dtype):>9s} {new[name] / 1024:6.1f} KB")
+        else:
+            print(f"  {name:28s} {str(before[name].dtype):>7s} {old[name] / 1024:6.1f} KB   (bit in use_cases)")
+    print(f"  {'use_cases':28s} {'':>16s} {str(after['use_cases'].dtype):>9s} {new['use_cases'] / 1024:6.1f} KB")
+    print(f"  {'total':28s} {old.sum() / 1024:14.1f} KB {new.sum() / 1024:16.1f} KB "
+          f"({old.sum() / new.sum():.1f}x smaller)")
+
+
+def filters(before, after):
+    budget = 1500
+    tests = [
+        ("resolution == '1440P'",
+         lambda: (before['resolution'] == '1440P').to_numpy(),
+         lambda: category_mask(after['resolution'], '1440P')),
+        ('is_good_for_gaming == 1',
+         lambda: (before['is_good_for_gaming'] == 1).to_numpy(),
+         lambda: use_case_mask(after, 'is_good_for_gaming')),
+        ('price <= budget',
+         lambda: before['price'].to_numpy() <= budget,
+         lambda: after['price'].to_numpy() <= budget),
+        ('use case & resolution & budget',
+         lambda: ((before['is_good_for_gaming'] == 1) & (before['resolution'] == '1440P')
+                  & (before['price'] <= budget)).to_numpy(),
+         lambda: use_case_mask(after, 'is_good_for_gaming') & category_mask(after['resolution'], '1440P')
+         & (after['price'].to_numpy() <= budget)),
+    ]
+    print("\nFilters (median per full-dataset filter):")
+    print(f"  {'':32s} {'pandas':>10s} {'compact':>10s}")
+    for name, old, new in tests:
+        assert np.array_equal(old(), new()), name
+        old_us, new_us = median_us(old), median_us(new)
+        print(f"  {name:32s} {old_us:7.1f} us {new_us:7.1f} us  ({old_us / new_us:.1f}x)")
+
+
+def scans(before, after):
+    tests = [
+        ('FpsLookupIndex', FpsLookupIndex),
+        ('NearestFpsIndex', NearestFpsIndex),
+        ('upgrade price fit', estimate_part_prices),
+    ]
+    print("\nLoad-time scans (median):")
+    print(f"  {'':32s} {'pandas':>10s} {'compact':>10s}")
+    for name, build in tests:
+        old_ms, new_ms = median_us(lambda: build(before)) / 1000, median_us(lambda: build(after)) / 1000
+        print(f"  {name:32s} {old_ms:7.2f} ms {new_ms:7.2f} ms")
+
+
+def main():
+    before = pd.read_csv(DATASET)
+    after = compact_builds(before)
+    memory(before, after)
+    filters(before, after)
+    scans(before, after)
+
+
+if __name__ == '__main__':
+    main()
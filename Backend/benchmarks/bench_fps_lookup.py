@@ -0,0 +1,128 @@
+# FPS lookup benchmark: nearest measured builds vs. the model
+#
+# 1. Accuracy on hardware the index hasn't seen: 5 folds, grouped by
+#    CPU x GPU pair, each fold predicted from the other four. Compared
+#    with what the app falls back to (the fps_model, else its formula,
+#    times the resolution multiplier) and with a stand-in
+#    RandomForestRegressor, since models/fps_model.pkl doesn't ship
+# 2. Latency per build (all three resolutions): exact lookup, nearest
+#    neighbours, and a one-row model call (sklearn and compiled)
+#
+# Run from the Backend folder:
+#   python benchmarks/bench_fps_lookup.py
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from fps_lookup import NEAREST_MAX_DISTANCE, NEAREST_NEIGHBOURS, FpsLookupIndex, NearestFpsIndex  # noqa: E402
+from model_runtime import compile_estimator, load_compiled, save_compiled  # noqa: E402
+
+MULTIPLIERS = {'1080P': 1.0, '1440P': 0.65, '4K': 0.42}  # as RESOLUTION_FPS_MULTIPLIERS in app.py
+FOLDS = 5
+
+
+def formula_fps(cpu_scores, gpu_scores, resolutions):
+    """app.py's fallback when fps_model isn't loaded"""
+    n_cpu = np.minimum(cpu_scores / 30000.0, 1.0)
+    n_gpu = np.minimum(gpu_scores / 30000.0, 1.0)
+    return 120 * (n_gpu * 0.6 + n_cpu * 0.4) * np.array([MULTIPLIERS[r] for r in resolutions])
+
+
+def stand_in_model(train):
+    """Fitted like the stand-in in bench_models.py"""
+    from sklearn.ensemble import RandomForestRegressor
+    X = np.column_stack([train[['cpu_score', 'gpu_score', 'ram_gb']].to_numpy(dtype=float), np.ones(len(train))])
+    return RandomForestRegressor(n_estimators=100, max_depth=15, random_state=42).fit(X, train['fps'].to_numpy(dtype=float))
+
+
+def accuracy(df):
+    pairs = df['cpu'] + '|' + df['gpu']
+    unique_pairs = pairs.unique()
+    rng = np.random.default_rng(0)
+    fold_of_pair = dict(zip(unique_pairs, rng.integers(FOLDS, size=len(unique_pairs))))
+    folds = pairs.map(fold_of_pair).to_numpy()
+
+    nearest, formula, forest, covered = [], [], [], []
+    for fold in range(FOLDS):
+        train, test = df[folds != fold], df[folds == fold]
+        index = NearestFpsIndex(train)
+        model = stand_in_model(train)
+        for row in test.itertuples():
+            fps = index.interpolate(row.cpu_score, row.gpu_score, row.ram_gb, row.resolution)
+            covered.append(fps is not None)
+            nearest.append(np.nan if fps is None else fps - row.fps)
+        formula.extend(formula_fps(test['cpu_score'].to_numpy(dtype=float), test['gpu_score'].to_numpy(dtype=float),
+                                   test['resolution']) - test['fps'].to_numpy())
+        X = np.column_stack([test[['cpu_score', 'gpu_score', 'ram_gb']].to_numpy(dtype=float), np.ones(len(test))])
+        forest.extend(model.predict(X) * np.array([MULTIPLIERS[r] for r in test['resolution']]) - test['fps'].to_numpy())
+
+    nearest, formula, forest, covered = map(np.array, (nearest, formula, forest, covered))
+    print(f"Accuracy on unseen CPU x GPU pairs ({FOLDS} folds, k={NEAREST_NEIGHBOURS}, "
+          f"max distance {NEAREST_MAX_DISTANCE:.0f}):")
+    print(f"  nearest neighbours answer {covered.mean() * 100:.1f}% of {len(covered)} rows")
+    print(f"  {'':28s} {'MAE':>6s} {'median':>7s} {'p90':>6s}   (absolute FPS error, answered rows)")
+    for name, errors in (('nearest neighbours', nearest), ('app fallback formula', formula),
+                         ('stand-in forest x multiplier', forest)):
+        errors = np.abs(errors[covered])
+        print(f"  {name:28s} {errors.mean():6.1f} {np.median(errors):7.1f} {np.percentile(errors, 90):6.1f}")
+
+
+def time_per_call(function, inputs, min_seconds=0.5):
+    """Median microseconds per call over repeated passes"""
+    samples = []
+    deadline = time.perf_counter() + min_seconds
+    while time.perf_counter() < deadline or len(samples) < 5:
+        start = time.perf_counter()
+        for item in inputs:
+            function(*item)
+        samples.append((time.perf_counter() - start) / len(inputs))
+    return statistics.median(samples) * 1e6
+
+
+def latency(df):
+    exact = FpsLookupIndex(df)
+    nearest = NearestFpsIndex(df)
+    model = stand_in_model(df)
+    path = os.path.join(tempfile.mkdtemp(prefix='fps-model-'), 'fps_model.npz')
+    save_compiled(*compile_estimator(model), path)
+    compiled = load_compiled(path)
+
+    rng = np.random.default_rng(1)
+    rows = df.sample(2000, random_state=1)
+    near_miss = [(c + rng.integers(-1500, 1500), g + rng.integers(-1500, 1500), r)
+                 for c, g, r in zip(rows['cpu_score'], rows['gpu_score'], rows['ram_gb'])]
+    resolutions = list(MULTIPLIERS)
+    one_row = [(np.array([[c, g, r, 1.0]], dtype=float),) for c, g, r in near_miss[:200]]
+
+    print("\nLatency per build (all three resolutions, median):")
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)
+        results = [
+            ('exact lookup (miss)', time_per_call(exact.lookup_all, near_miss)),
+            ('nearest neighbours', time_per_call(lambda c, g, r: nearest.interpolate_all(c, g, r, resolutions), near_miss)),
+            ('model, sklearn (1 row)', time_per_call(model.predict, one_row)),
+            ('model, compiled (1 row)', time_per_call(compiled.predict, one_row)),
+        ]
+    for name, us in results:
+        print(f"  {name:28s} {us:8.1f} us")
+
+
+def main():
+    df = pd.read_csv('data/final_ruleset_data.csv')
+    accuracy(df)
+    latency(df)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+# Micro-benchmark: get_score name resolution
+#
+# Compares the original linear fuzzy scan with HardwareNameResolver over
+# every name in hardware_lookup.csv plus noisy variants (case, spacing,
+# hyphens, brand prefixes, unknown parts). Reports per-call latency for
+# the old scan, the resolver without cache (cold) and with cache (warm),
+# and lists names where the two disagree.
+#
+# Run from the Backend folder:
+#   python benchmarks/bench_get_score.py
+
+import contextlib
+import io
+import os
+import re
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+import pandas as pd  # noqa: E402
+
+from hardware_resolver import HardwareNameResolver  # noqa: E402
+
+
+def load_hw_db():
+    lookup_df = pd.read_csv('data/hardware_lookup.csv')
+    lookup_df['clean_name'] = lookup_df['name'].astype(str).str.lower().str.replace(" ", "")
+    return lookup_df, lookup_df.set_index('clean_name')['score'].to_dict()
+
+
+def legacy_get_score(hw_db, part_name):
+    """Original get_score: linear substring scan, then regexes per entry"""
+    if not part_name or not hw_db:
+        return 0
+    clean_input = str(part_name).lower().replace(" ", "").replace("-", "")
+    if clean_input in hw_db:
+        return hw_db[clean_input]
+    for db_name, score in hw_db.items():
+        clean_db_name = db_name.replace("-", "")
+        clean_search = clean_input.replace("-", "")
+        if clean_db_name in clean_search or clean_search in clean_db_name:
+            return score
+    patterns = [r'i[3579]-?\d+', r'ryzen[3579]', r'rtx\d+', r'gtx\d+', r'rx\d+']
+    for pattern in patterns:
+        match_input = re.search(pattern, clean_input)
+        if match_input:
+            matched_part = match_input.group()
+            for db_name, score in hw_db.items():
+                if re.search(pattern, db_name):
+                    db_match = re.search(pattern, db_name)
+                    if db_match and db_match.group() == matched_part:
+                        return score
+    return 0
+
+
+def noisy_variants(name):
+    """A handful of ways users actually type a part name"""
+    lower = name.lower()
+    variants = [name, lower, name.upper(), name.replace(" ", ""), name.replace("-", " ")]
+    if lower.startswith('i'):
+        variants += [f"Intel Core {name}", f"intel core {name.replace('-', '')}"]
+    elif lower.startswith('ryzen'):
+        variants += [f"AMD {name}", f"AMD {name} Processor"]
+    elif lower.startswith('rtx') or lower.startswith('gtx'):
+        variants += [f"NVIDIA GeForce {name[:3]} {name[3:]}", f"GeForce {name} 8GB"]
+    elif lower.startswith('rx'):
+        variants += [f"AMD Radeon {name[:2]} {name[2:]}", f"Radeon {name}"]
+    return variants
+
+
+def build_names(lookup_df):
+    names = []
+    for name in lookup_df['name'].astype(str):
+        names.extend(noisy_variants(name))
+    names += ["Pentium Gold G7400", "Arc A770", "GTX 1660 Super", "Core Ultra 7 265K", "xyz"]
+    return names
+
+
+def time_per_call(func, names, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for name in names:
+            func(name)
+        elapsed = (time.perf_counter() - start) / len(names)
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    lookup_df, hw_db = load_hw_db()
+    names = build_names(lookup_df)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        legacy = time_per_call(lambda n: legacy_get_score(hw_db, n), names)
+        # Cold: a fresh resolver with caching disabled
+        cold_resolver = HardwareNameResolver(hw_db, cache_size=0)
+        cold = time_per_call(cold_resolver.score, names)
+        # Warm: cache populated by the first pass
+        warm_resolver = HardwareNameResolver(hw_db)
+        for name in names:
+            warm_resolver.score(name)
+        warm = time_per_call(warm_resolver.score, names)
+
+        differences = []
+        for name in names:
+            old_score = legacy_get_score(hw_db, name)
+            new_match = warm_resolver.resolve(name)
+            new_score = new_match[1] if new_match else 0
+            if old_score != new_score:
+                differences.append((name, old_score, new_match))
+
+    print(f"Names: {len(names)} ({len(lookup_df)} from hardware_lookup.csv + noisy variants)")
+    print(f"Legacy linear scan:   {legacy * 1e6:8.2f} us/call")
+    print(f"Resolver (no cache):  {cold * 1e6:8.2f} us/call")
+    print(f"Resolver (LRU cache): {warm * 1e6:8.2f} us/call")
+    print(f"Unresolved: {sum(1 for n in names if warm_resolver.resolve(n) is None)}")
+    # The legacy scan returns the first CSV row that is a substring, so
+    # e.g. "i5-12400F" used to resolve to i5-12400
+    print(f"Different result from legacy scan: {len(differences)}")
+    for name, old_score, new_match in differences[:15]:
+        print(f"  {name!r}: legacy={old_score} resolver={new_match}")
+
+
+if __name__ == '__main__':
+    main()
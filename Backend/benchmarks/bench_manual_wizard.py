@@ -0,0 +1,88 @@
+# Benchmark: Manual Build wizard, eight requests vs. /api/manual/wizard
+#
+# Serves the Manual Build routes from the fake Firestore client with a
+# fixed latency per query, with the catalog cache emptied before every
+# wizard run (the cost of a cold or expired cache). Compares:
+#
+# - sequential: the browser's current flow, one /api/manual/* request
+#   per component list, one after another
+# - aggregate:  one /api/manual/wizard request with every selection
+#
+# Reports end-to-end latency and worker-seconds (time a Flask worker is
+# busy per wizard), and checks the aggregate lists match the single routes.
+#
+# Run from the Backend folder:
+#   python benchmarks/bench_manual_wizard.py [latency_seconds]
+
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(BACKEND_DIR)
+os.environ.setdefault('ASSET_LOADING', 'lazy')
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import app  # noqa: E402
+
+from catalog_cache import CatalogCache  # noqa: E402
+from component_store import FirestoreStore  # noqa: E402
+from fake_firestore import FakeFirestore, sample_catalog  # noqa: E402
+
+RUNS = 10
+
+SELECTIONS = {'brand': 'Intel', 'socket': 'LGA1700', 'ram_type': 'DDR5', 'form_factor': 'ATX', 'gpu_length': '30'}
+
+SEQUENTIAL_URLS = {
+    'cpus': '/api/manual/cpus?brand=Intel',
+    'motherboards': '/api/manual/motherboards?socket=LGA1700',
+    'gpus': '/api/manual/gpus',
+    'ram': '/api/manual/ram?ram_type=DDR5',
+    'coolers': '/api/manual/coolers?socket=LGA1700',
+    'storage': '/api/manual/storage',
+    'psus': '/api/manual/psus',
+    'cases': '/api/manual/cases?form_factor=ATX&gpu_length=30',
+}
+
+
+def main():
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.05
+    db = FakeFirestore(sample_catalog(), latency=latency)
+    catalog = CatalogCache(FirestoreStore(db))
+    app.assets.set('catalog', catalog)
+    client = app.app.test_client()
+    wizard_url = '/api/manual/wizard?' + '&'.join(f"{k}={v}" for k, v in SELECTIONS.items())
+
+    sequential = []
+    aggregate = []
+    expected = {}
+    got = {}
+    for _ in range(RUNS):
+        catalog.invalidate()
+        start = time.perf_counter()
+        for component, url in SEQUENTIAL_URLS.items():
+            expected[component] = client.get(url).get_json()
+        sequential.append(time.perf_counter() - start)
+
+        catalog.invalidate()
+        start = time.perf_counter()
+        got = client.get(wizard_url).get_json()
+        aggregate.append(time.perf_counter() - start)
+
+    same = all(got.get(component) == expected[component] for component in SEQUENTIAL_URLS)
+    seq = statistics.median(sequential) * 1000
+    agg = statistics.median(aggregate) * 1000
+    print(f"Firestore latency per query: {latency * 1000:.0f} ms, {RUNS} cold-cache wizards")
+    print(f"Aggregate lists identical to single routes: {same}")
+    print(f"Sequential (8 requests): {seq:8.1f} ms end-to-end, {seq:8.1f} worker-ms")
+    print(f"Aggregate  (1 request):  {agg:8.1f} ms end-to-end, {agg:8.1f} worker-ms")
+    print(f"Speedup: {seq / agg:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
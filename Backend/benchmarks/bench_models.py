@@ -0,0 +1,164 @@
+# Model runtime benchmark: sklearn pickles vs. compiled NumPy models
+#
+# 1. Parity: every pickle in models/ that pickle.load can read, plus
+#    stand-in models fitted on the dataset (forest/tree regressors for the
+#    missing fps_model, linear and logistic regression) are compiled and
+#    compared with the same checks as scripts/compile_models.py. Any
+#    mismatch fails the run (exit 1). The same checks run in
+#    tests/test_model_runtime.py
+# 2. Latency per predict call: one row (a single lookup), 3 rows (one build
+#    x 3 resolutions, what /api/performance/predict sends) and 1000 rows
+# 3. Cold start: a fresh process importing and loading each model
+#    (pickle + sklearn vs. model_runtime), with the memory it added
+#
+# Compiled files go to a temporary folder; models/compiled/ is not touched.
+#
+# Run from the Backend folder:
+#   python benchmarks/bench_models.py [runs]
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'scripts'))
+os.chdir(BACKEND_DIR)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from compile_models import MODELS, check_parity, dataset_features, parity_inputs  # noqa: E402
+from model_runtime import compile_estimator, load_compiled, load_pickle, save_compiled  # noqa: E402
+
+# Runs inside each child process; prints one JSON line
+CHILD = r"""
+import json, sys, time
+
+def rss_kb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+
+runtime, path = sys.argv[1], sys.argv[2]
+import numpy
+before = rss_kb()
+start = time.perf_counter()
+if runtime == 'sklearn':
+    import warnings
+    warnings.simplefilter('ignore')
+    from model_runtime import load_pickle
+    model = load_pickle(path)
+else:
+    from model_runtime import load_compiled
+    model = load_compiled(path)
+model.predict(numpy.array([[20000.0, 20000.0, 16.0, 1.0]]))
+print(json.dumps({'ms': (time.perf_counter() - start) * 1000, 'rss_kb': rss_kb() - before,
+                  'sklearn': 'sklearn' in sys.modules}))
+"""
+
+
+def stand_in_models(base):
+    """Regressors/linear models fitted on the dataset, so every compiled
+    model kind is checked even though only classifiers ship in models/"""
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import LinearRegression, LogisticRegression
+    from sklearn.tree import DecisionTreeRegressor
+
+    df = pd.read_csv('data/final_ruleset_data.csv')
+    X = np.column_stack([df[['cpu_score', 'gpu_score', 'ram_gb']].to_numpy(dtype=float), np.ones(len(df))])
+    fps = df['fps'].to_numpy(dtype=float)
+    gaming = df['is_good_for_gaming'].to_numpy()
+    return {
+        'RandomForestRegressor (fps)': RandomForestRegressor(n_estimators=100, max_depth=15, random_state=42).fit(X, fps),
+        'DecisionTreeRegressor (fps)': DecisionTreeRegressor(random_state=42).fit(X, fps),
+        'LinearRegression (fps)': LinearRegression().fit(X, fps),
+        'LogisticRegression (gaming)': LogisticRegression(max_iter=1000).fit(X / 10000, gaming),
+    }
+
+
+def time_per_call(function, X, min_seconds=0.5):
+    """Median seconds per call over repeated batches"""
+    function(X)
+    samples = []
+    deadline = time.perf_counter() + min_seconds
+    while time.perf_counter() < deadline or len(samples) < 5:
+        start = time.perf_counter()
+        function(X)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def cold_start(runtime, path, runs):
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', CHILD, runtime, path], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return {key: statistics.median(r[key] for r in results) for key in ('ms', 'rss_kb')}, results[0]['sklearn']
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    warnings.simplefilter('ignore', UserWarning)
+    base = dataset_features()
+    tmp_dir = tempfile.mkdtemp(prefix='compiled-models-')
+
+    models = {}
+    for path in MODELS:
+        if not os.path.exists(path):
+            continue
+        try:
+            models[os.path.basename(path)] = load_pickle(path)
+        except Exception as e:
+            print(f"{path}: can't be unpickled ({e}), skipped")
+    shipped = set(models)
+    models.update(stand_in_models(base))
+
+    print("Parity (compiled vs. pickle):")
+    failed = False
+    compiled_files = {}
+    for name, estimator in models.items():
+        path = os.path.join(tmp_dir, f"{len(compiled_files)}.npz")
+        save_compiled(*compile_estimator(estimator), path)
+        compiled_files[name] = path
+        compiled = load_compiled(path)
+        X = base / 10000 if name.startswith('LogisticRegression') else base
+        X = parity_inputs(compiled, X)
+        mismatches = check_parity(estimator, compiled, X)
+        failed = failed or mismatches > 0
+        print(f"  {name:30s} {len(X):6d} rows  {'OK' if not mismatches else f'{mismatches} MISMATCHES'}")
+
+    rng = np.random.default_rng(0)
+    print("\nLatency per predict call (median):")
+    print(f"  {'model':30s} {'rows':>5s} {'sklearn':>12s} {'compiled':>12s} {'speedup':>8s}")
+    for name, estimator in models.items():
+        compiled = load_compiled(compiled_files[name])
+        for rows in (1, 3, 1000):
+            X = base[rng.integers(len(base), size=rows)]
+            old = time_per_call(estimator.predict, X)
+            new = time_per_call(compiled.predict, X)
+            print(f"  {name:30s} {rows:5d} {old * 1e6:9.1f} us {new * 1e6:9.1f} us {old / new:7.1f}x")
+
+    print(f"\nCold start: import + load + first predict in a fresh process (median of {runs}):")
+    for name in sorted(shipped):
+        old, old_sklearn = cold_start('sklearn', os.path.join('models', name), runs)
+        new, new_sklearn = cold_start('compiled', compiled_files[name], runs)
+        print(f"  {name:30s} pickle:   {old['ms']:7.1f} ms  +{old['rss_kb'] / 1024:6.1f} MB  sklearn imported: {old_sklearn}")
+        print(f"  {'':30s} compiled: {new['ms']:7.1f} ms  +{new['rss_kb'] / 1024:6.1f} MB  sklearn imported: {new_sklearn}")
+
+    if failed:
+        print("\nFAILED: compiled predictions differ from the pickles")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+# Benchmark: get_recommendation before/after the recommendation index
+#
+# "Before" is the original per-request DataFrame implementation (filter by
+# use case, resolution and budget with .copy() at each step, then sort)
+# on the dataset as read from the CSV.
+# "After" is app.get_recommendation backed by RecommendationIndex.
+# Every query is also checked for identical output.
+#
+# Run from the Backend folder:
+#   python benchmarks/bench_recommendation.py
+
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+import pandas as pd  # noqa: E402
+
+import app  # noqa: E402
+from recommendation_index import USE_CASE_LOGIC  # noqa: E402
+
+
+def legacy_get_recommendation(df, budget, resolution, use_case, fps=None):
+    """Original DataFrame-scan implementation (tests/test_recommendation_index.py
+    checks the same answers over a larger grid)"""
+    if use_case not in USE_CASE_LOGIC:
+        return {"error": f"Invalid use_case. Choose from {list(USE_CASE_LOGIC.keys())}"}
+    logic = USE_CASE_LOGIC[use_case]
+
+    use_case_df = df[df[logic['filter_col']] == 1].copy()
+    if use_case_df.empty:
+        return {"error": f"No PC found for '{use_case}' in dataset."}
+
+    resolution_filtered = use_case_df[use_case_df['resolution'] == resolution].copy()
+    if resolution_filtered.empty:
+        return {
+            "error": f"No {use_case} PC found for {resolution} resolution.",
+            "suggestion": f"Try a different resolution. Available: {', '.join(use_case_df['resolution'].unique())}"
+        }
+
+    filtered_df = resolution_filtered[resolution_filtered['price'] <= budget].copy()
+    if filtered_df.empty:
+        cheapest = resolution_filtered.sort_values('price').iloc[0]
+        cheapest_price = int(cheapest['price'])
+        shortage = cheapest_price - budget
+        return {
+            "error": f"No {use_case} PC found for {resolution} within ${budget} budget.",
+            "suggestion": f"Cheapest {use_case} PC for {resolution} is ${cheapest_price} (shortage: ${shortage})"
+        }
+
+    if use_case == 'Gaming' and fps is not None:
+        filtered_df['fps_diff'] = abs(filtered_df['fps'] - fps)
+        meets_target = filtered_df[filtered_df['fps'] >= fps].copy()
+        if not meets_target.empty:
+            filtered_df = meets_target.sort_values('fps_diff')
+        else:
+            max_fps_available = filtered_df['fps'].max()
+            return {
+                "error": f"Cannot achieve {fps} FPS at {resolution} within ${budget} budget.",
+                "suggestion": f"Maximum achievable: {int(max_fps_available)} FPS at {resolution}. Increase budget or lower FPS target."
+            }
+
+    rank_col = logic['rank_by']
+    if rank_col == 'combined_score':
+        filtered_df['combined_score'] = filtered_df['cpu_score'] + filtered_df['gpu_score']
+
+    if use_case == 'Gaming' and fps is not None:
+        ranked_df = filtered_df.sort_values(by=['fps_diff', rank_col], ascending=[True, False])
+    else:
+        ranked_df = filtered_df.sort_values(by=rank_col, ascending=False)
+
+    best_pc = ranked_df.iloc[0]
+    return {
+        'CPU': best_pc['cpu'],
+        'GPU': best_pc['gpu'],
+        'RAM': f"{best_pc['ram_gb']}GB",
+        'Price': f"${best_pc['price']}",
+        'Resolution': best_pc['resolution'],
+        'CPU_Score': float(best_pc['cpu_score']),
+        'GPU_Score': float(best_pc['gpu_score']),
+        'FPS': int(best_pc['fps']) if use_case == 'Gaming' else None,
+        'ram_gb': int(best_pc['ram_gb'])
+    }
+
+
+def build_queries():
+    """Grid of realistic queries, including error cases"""
+    queries = []
+    for use_case in list(USE_CASE_LOGIC.keys()) + ['Unknown']:
+        for resolution in ['1080P', '1440P', '4K', '8K']:
+            for budget in range(100, 5200, 75):
+                queries.append((budget, resolution, use_case, None))
+                if use_case == 'Gaming':
+                    for fps in [30, 60, 90, 120, 144, 240]:
+                        queries.append((budget, resolution, use_case, fps))
+    return queries
+
+
+def time_per_call(func, queries):
+    start = time.perf_counter()
+    for q in queries:
+        func(*q)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    df = pd.read_csv('data/final_ruleset_data.csv')
+    queries = build_queries()
+
+    # Parity check
+    mismatches = 0
+    for q in queries:
+        if legacy_get_recommendation(df, *q) != app.get_recommendation(*q):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"MISMATCH for {q}")
+    print(f"Parity: {len(queries) - mismatches}/{len(queries)} queries identical")
+
+    before = time_per_call(lambda *q: legacy_get_recommendation(df, *q), queries)
+    after = time_per_call(app.get_recommendation, queries)
+    print(f"Before (DataFrame scan): {before * 1e6:9.1f} us/request")
+    print(f"After  (index lookup):   {after * 1e6:9.1f} us/request")
+    print(f"Speedup: {before / after:.1f}x")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
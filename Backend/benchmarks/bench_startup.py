@@ -0,0 +1,100 @@
+# Startup benchmark: CSV parsing vs. compiled snapshots
+#
+# Starts fresh Python processes that import app.py in lazy mode and then
+# load the datasets (and the indexes built from them) either from the CSVs
+# (ASSET_SNAPSHOT=off) or from a snapshot compiled into a temporary folder.
+# Reports the median load time and how much resident memory the load added:
+#
+# - RssAnon: private memory, paid again by every worker process
+# - RssFile: file-backed pages (memory-mapped snapshot), shared between
+#            workers through the page cache
+#
+# ML models and Firebase are not loaded (they are the same either way).
+# Linux only (reads /proc/self/status).
+#
+# Run from the Backend folder:
+#   python benchmarks/bench_startup.py [runs]
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+from asset_snapshot import compile_csv  # noqa: E402
+
+DATASETS = ['data/final_ruleset_data.csv', 'data/hardware_lookup.csv']
+
+# Runs inside each child process; prints one JSON line
+CHILD = r"""
+import contextlib, io, json, time
+
+def rss():
+    fields = {}
+    with open('/proc/self/status') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            if key in ('RssAnon', 'RssFile'):
+                fields[key] = int(value.split()[0])  # kB
+    return fields
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import app
+    before = rss()
+    start = time.perf_counter()
+    app.assets.get('intelligent_df')
+    app.assets.get('hw_db')
+    datasets = time.perf_counter() - start
+    app.assets.get('recommendation_index')
+    app.assets.get('fps_lookup_index')
+    app.assets.get('hw_resolver')
+    total = time.perf_counter() - start
+    after = rss()
+
+print(json.dumps({
+    'datasets_ms': datasets * 1000,
+    'total_ms': total * 1000,
+    'rss_anon_kb': after['RssAnon'] - before['RssAnon'],
+    'rss_file_kb': after['RssFile'] - before['RssFile'],
+}))
+"""
+
+
+def run(env_overrides, runs):
+    env = dict(os.environ, ASSET_LOADING='lazy', **env_overrides)
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-W', 'ignore', '-c', CHILD], env=env, cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return {key: statistics.median(r[key] for r in results) for key in results[0]}
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+
+    with tempfile.TemporaryDirectory() as snapshot_dir:
+        for csv_path in DATASETS:
+            compile_csv(csv_path, snapshot_dir)
+
+        modes = {
+            'CSV (pandas.read_csv)': run({'ASSET_SNAPSHOT': 'off'}, runs),
+            'Snapshot (memmap)': run({'ASSET_SNAPSHOT': 'auto', 'ASSET_SNAPSHOT_DIR': snapshot_dir}, runs),
+        }
+
+    print(f"Median of {runs} fresh processes each")
+    print(f"{'':24} {'datasets':>10} {'+indexes':>10} {'RssAnon':>10} {'RssFile':>10}")
+    for name, r in modes.items():
+        print(f"{name:24} {r['datasets_ms']:>8.1f}ms {r['total_ms']:>8.1f}ms "
+              f"{r['rss_anon_kb'] / 1024:>7.2f}MiB {r['rss_file_kb'] / 1024:>7.2f}MiB")
+
+
+if __name__ == '__main__':
+    main()
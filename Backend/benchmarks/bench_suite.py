@@ -0,0 +1,496 @@
+# Benchmark suite: load test of every route + micro-benchmarks
+#
+# Load test: a request mix sampled from data/final_ruleset_data.csv
+# (budgets, resolutions, use cases, FPS targets, CPU/GPU pairs) and
+# data/hardware_lookup.csv (part names spelled the way users type them),
+# plus every /api/manual/* route against the fake Firestore catalog.
+# Requests go through Flask's test client in this process (default) or
+# over HTTP to a local gunicorn started for the run (--gunicorn). Reports
+# p50/p95/p99 latency per route, throughput and peak RSS.
+#
+# Micro-benchmarks: get_recommendation, get_score, find_exact_fps_from_csv
+# and calculate_bottleneck on inputs sampled the same way.
+#
+# The mix is fixed by --seed, so runs on different commits send the same
+# requests. Results are written as JSON (benchmarks/results/<commit>.json
+# by default); --compare prints the change against an earlier file.
+#
+# Responses that are cached by the app (recommend, predict, catalog pages)
+# are cached here too - the numbers are for a warm server.
+#
+# Run from the Backend folder:
+#   python benchmarks/bench_suite.py
+#   python benchmarks/bench_suite.py --gunicorn --workers 2 --threads 4 --concurrency 8
+#   python benchmarks/bench_suite.py --compare benchmarks/results/<older>.json
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import random
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, BENCH_DIR)
+os.chdir(BACKEND_DIR)
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+import pandas as pd  # noqa: E402
+
+from fake_firestore import FORM_FACTORS, RAM_TYPES, SOCKETS, sample_catalog  # noqa: E402
+
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+# Share of each route in the load test mix
+ROUTE_MIX = {
+    'POST /api/intelligent/recommend': 20,
+    'GET /api/intelligent/options': 3,
+    'GET /api/intelligent/budget-curve': 3,
+    'POST /api/performance/predict': 20,
+    'POST /api/performance/predict/batch': 2,
+    'GET /api/manual/cpus': 5,
+    'GET /api/manual/motherboards': 5,
+    'GET /api/manual/gpus': 5,
+    'GET /api/manual/ram': 4,
+    'GET /api/manual/coolers': 4,
+    'GET /api/manual/storage': 4,
+    'GET /api/manual/psus': 4,
+    'GET /api/manual/cases': 4,
+    'GET /api/manual/gpus (paged)': 3,
+    'GET /api/manual/wizard': 4,
+    'POST /api/manual/validate': 4,
+    'POST /api/manual/validate/batch': 1,
+    'POST /api/manual/complete': 2,
+}
+
+
+# ----------------------------------------------------------------------
+# Sampled inputs
+# ----------------------------------------------------------------------
+
+def typed_name(rng, name):
+    """A part name the way a user might type it"""
+    return rng.choice([
+        name, name.lower(), name.upper(), name.replace('-', ' '),
+        ('Intel Core ' if name.startswith('i') else 'AMD ' if name.startswith('R') else 'NVIDIA GeForce ') + name,
+    ])
+
+
+class Inputs:
+    """Everything the requests and micro-benchmarks are sampled from"""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.rows = pd.read_csv('data/final_ruleset_data.csv').to_dict('records')
+        self.hardware = pd.read_csv('data/hardware_lookup.csv')['name'].astype(str).tolist()
+        self.catalog = {name: [dict(doc, id=doc_id) for doc_id, doc in sorted(docs.items())]
+                        for name, docs in sample_catalog().items()}
+
+    def recommend(self):
+        rng = self.rng
+        row = rng.choice(self.rows)
+        use_cases = [u for u, flag in [('Gaming', 'is_good_for_gaming'), ('Productivity', 'is_good_for_productivity'),
+                                       ('Design/Render', 'is_good_for_design_render'),
+                                       ('Workstation', 'is_good_for_workstation')] if row[flag] == 1]
+        body = {
+            'budget': int(round(row['price'] * rng.uniform(0.9, 1.4), -1)),
+            'resolution': row['resolution'],
+            'use_case': rng.choice(use_cases or ['Gaming']),
+        }
+        if body['use_case'] == 'Gaming' and rng.random() < 0.6:
+            body['fps'] = rng.choice([30, 60, 90, 120, 144, int(row['fps'])])
+        return body
+
+    def predict(self):
+        rng = self.rng
+        if rng.random() < 0.03:
+            return {'cpu': f"Unknown CPU {rng.randint(1, 999)}", 'gpu': typed_name(rng, rng.choice(self.hardware)), 'ram': 16}
+        row = rng.choice(self.rows)
+        return {'cpu': typed_name(rng, row['cpu']), 'gpu': typed_name(rng, row['gpu']), 'ram': int(row['ram_gb'])}
+
+    def build(self):
+        """A complete build, compatible or not"""
+        return {component: self.rng.choice(self.catalog[collection]) for component, collection in [
+            ('cpu', 'cpus'), ('motherboard', 'motherboards'), ('gpu', 'gpus'), ('ram', 'ram'),
+            ('cooler', 'coolers'), ('storage', 'storage'), ('psu', 'psus'), ('case', 'cases')]}
+
+    def request(self, route):
+        """(method, url, json body) for one request to `route` (a ROUTE_MIX key)"""
+        rng = self.rng
+        brand = rng.choice(list(SOCKETS))
+        socket_name = rng.choice(SOCKETS[brand])
+        ram_type = rng.choice(RAM_TYPES[socket_name])
+        form_factor = rng.choice(FORM_FACTORS)
+        gpu_length = rng.choice(self.catalog['gpus'])['Length_cm']
+        if route == 'POST /api/intelligent/recommend':
+            return 'POST', '/api/intelligent/recommend', self.recommend()
+        if route == 'GET /api/intelligent/options':
+            return 'GET', '/api/intelligent/options', None
+        if route == 'GET /api/intelligent/budget-curve':
+            body = self.recommend()
+            fps = f"&fps={body['fps']}" if 'fps' in body else ''
+            return 'GET', f"/api/intelligent/budget-curve?use_case={body['use_case']}&resolution={body['resolution']}{fps}", None
+        if route == 'POST /api/performance/predict':
+            return 'POST', '/api/performance/predict', self.predict()
+        if route == 'POST /api/performance/predict/batch':
+            return 'POST', '/api/performance/predict/batch', {'builds': [self.predict() for _ in range(10)]}
+        if route == 'GET /api/manual/cpus':
+            return 'GET', f"/api/manual/cpus?brand={brand}", None
+        if route == 'GET /api/manual/motherboards':
+            return 'GET', f"/api/manual/motherboards?socket={socket_name}", None
+        if route == 'GET /api/manual/ram':
+            return 'GET', f"/api/manual/ram?ram_type={ram_type}", None
+        if route == 'GET /api/manual/coolers':
+            return 'GET', f"/api/manual/coolers?socket={socket_name}", None
+        if route == 'GET /api/manual/cases':
+            return 'GET', f"/api/manual/cases?form_factor={form_factor}&gpu_length={gpu_length}", None
+        if route == 'GET /api/manual/gpus (paged)':
+            sort = rng.choice(['Price', '-Price', 'Name', '-Length_cm'])
+            return 'GET', f"/api/manual/gpus?sort={sort}&limit=20&fields=Name,Price,Length_cm", None
+        if route == 'GET /api/manual/wizard':
+            return 'GET', (f"/api/manual/wizard?brand={brand}&socket={socket_name}&ram_type={ram_type}"
+                           f"&form_factor={form_factor}&gpu_length={gpu_length}"), None
+        if route == 'POST /api/manual/validate':
+            return 'POST', '/api/manual/validate', self.build()
+        if route == 'POST /api/manual/validate/batch':
+            return 'POST', '/api/manual/validate/batch', {'builds': [self.build() for _ in range(50)]}
+        if route == 'POST /api/manual/complete':
+            cpu = rng.choice(self.catalog['cpus'])
+            return 'POST', '/api/manual/complete', {'build': {'cpu': cpu['id']}, 'budget': rng.choice([900, 1300, 2000, 3000]),
+                                                     'objective': rng.choice(['performance', 'gaming', 'cheapest'])}
+        method, path = route.split(' ', 1)
+        return method, path, None  # gpus, storage, psus
+
+    def mix(self, count):
+        routes = list(ROUTE_MIX)
+        weights = [ROUTE_MIX[r] for r in routes]
+        return [(route, *self.request(route)) for route in self.rng.choices(routes, weights, k=count)]
+
+
+# ----------------------------------------------------------------------
+# Load test
+# ----------------------------------------------------------------------
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, errors):
+    values = sorted(latencies)
+    return {
+        'count': len(values),
+        'errors': errors,
+        'mean_ms': round(statistics.fmean(values) * 1000, 3) if values else None,
+        'p50_ms': round(percentile(values, 50) * 1000, 3) if values else None,
+        'p95_ms': round(percentile(values, 95) * 1000, 3) if values else None,
+        'p99_ms': round(percentile(values, 99) * 1000, 3) if values else None,
+    }
+
+
+def run_mix(requests, send, concurrency):
+    """Send requests from `concurrency` threads; send(method, url, body)
+    returns the status code. Returns (per-route results, wall seconds)"""
+    latencies = {route: [] for route in ROUTE_MIX}
+    errors = {route: 0 for route in ROUTE_MIX}
+    lock = threading.Lock()
+    position = iter(range(len(requests)))
+
+    def worker():
+        while True:
+            with lock:
+                i = next(position, None)
+            if i is None:
+                return
+            route, method, url, body = requests[i]
+            start = time.perf_counter()
+            try:
+                status = send(method, url, body)
+            except Exception:
+                status = 599
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies[route].append(elapsed)
+                # 404s are valid answers (unknown part, no build in budget)
+                if status >= 500 or status in (400, 405):
+                    errors[route] += 1
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    routes = {route: summarize(latencies[route], errors[route]) for route in ROUTE_MIX if latencies[route]}
+    everything = [v for values in latencies.values() for v in values]
+    routes['ALL'] = summarize(everything, sum(errors.values()))
+    return routes, wall
+
+
+def test_client_sender(app):
+    local = threading.local()
+
+    def send(method, url, body):
+        if not hasattr(local, 'client'):
+            local.client = app.test_client()
+        response = local.client.open(url, method=method, json=body)
+        response.get_data()
+        return response.status_code
+    return send
+
+
+def peak_rss_mb(pid):
+    """VmHWM (peak resident set) of a process, in MB"""
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+    return None
+
+
+def child_pids(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(p) for p in f.read().split()]
+    except OSError:
+        return []
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_gunicorn(args):
+    port = free_port()
+    command = [sys.executable, '-m', 'gunicorn', '--chdir', BACKEND_DIR, '--pythonpath', BENCH_DIR,
+               '--bind', f"127.0.0.1:{port}", '--workers', str(args.workers), '--threads', str(args.threads),
+               '--log-level', 'warning', 'bench_wsgi:app']
+    if args.preload:
+        command.insert(-1, '--preload')
+    process = subprocess.Popen(command, env=dict(os.environ, ASSET_LOADING='eager'))
+    import requests
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/readyz", timeout=1).status_code == 200:
+                return process, f"http://127.0.0.1:{port}"
+        except requests.RequestException:
+            pass
+        if process.poll() is not None:
+            raise RuntimeError("gunicorn exited during startup")
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("gunicorn did not become ready")
+
+
+def http_sender(base_url):
+    import requests
+    local = threading.local()
+
+    def send(method, url, body):
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        response = local.session.request(method, base_url + url, json=body, timeout=30)
+        return response.status_code
+    return send
+
+
+def load_test(args, inputs, app_module):
+    requests_ = inputs.mix(args.warmup + args.requests)
+    warmup, measured = requests_[:args.warmup], requests_[args.warmup:]
+    if args.gunicorn:
+        process, base_url = start_gunicorn(args)
+        try:
+            send = http_sender(base_url)
+            run_mix(warmup, send, args.concurrency)
+            routes, wall = run_mix(measured, send, args.concurrency)
+            pids = [process.pid] + child_pids(process.pid)
+            rss = {str(pid): round(peak_rss_mb(pid), 1) for pid in pids}
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+        memory = {'peak_rss_mb_total': round(sum(rss.values()), 1), 'peak_rss_mb_by_pid': rss}
+    else:
+        send = test_client_sender(app_module.app)
+        run_mix(warmup, send, args.concurrency)
+        routes, wall = run_mix(measured, send, args.concurrency)
+        memory = {'peak_rss_mb_total': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)}
+    return {
+        'mode': 'gunicorn' if args.gunicorn else 'test_client',
+        'workers': args.workers if args.gunicorn else 1,
+        'threads': args.threads if args.gunicorn else None,
+        'concurrency': args.concurrency,
+        'requests': len(measured),
+        'seconds': round(wall, 3),
+        'throughput_rps': round(len(measured) / wall, 1),
+        **memory,
+        'routes': routes,
+    }
+
+
+# ----------------------------------------------------------------------
+# Micro-benchmarks
+# ----------------------------------------------------------------------
+
+def time_calls(function, inputs, rounds):
+    """Mean microseconds per call: best and median over `rounds` passes"""
+    per_call = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for item in inputs:
+            function(*item)
+        per_call.append((time.perf_counter() - start) / len(inputs) * 1e6)
+    return {'calls': len(inputs), 'best_us': round(min(per_call), 3), 'median_us': round(statistics.median(per_call), 3)}
+
+
+def micro_benchmarks(app_module, inputs, count, rounds):
+    rng = random.Random(1)
+    recommend = [inputs.recommend() for _ in range(count)]
+    names = [typed_name(rng, name) for name in rng.choices(inputs.hardware, k=count)]
+    rows = rng.choices(inputs.rows, k=count)
+    fps_inputs = [(row['cpu_score'], row['gpu_score'], row['ram_gb'], row['resolution'].lower())
+                  if rng.random() < 0.7 else (row['cpu_score'] + 1, row['gpu_score'], row['ram_gb'], '1440p')
+                  for row in rows]
+    bottleneck_inputs = [(row['cpu_score'], row['gpu_score'], rng.choice([2, 3, 4])) for row in rows]
+
+    # Every request goes through the pinned asset set, as in a request
+    app_module.assets.pin()
+    try:
+        return {
+            'get_recommendation': time_calls(
+                lambda b: app_module.get_recommendation(b['budget'], b['resolution'], b['use_case'], b.get('fps')),
+                [(b,) for b in recommend], rounds),
+            'get_score': time_calls(app_module.get_score, [(n,) for n in names], rounds),
+            'find_exact_fps_from_csv': time_calls(app_module.find_exact_fps_from_csv, fps_inputs, rounds),
+            'calculate_bottleneck': time_calls(app_module.calculate_bottleneck, bottleneck_inputs, rounds),
+        }
+    finally:
+        app_module.assets.unpin()
+
+
+# ----------------------------------------------------------------------
+# Results
+# ----------------------------------------------------------------------
+
+def git_commit():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+        dirty = bool(subprocess.check_output(['git', 'status', '--porcelain', '--untracked-files=no'], text=True).strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def print_results(results):
+    load = results.get('load')
+    if load:
+        print(f"Load test ({load['mode']}, concurrency {load['concurrency']}): {load['requests']} requests, "
+              f"{load['throughput_rps']} req/s, peak RSS {load['peak_rss_mb_total']} MB")
+        print(f"{'route':<38} {'count':>6} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for route, r in load['routes'].items():
+            print(f"{route:<38} {r['count']:>6} {r['errors']:>4} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f}")
+    micro = results.get('micro')
+    if micro:
+        print(f"\n{'function':<38} {'calls':>6} {'best us':>9} {'median us':>10}")
+        for name, r in micro.items():
+            print(f"{name:<38} {r['calls']:>6} {r['best_us']:>9.2f} {r['median_us']:>10.2f}")
+
+
+def change(old, new):
+    if not old or new is None:
+        return ''
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def compare(old, new):
+    print(f"\nCompared with {old['meta'].get('commit')} ({old['meta'].get('timestamp')}):")
+    settings = ('mode', 'workers', 'threads', 'concurrency')
+    old_load, new_load = old.get('load') or {}, new.get('load') or {}
+    differences = [f"{k}: {old_load.get(k)} -> {new_load.get(k)}" for k in settings
+                   if old_load and new_load and old_load.get(k) != new_load.get(k)]
+    if differences:
+        print(f"Note: the load tests ran with different settings ({', '.join(differences)})")
+    old_routes = (old.get('load') or {}).get('routes', {})
+    new_routes = (new.get('load') or {}).get('routes', {})
+    if old_routes and new_routes:
+        print(f"{'route':<38} {'p50':>9} {'p95':>9} {'p99':>9}")
+        for route, r in new_routes.items():
+            o = old_routes.get(route)
+            if o:
+                print(f"{route:<38} {change(o['p50_ms'], r['p50_ms']):>9} {change(o['p95_ms'], r['p95_ms']):>9} "
+                      f"{change(o['p99_ms'], r['p99_ms']):>9}")
+        print(f"{'throughput':<38} {change(old['load']['throughput_rps'], new['load']['throughput_rps']):>9}")
+    for name, r in (new.get('micro') or {}).items():
+        o = (old.get('micro') or {}).get(name)
+        if o:
+            print(f"{name:<38} {change(o['median_us'], r['median_us']):>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test + micro-benchmarks for the backend")
+    parser.add_argument('--requests', type=int, default=3000, help='measured requests in the load test')
+    parser.add_argument('--warmup', type=int, default=300, help='requests sent before measuring')
+    parser.add_argument('--concurrency', type=int, default=1, help='client threads')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--gunicorn', action='store_true', help='load test a local gunicorn over HTTP')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--preload', action='store_true', help='gunicorn --preload')
+    parser.add_argument('--micro-calls', type=int, default=2000, help='inputs per micro-benchmark')
+    parser.add_argument('--micro-rounds', type=int, default=5)
+    parser.add_argument('--skip-load', action='store_true')
+    parser.add_argument('--skip-micro', action='store_true')
+    parser.add_argument('--out', help='result file (default benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='earlier result file to compare with')
+    args = parser.parse_args()
+
+    import app as app_module
+    # Imported for its side effect: registers the fake Firestore catalog
+    importlib.import_module('bench_wsgi')
+
+    inputs = Inputs(args.seed)
+    commit, dirty = git_commit()
+    results = {
+        'meta': {
+            'commit': commit,
+            'dirty': dirty,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'args': vars(args),
+        },
+    }
+    if not args.skip_load:
+        results['load'] = load_test(args, inputs, app_module)
+    if not args.skip_micro:
+        results['micro'] = micro_benchmarks(app_module, inputs, args.micro_calls, args.micro_rounds)
+
+    print_results(results)
+    out = args.out or os.path.join(RESULTS_DIR, f"{commit or 'results'}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSaved {out}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+# Upgrade analyzer benchmark
+#
+# 1. One POST /api/performance/upgrades vs. what clients did before: one
+#    POST /api/performance/predict per candidate part within the budget.
+#    Run with the prediction table on and off (PREDICTION_TABLE=off)
+# 2. Growth: synthetic hardware tables with more and more CPUs/GPUs.
+#    Reports the load-time price fit and the per-request candidate
+#    selection + ranking + bottleneck work for a fixed budget, so the part
+#    that grows with the table is visible on its own
+#
+# Run from the Backend folder:
+#   python benchmarks/bench_upgrades.py
+#   PREDICTION_TABLE=off python benchmarks/bench_upgrades.py
+
+import os
+import random
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+os.environ.setdefault('RESPONSE_CACHE_SIZE', '0')
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import app  # noqa: E402
+from upgrade_analyzer import UpgradeCandidates, rank_upgrades  # noqa: E402
+
+BUDGETS = [100, 300, 1000, 5000]
+
+
+def median_ms(function, runs=20):
+    function()
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def endpoint_comparison(rng):
+    client = app.app.test_client()
+    df = app.assets.get('intelligent_df')
+    rows = df.sample(20, random_state=0).to_dict('records')
+    print(f"Prediction table: {'on' if app.assets.get('prediction_table') is not None else 'off'}")
+    print(f"  {'budget':>6s} {'candidates':>10s} {'1 request/candidate':>20s} {'/upgrades':>10s}")
+    for budget in BUDGETS:
+        old, new, counts = [], [], []
+        for row in rows:
+            body = {'cpu': row['cpu'], 'gpu': row['gpu'], 'ram': int(row['ram_gb']), 'budget': budget}
+            result = client.post('/api/performance/upgrades', json={**body, 'limit': 50}).get_json()
+            counts.append(result['evaluated'])
+            new.append(median_ms(lambda: client.post('/api/performance/upgrades', json=body), runs=5))
+
+            # The same candidates, one predict request each
+            candidates = app.assets.get('upgrade_candidates')
+            resolver = app.assets.get('hw_resolver')
+            requests = []
+            for kind, part in (('CPU', 'cpu'), ('GPU', 'gpu')):
+                match = resolver.resolve(row[part])
+                names, _, _ = candidates.select(kind, match[0], match[1], budget)
+                requests += [{**body, part: name} for name in names]
+            old.append(median_ms(lambda: [client.post('/api/performance/predict', json=r) for r in requests], runs=3))
+        print(f"  {budget:6d} {statistics.mean(counts):10.0f} {statistics.median(old):17.1f} ms "
+              f"{statistics.median(new):7.2f} ms")
+
+
+def synthetic_dataset(n_parts, rng):
+    """n_parts CPUs and n_parts GPUs with additive prices, ~20 builds each"""
+    cpu_scores = rng.integers(5000, 60000, n_parts)
+    gpu_scores = rng.integers(5000, 60000, n_parts)
+    n_builds = 20 * n_parts
+    cpus = rng.integers(n_parts, size=n_builds)
+    gpus = rng.integers(n_parts, size=n_builds)
+    rams = rng.choice([16, 32], size=n_builds)
+    price = 300 + cpu_scores[cpus] / 60 + gpu_scores[gpus] / 30 + rams * 3 + rng.normal(0, 30, n_builds)
+    df = pd.DataFrame({
+        'cpu': [f"cpu{i}" for i in cpus], 'gpu': [f"gpu{i}" for i in gpus], 'ram_gb': rams,
+        'price': price.round(),
+    })
+    hw_db = {f"cpu{i}": int(s) for i, s in enumerate(cpu_scores)}
+    hw_db.update({f"gpu{i}": int(s) for i, s in enumerate(gpu_scores)})
+    return df, hw_db
+
+
+def growth(rng):
+    print("\nGrowth (synthetic hardware tables, budget $300):")
+    print(f"  {'parts':>6s} {'price fit':>10s} {'evaluated':>10s} {'per request':>12s}")
+    for n_parts in (150, 500, 2000):
+        df, hw_db = synthetic_dataset(n_parts, rng)
+        start = time.perf_counter()
+        candidates = UpgradeCandidates(df, hw_db)
+        fit_ms = (time.perf_counter() - start) * 1000
+
+        keys = candidates.kinds['GPU'].keys
+        current = keys[len(keys) // 4]
+
+        def request():
+            names, scores, costs = candidates.select('GPU', current, hw_db[current], 300)
+            c_scores = np.full(len(scores), 20000)
+            for res in app.PREDICTION_RESOLUTIONS:
+                app.calculate_bottleneck_array(c_scores, scores, res['code'])
+            rank_upgrades(scores / 100.0, costs)
+            return len(names)
+
+        evaluated = request()
+        print(f"  {2 * n_parts:6d} {fit_ms:7.1f} ms {evaluated:10d} {median_ms(request) * 1000:9.1f} us")
+
+
+def main():
+    rng = np.random.default_rng(0)
+    random.seed(0)
+    app.assets.pin()
+    try:
+        endpoint_comparison(rng)
+        growth(rng)
+    finally:
+        app.assets.unpin()
+
+
+if __name__ == '__main__':
+    main()
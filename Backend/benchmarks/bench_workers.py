@@ -0,0 +1,137 @@
+# Multi-process serving benchmark: memory and throughput from 1 to N workers
+#
+# Starts the production setup (gunicorn.conf.py + wsgi.create_app, with
+# the fake Firestore catalog from bench_wsgi.py) with 1, 2, ... N workers
+# and sends the bench_suite.py request mix to each. Reports requests/sec
+# and, per worker after the run:
+#
+#   RSS  resident memory, counting pages shared with other processes
+#   PSS  shared pages split between the processes sharing them
+#   USS  pages only this worker has (what one more worker really costs)
+#
+# Summed PSS over the master and the workers is what the whole server
+# uses. Run with --no-preload too to see the workers load their own
+# copies instead.
+#
+# Throughput can only scale up to the number of CPU cores, and the load
+# generator runs on the same machine.
+#
+# Run from the Backend folder:
+#   python benchmarks/bench_workers.py --max-workers 4
+#   python benchmarks/bench_workers.py --max-workers 4 --no-preload
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_suite import BACKEND_DIR, Inputs, child_pids, free_port, http_sender, run_mix  # noqa: E402
+
+
+def memory_mb(pid):
+    """{'rss', 'pss', 'uss'} of a process in MB (from /proc/<pid>/smaps_rollup)"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    return {
+        'rss': round(fields['Rss'], 1),
+        'pss': round(fields['Pss'], 1),
+        'uss': round(fields['Private_Clean'] + fields['Private_Dirty'], 1),
+    }
+
+
+def start_server(workers, threads, preload):
+    port = free_port()
+    env = dict(os.environ, ASSET_LOADING='eager', LOG_LEVEL='WARNING', HOST='127.0.0.1', PORT=str(port),
+               WEB_CONCURRENCY=str(workers), GUNICORN_THREADS=str(threads),
+               GUNICORN_PRELOAD='on' if preload else 'off')
+    command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--pythonpath', BENCH_DIR,
+               '--log-level', 'warning', 'bench_wsgi:create_app()']
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+    import requests
+    deadline = time.time() + 300
+    while time.time() < deadline:
+        # Ready when every worker answers (each has loaded its own assets)
+        if len(child_pids(process.pid)) == workers:
+            try:
+                if requests.get(f"http://127.0.0.1:{port}/readyz", timeout=1).status_code == 200:
+                    return process, f"http://127.0.0.1:{port}"
+            except requests.RequestException:
+                pass
+        if process.poll() is not None:
+            raise RuntimeError("gunicorn exited during startup")
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("gunicorn did not become ready")
+
+
+def run(workers, args, inputs):
+    process, base_url = start_server(workers, args.threads, args.preload)
+    try:
+        send = http_sender(base_url)
+        requests_ = inputs.mix(args.warmup + args.requests)
+        # Enough warmup for every worker to load what it loads lazily
+        run_mix(requests_[:args.warmup], send, args.concurrency)
+        routes, wall = run_mix(requests_[args.warmup:], send, args.concurrency)
+        master = memory_mb(process.pid)
+        worker_memory = [memory_mb(pid) for pid in child_pids(process.pid)]
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return {
+        'workers': workers,
+        'throughput_rps': round(args.requests / wall, 1),
+        'p50_ms': routes['ALL']['p50_ms'],
+        'errors': routes['ALL']['errors'],
+        'master_mb': master,
+        'worker_mb': worker_memory,
+        'total_pss_mb': round(master['pss'] + sum(m['pss'] for m in worker_memory), 1),
+    }
+
+
+def mean(values):
+    return sum(values) / len(values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RSS per worker and requests/sec from 1 to N gunicorn workers")
+    parser.add_argument('--max-workers', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads')
+    parser.add_argument('--requests', type=int, default=2000, help='measured requests per run')
+    parser.add_argument('--warmup', type=int, default=400)
+    parser.add_argument('--no-preload', dest='preload', action='store_false', help='GUNICORN_PRELOAD=off')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', help='also write the results as JSON')
+    args = parser.parse_args()
+
+    print(f"preload {'on' if args.preload else 'off'}, {args.threads} threads/worker, "
+          f"{args.concurrency} client threads, {os.cpu_count()} CPU cores")
+    print(f"{'workers':>7s} {'req/s':>7s} {'p50 ms':>7s} {'worker RSS':>10s} {'PSS':>6s} {'USS':>6s} "
+          f"{'master RSS':>10s} {'total PSS':>9s}   (MB, mean per worker)")
+    results = []
+    for workers in range(1, args.max_workers + 1):
+        result = run(workers, args, Inputs(args.seed))
+        results.append(result)
+        per_worker = result['worker_mb']
+        print(f"{workers:7d} {result['throughput_rps']:7.1f} {result['p50_ms']:7.2f} "
+              f"{mean([m['rss'] for m in per_worker]):10.1f} {mean([m['pss'] for m in per_worker]):6.1f} "
+              f"{mean([m['uss'] for m in per_worker]):6.1f} {result['master_mb']['rss']:10.1f} "
+              f"{result['total_pss_mb']:9.1f}" + (f"  ({result['errors']} errors)" if result['errors'] else ''))
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'args': vars(args), 'cpu_count': os.cpu_count(), 'results': results}, f, indent=2)
+        print(f"\nSaved {args.out}")
+
+
+if __name__ == '__main__':
+    main()
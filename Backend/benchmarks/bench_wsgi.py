@@ -0,0 +1,40 @@
+# WSGI entry point for benchmarks: the real app with the Manual Build
+# catalog served from the fake Firestore client.
+#
+# Used by bench_suite.py --gunicorn:
+#   gunicorn --chdir <Backend> --pythonpath benchmarks bench_wsgi:app
+# and, through the production factory and settings, by bench_workers.py:
+#   gunicorn -c gunicorn.conf.py --pythonpath benchmarks "bench_wsgi:create_app()"
+#
+# BENCH_FIRESTORE_LATENCY (seconds per query, default 0) and
+# BENCH_CATALOG_SCALE (default 1) shape the fake catalog.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+import app as backend  # noqa: E402
+from catalog_cache import CatalogCache  # noqa: E402
+from component_store import FirestoreStore  # noqa: E402
+from fake_firestore import FakeFirestore, sample_catalog  # noqa: E402
+
+FIRESTORE_LATENCY = float(os.environ.get('BENCH_FIRESTORE_LATENCY', 0))
+CATALOG_SCALE = int(os.environ.get('BENCH_CATALOG_SCALE', 1))
+
+
+def fake_catalog():
+    return CatalogCache(FirestoreStore(FakeFirestore(sample_catalog(scale=CATALOG_SCALE), latency=FIRESTORE_LATENCY)))
+
+
+# Per process, like the real catalog: each gunicorn worker builds its own
+backend.assets.register('catalog', fake_catalog, per_process=True)
+
+app = backend.app
+
+
+def create_app():
+    """wsgi.create_app() with the fake catalog"""
+    import wsgi
+    return wsgi.create_app()
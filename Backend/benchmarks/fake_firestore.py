@@ -0,0 +1,149 @@
+# Local fake Firestore client for benchmarks and offline checks
+# Implements the small part of the google-cloud-firestore API that the
+# backend uses: collection(), where(), stream() and document().get()/set().
+# Documents are streamed in document-id order, like Firestore does.
+#
+# Usage:
+#   db = FakeFirestore(sample_catalog(), latency=0.02)
+#   app.db = db
+
+import copy
+import random
+import threading
+import time
+
+_OPERATORS = {
+    '==': lambda field, value: field == value,
+    '!=': lambda field, value: field != value,
+    '<': lambda field, value: field is not None and field < value,
+    '<=': lambda field, value: field is not None and field <= value,
+    '>': lambda field, value: field is not None and field > value,
+    '>=': lambda field, value: field is not None and field >= value,
+    'in': lambda field, value: field in value,
+    'array_contains': lambda field, value: isinstance(field, list) and value in field,
+}
+
+
+class FakeDocumentSnapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+
+class FakeDocumentReference:
+    def __init__(self, client, collection, doc_id):
+        self._client = client
+        self._collection = collection
+        self.id = doc_id
+
+    def get(self):
+        self._client._wait()
+        return FakeDocumentSnapshot(self.id, self._client._data.get(self._collection, {}).get(self.id))
+
+    def set(self, data):
+        with self._client._lock:
+            self._client._data.setdefault(self._collection, {})[self.id] = copy.deepcopy(data)
+
+
+class FakeQuery:
+    def __init__(self, client, collection, filters=()):
+        self._client = client
+        self._collection = collection
+        self._filters = list(filters)
+
+    def where(self, field_path=None, op_string=None, value=None):
+        return FakeQuery(self._client, self._collection, self._filters + [(field_path, op_string, value)])
+
+    def stream(self):
+        self._client._wait()
+        docs = self._client._data.get(self._collection, {})
+        for doc_id in sorted(docs):
+            data = docs[doc_id]
+            if all(_OPERATORS[op](data.get(field), value) for field, op, value in self._filters):
+                yield FakeDocumentSnapshot(doc_id, data)
+
+
+class FakeCollection(FakeQuery):
+    def __init__(self, client, name):
+        super().__init__(client, name)
+
+    def document(self, doc_id):
+        return FakeDocumentReference(self._client, self._collection, doc_id)
+
+
+class FakeFirestore:
+    """In-memory Firestore stand-in with optional per-call latency"""
+
+    def __init__(self, data=None, latency=0.0):
+        self._data = copy.deepcopy(data) if data else {}
+        self._lock = threading.Lock()
+        self.latency = latency
+        self.calls = 0
+
+    def _wait(self):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+
+# ----------------------------------------------------------------------------
+# Sample catalog with the fields the Manual Build routes and UI use
+# ----------------------------------------------------------------------------
+
+SOCKETS = {'Intel': ['LGA1200', 'LGA1700', 'LGA1851'], 'AMD': ['AM4', 'AM5']}
+RAM_TYPES = {'LGA1200': ['DDR4'], 'LGA1700': ['DDR4', 'DDR5'], 'LGA1851': ['DDR5'],
+             'AM4': ['DDR4'], 'AM5': ['DDR5']}
+FORM_FACTORS = ['ATX', 'Micro-ATX', 'Mini-ITX']
+
+
+def _price(rng, low, high):
+    return f"${rng.uniform(low, high):.2f}"
+
+
+def sample_catalog(seed=42, scale=1):
+    """Deterministic catalog {collection: {doc_id: data}}; `scale` multiplies the size"""
+    rng = random.Random(seed)
+    catalog = {name: {} for name in ['cpus', 'motherboards', 'gpus', 'ram', 'coolers', 'storage', 'psus', 'cases']}
+
+    def add(collection, data):
+        doc_id = f"{collection}_{len(catalog[collection]):05d}"
+        catalog[collection][doc_id] = data
+
+    for _ in range(40 * scale):
+        brand = rng.choice(['Intel', 'AMD'])
+        socket = rng.choice(SOCKETS[brand])
+        add('cpus', {'Name': f"{brand} CPU {rng.randint(1000, 9999)}", 'Socket': socket,
+                     'TDP': rng.choice([65, 105, 125, 170]), 'Price': _price(rng, 90, 650)})
+    for _ in range(60 * scale):
+        socket = rng.choice(SOCKETS['Intel'] + SOCKETS['AMD'])
+        add('motherboards', {'Name': f"Board {rng.randint(100, 999)}", 'Socket': socket,
+                             'RAM_Type': rng.choice(RAM_TYPES[socket]),
+                             'Form_Factor': rng.choice(FORM_FACTORS), 'Price': _price(rng, 80, 500)})
+    for _ in range(50 * scale):
+        add('gpus', {'Name': f"GPU {rng.randint(1000, 9999)}", 'TDP': rng.choice([115, 170, 220, 285, 320, 450]),
+                     'Length_cm': round(rng.uniform(17, 34), 1), 'Price': _price(rng, 180, 1800)})
+    for _ in range(40 * scale):
+        add('ram', {'Name': f"RAM Kit {rng.randint(100, 999)}", 'RAM_Type': rng.choice(['DDR4', 'DDR5']),
+                    'Capacity': rng.choice(['16GB', '32GB', '64GB']), 'Price': _price(rng, 40, 300)})
+    for _ in range(30 * scale):
+        sockets = rng.sample(SOCKETS['Intel'] + SOCKETS['AMD'], rng.randint(1, 5))
+        add('coolers', {'Name': f"Cooler {rng.randint(100, 999)}", 'Supported_Sockets': sockets,
+                        'Type': rng.choice(['Air', 'AIO']), 'Price': _price(rng, 25, 250)})
+    for _ in range(30 * scale):
+        add('storage', {'Name': f"Drive {rng.randint(100, 999)}", 'Type': rng.choice(['NVMe SSD', 'SATA SSD', 'HDD']),
+                        'Capacity': rng.choice(['500GB', '1TB', '2TB', '4TB']), 'Price': _price(rng, 40, 350)})
+    for _ in range(30 * scale):
+        add('psus', {'Name': f"PSU {rng.randint(100, 999)}", 'Wattage': rng.choice([450, 550, 650, 750, 850, 1000, 1200]),
+                     'Efficiency': rng.choice(['80+ Bronze', '80+ Gold', '80+ Platinum']), 'Price': _price(rng, 45, 300)})
+    for _ in range(40 * scale):
+        add('cases', {'Name': f"Case {rng.randint(100, 999)}", 'Form_Factor': rng.choice(FORM_FACTORS),
+                      'Max_GPU_Length_cm': round(rng.uniform(20, 42), 1), 'Price': _price(rng, 50, 300)})
+    return catalog
@@ -0,0 +1,279 @@
+# Build Completion Solver for Manual Build Mode
+# Given some already chosen parts, a budget and an objective, picks the
+# remaining parts so that the whole build is compatible:
+#
+# - motherboard Socket == CPU Socket
+# - RAM RAM_Type == motherboard RAM_Type
+# - CPU Socket in cooler Supported_Sockets
+# - case Form_Factor fits the motherboard (ATX case holds everything, ...)
+# - case Max_GPU_Length_cm >= GPU Length_cm
+# - PSU Wattage >= CPU TDP + GPU TDP + 150W
+#
+# Only CPU and GPU have performance scores (hardware_lookup.csv), so the
+# search runs over CPU x GPU pairs. Every other part is filled with the
+# cheapest compatible option, read from per-component indexes: cheapest
+# RAM per type, cooler per socket, PSU per wattage, case per form factor and
+# GPU length, and motherboards reduced to the cheapest one per (socket, RAM
+# type, form factor). The indexes only depend on the candidate documents, so
+# app.py builds them once per catalog version and hands them to each solver. CPUs and GPUs are visited best-bound
+# first and the search stops as soon as no remaining pair can beat the
+# best build found (branch and bound), or when the time limit runs out.
+
+import bisect
+import time
+
+COMPONENTS = ['cpu', 'motherboard', 'gpu', 'ram', 'cooler', 'storage', 'psu', 'case']
+
+# Watts added to CPU + GPU TDP for the rest of the system
+PSU_HEADROOM_W = 150
+
+# Objective -> (CPU score weight, GPU score weight); 'cheapest' ignores scores
+OBJECTIVES = {
+    'performance': (1.0, 1.0),
+    'gaming': (0.3, 0.7),
+    'productivity': (1.0, 0.0),
+    'cheapest': (0.0, 0.0),
+}
+
+DEFAULT_TIME_LIMIT = 0.5  # seconds
+
+
+def compatible_case_form_factors(form_factor):
+    """Case form factors that can hold a motherboard of this form factor"""
+    compatible_form_factors = ['ATX']
+    if form_factor == "Micro-ATX":
+        compatible_form_factors.append('Micro-ATX')
+    elif form_factor == "Mini-ITX":
+        compatible_form_factors.extend(['Micro-ATX', 'Mini-ITX'])
+    return compatible_form_factors
+
+
+def parse_price(value):
+    """"$1,299.99" -> 1299.99 (missing or unreadable prices count as 0)"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    try:
+        return float(str(value).replace('$', '').replace(',', '').strip())
+    except ValueError:
+        return 0.0
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0
+
+
+class _CheapestAtLeast:
+    """Cheapest document whose `field` is >= a value (bisect + suffix minimum)"""
+
+    def __init__(self, docs, field):
+        docs = sorted(docs, key=lambda d: (_number(d.get(field, 0)), parse_price(d.get('Price')), str(d.get('id'))))
+        self.values = [_number(d.get(field, 0)) for d in docs]
+        self.best = [None] * len(docs)
+        best = None
+        for i in range(len(docs) - 1, -1, -1):
+            if best is None or parse_price(docs[i].get('Price')) <= parse_price(best.get('Price')):
+                best = docs[i]
+            self.best[i] = best
+
+    def find(self, minimum):
+        i = bisect.bisect_left(self.values, minimum)
+        return self.best[i] if i < len(self.best) else None
+
+
+def _cheapest_by(docs, key):
+    """{key value: cheapest document}; list-valued keys count for each entry"""
+    cheapest = {}
+    for doc in docs:
+        values = key(doc)
+        for value in values if isinstance(values, list) else [values]:
+            try:
+                current = cheapest.get(value)
+            except TypeError:
+                continue
+            if current is None or parse_price(doc.get('Price')) < parse_price(current.get('Price')):
+                cheapest[value] = doc
+    return cheapest
+
+
+def component_index(component, docs, score_part):
+    """What BuildSolver looks one component up in, built from its candidate docs.
+    Only depends on the docs (and scores), so callers can build it once per
+    catalog version and pass it back in through BuildSolver(indexes=...)"""
+    if component == 'ram':
+        return _cheapest_by(docs, lambda d: d.get('RAM_Type'))
+    if component == 'cooler':
+        return _cheapest_by(docs, lambda d: d.get('Supported_Sockets') or [])
+    if component == 'storage':
+        return min(docs, key=lambda d: parse_price(d.get('Price')), default=None)
+    if component == 'psu':
+        return _CheapestAtLeast(docs, 'Wattage')
+    if component == 'case':
+        cases_by_form_factor = {}
+        for case in docs:
+            cases_by_form_factor.setdefault(case.get('Form_Factor'), []).append(case)
+        return {ff: _CheapestAtLeast(cases, 'Max_GPU_Length_cm') for ff, cases in cases_by_form_factor.items()}
+    if component == 'motherboard':
+        # Motherboards that differ only in price: keep the cheapest
+        boards = _cheapest_by(docs, lambda d: [(d.get('Socket'), d.get('RAM_Type'), d.get('Form_Factor'))])
+        boards_by_socket = {}
+        for (socket, _, _), board in sorted(boards.items(), key=lambda item: str(item[1].get('id'))):
+            boards_by_socket.setdefault(socket, []).append(board)
+        return boards_by_socket
+    if component in ('cpu', 'gpu'):
+        return [(doc, score_part(doc.get('Name'))) for doc in docs]
+    raise ValueError(f"Unknown component: {component}")
+
+
+class BuildSolver:
+    """Compatibility indexes over candidate parts and the pair search"""
+
+    def __init__(self, candidates, score_part, indexes=None, platforms=None):
+        """candidates: {component: [docs]} (one doc for parts already chosen);
+        score_part(name) -> hardware score (0 if unknown).
+        indexes: prebuilt {component: component_index(...)} to reuse; the
+        missing ones are built from candidates. platforms: a dict to memoize
+        platform() in, shared between solvers with the same motherboard, RAM
+        and case indexes"""
+        self.candidates = candidates
+        indexes = indexes or {}
+        index = {
+            component: indexes[component] if component in indexes
+            else component_index(component, candidates[component], score_part)
+            for component in COMPONENTS
+        }
+        self.ram_by_type = index['ram']
+        self.cooler_by_socket = index['cooler']
+        self.storage = index['storage']
+        self.psus = index['psu']
+        self.cases_by_form_factor = index['case']
+        self.boards_by_socket = index['motherboard']
+        self.cpus = index['cpu']
+        self.gpus = index['gpu']
+        self._platforms = {} if platforms is None else platforms
+
+    # ------------------------------------------------------------------
+    # Cheapest compatible parts
+    # ------------------------------------------------------------------
+
+    def case_for(self, form_factor, gpu_length):
+        best = None
+        for ff in compatible_case_form_factors(form_factor):
+            index = self.cases_by_form_factor.get(ff)
+            case = index.find(gpu_length) if index else None
+            if case is not None and (best is None or parse_price(case.get('Price')) < parse_price(best.get('Price'))):
+                best = case
+        return best
+
+    def platform(self, socket, gpu_length):
+        """Cheapest (motherboard, ram, case, price) for a socket and GPU length"""
+        key = (socket, gpu_length)
+        if key not in self._platforms:
+            best = None
+            for board in self.boards_by_socket.get(socket, []):
+                ram = self.ram_by_type.get(board.get('RAM_Type'))
+                case = self.case_for(board.get('Form_Factor'), gpu_length)
+                if ram is None or case is None:
+                    continue
+                price = parse_price(board.get('Price')) + parse_price(ram.get('Price')) + parse_price(case.get('Price'))
+                if best is None or price < best[3]:
+                    best = (board, ram, case, price)
+            self._platforms[key] = best
+        return self._platforms[key]
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def solve(self, budget, objective='performance', time_limit=DEFAULT_TIME_LIMIT):
+        """Best compatible build within budget.
+        Returns (build dict or None, search stats)"""
+        cpu_weight, gpu_weight = OBJECTIVES[objective]
+        start = time.perf_counter()
+        deadline = start + time_limit
+        stats = {'pairs_evaluated': 0, 'complete': True}
+
+        if self.storage is None:
+            return None, self._finish(stats, start)
+        storage_price = parse_price(self.storage.get('Price'))
+        cheapest_psu = self.psus.find(0)
+        if cheapest_psu is None:
+            return None, self._finish(stats, start)
+
+        gpus = sorted(
+            self.gpus, key=lambda g: (-gpu_weight * g[1], parse_price(g[0].get('Price')), str(g[0].get('id')))
+        )
+        if not gpus:
+            return None, self._finish(stats, start)
+        best_gpu_score = gpu_weight * gpus[0][1]
+        cheapest_gpu = min(parse_price(g[0].get('Price')) for g in gpus)
+
+        # Lower bound on everything except CPU and GPU, per socket
+        rest_bound = {}
+        for cpu, _ in self.cpus:
+            socket = cpu.get('Socket')
+            if socket not in rest_bound:
+                platform = self.platform(socket, 0)
+                cooler = self.cooler_by_socket.get(socket)
+                rest_bound[socket] = None if platform is None or cooler is None else (
+                    platform[3] + parse_price(cooler.get('Price')) + storage_price
+                    + parse_price(cheapest_psu.get('Price'))
+                )
+
+        cpus = []
+        for cpu, score in self.cpus:
+            rest = rest_bound[cpu.get('Socket')]
+            if rest is None:
+                continue  # no motherboard/RAM/case/cooler for this socket
+            lower_cost = parse_price(cpu.get('Price')) + cheapest_gpu + rest
+            if lower_cost <= budget:
+                cpus.append((cpu, score, rest, cpu_weight * score + best_gpu_score, lower_cost))
+        # Best possible outcome first: highest score bound, then lowest cost bound
+        cpus.sort(key=lambda c: (-c[3], c[4], str(c[0].get('id'))))
+
+        best = None
+        best_key = None
+        for cpu, cpu_score, rest, score_bound, lower_cost in cpus:
+            if best_key is not None and (score_bound, -lower_cost) < best_key:
+                break  # no later CPU can do better
+            socket = cpu.get('Socket')
+            cpu_price = parse_price(cpu.get('Price'))
+            cooler = self.cooler_by_socket[socket]
+            for gpu, gpu_score in gpus:
+                gpu_price = parse_price(gpu.get('Price'))
+                score = cpu_weight * cpu_score + gpu_weight * gpu_score
+                if best_key is not None and (score, -(cpu_price + gpu_price + rest)) < best_key:
+                    break  # GPUs are in bound order, none after this one can do better
+                if cpu_price + gpu_price + rest > budget:
+                    continue
+
+                stats['pairs_evaluated'] += 1
+                if stats['pairs_evaluated'] % 256 == 0 and time.perf_counter() > deadline:
+                    stats['complete'] = False
+                    return best, self._finish(stats, start)
+
+                platform = self.platform(socket, _number(gpu.get('Length_cm', 0)))
+                psu = self.psus.find(_number(cpu.get('TDP', 0)) + _number(gpu.get('TDP', 0)) + PSU_HEADROOM_W)
+                if platform is None or psu is None:
+                    continue
+                board, ram, case, platform_price = platform
+                total = (cpu_price + gpu_price + platform_price + parse_price(cooler.get('Price'))
+                         + storage_price + parse_price(psu.get('Price')))
+                if total > budget:
+                    continue
+                key = (score, -total)
+                if best_key is None or key > best_key:
+                    best_key = key
+                    best = {
+                        'build': {
+                            'cpu': cpu, 'motherboard': board, 'gpu': gpu, 'ram': ram,
+                            'cooler': cooler, 'storage': self.storage, 'psu': psu, 'case': case,
+                        },
+                        'total_price': round(total, 2),
+                        'score': score,
+                    }
+        return best, self._finish(stats, start)
+
+    @staticmethod
+    def _finish(stats, start):
+        stats['seconds'] = round(time.perf_counter() - start, 4)
+        return stats
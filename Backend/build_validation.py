@@ -0,0 +1,152 @@
+# Bulk Build Validation for Manual Build Mode
+# Checks many complete builds at once. Each chunk of builds is turned into
+# columns (one array per field: CPU socket, PSU wattage, GPU length, ...)
+# and every rule runs over whole columns instead of build by build.
+#
+# Rules (code - severity):
+#   missing_component  - error    a part is not selected (no other checks then)
+#   socket             - error    CPU and motherboard sockets differ
+#   ram_type           - error    RAM and motherboard RAM types differ
+#   cooler_socket      - error    cooler does not list the CPU socket
+#   form_factor        - error    case cannot hold the motherboard
+#   gpu_length         - error    GPU longer than the case allows
+#   psu_wattage        - warning  PSU below CPU TDP + GPU TDP + 150W
+# A rule is skipped for a build when the fields it compares are missing.
+
+import numpy as np
+
+from build_solver import COMPONENTS, PSU_HEADROOM_W, compatible_case_form_factors
+
+# Builds validated together (also the streaming granularity)
+DEFAULT_CHUNK_SIZE = 1000
+
+FORM_FACTORS = ['ATX', 'Micro-ATX', 'Mini-ITX']
+# (motherboard form factor, case form factor) pairs that fit
+_FITTING_CASES = {
+    (board, case) for board in FORM_FACTORS for case in compatible_case_form_factors(board)
+}
+
+
+def _field(parts, field):
+    """Column of raw field values (None when the part or field is missing)"""
+    return [part.get(field) if isinstance(part, dict) else None for part in parts]
+
+
+def _numbers(values):
+    """Float column; missing values are 0 (as in /api/manual/validate), other
+    non-numbers NaN"""
+    return np.array([
+        0.0 if v is None else float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else np.nan
+        for v in values
+    ])
+
+
+def _raw(value):
+    """Field value as the single-build route prints it"""
+    return 0 if value is None else value
+
+
+def _strings(values):
+    return np.array([v if isinstance(v, str) else None for v in values], dtype=object)
+
+
+def validate_chunk(builds):
+    """[{"isValid", "errors": [{code, message}], "warnings": [...]}] for each build"""
+    n = len(builds)
+    errors = [[] for _ in range(n)]
+    warnings = [[] for _ in range(n)]
+    parts = {key: [b.get(key) if isinstance(b, dict) else None for b in builds] for key in COMPONENTS}
+
+    # Missing parts: report them and skip the compatibility rules
+    complete = np.ones(n, dtype=bool)
+    for key in COMPONENTS:
+        missing = np.array([not part for part in parts[key]], dtype=bool)
+        for i in np.nonzero(missing)[0]:
+            errors[i].append({'code': 'missing_component', 'message': f"Missing component: {key}"})
+        complete &= ~missing
+    for key in COMPONENTS:
+        # Selected but not a document
+        for i in np.nonzero(complete)[0]:
+            if not isinstance(parts[key][i], dict):
+                errors[i].append({'code': 'invalid_component', 'message': f"Invalid component: {key}"})
+                complete[i] = False
+
+    def report(mask, target, code, message):
+        for i in np.nonzero(mask & complete)[0]:
+            target[i].append({'code': code, 'message': message(i)})
+
+    cpu_socket = _strings(_field(parts['cpu'], 'Socket'))
+    board_socket = _strings(_field(parts['motherboard'], 'Socket'))
+    report((cpu_socket != None) & (board_socket != None) & (cpu_socket != board_socket), errors,  # noqa: E711
+           'socket', lambda i: f"CPU socket ({cpu_socket[i]}) does not match the Motherboard socket ({board_socket[i]}).")
+
+    ram_type = _strings(_field(parts['ram'], 'RAM_Type'))
+    board_ram_type = _strings(_field(parts['motherboard'], 'RAM_Type'))
+    report((ram_type != None) & (board_ram_type != None) & (ram_type != board_ram_type), errors,  # noqa: E711
+           'ram_type', lambda i: f"RAM type ({ram_type[i]}) does not match the Motherboard ({board_ram_type[i]}).")
+
+    cooler_sockets = _field(parts['cooler'], 'Supported_Sockets')
+    cooler_mismatch = np.array([
+        isinstance(sockets, list) and socket is not None and socket not in sockets
+        for socket, sockets in zip(cpu_socket, cooler_sockets)
+    ], dtype=bool)
+    report(cooler_mismatch, errors,
+           'cooler_socket', lambda i: f"Cooler does not support the CPU socket ({cpu_socket[i]}).")
+
+    board_form_factor = _strings(_field(parts['motherboard'], 'Form_Factor'))
+    case_form_factor = _strings(_field(parts['case'], 'Form_Factor'))
+    form_factor_mismatch = np.array([
+        board in FORM_FACTORS and case is not None and (board, case) not in _FITTING_CASES
+        for board, case in zip(board_form_factor, case_form_factor)
+    ], dtype=bool)
+    report(form_factor_mismatch, errors,
+           'form_factor', lambda i: f"{board_form_factor[i]} Motherboard does not fit in a {case_form_factor[i]} Case.")
+
+    # Same rules and messages as /api/manual/validate
+    gpu_length_raw = _field(parts['gpu'], 'Length_cm')
+    case_length_raw = _field(parts['case'], 'Max_GPU_Length_cm')
+    gpu_length = _numbers(gpu_length_raw)
+    case_length = _numbers(case_length_raw)
+    report(gpu_length > case_length, errors, 'gpu_length', lambda i: (
+        f"GPU ({_raw(gpu_length_raw[i])}cm) is too long for the Case ({_raw(case_length_raw[i])}cm)."))
+
+    cpu_tdp_raw = _field(parts['cpu'], 'TDP')
+    gpu_tdp_raw = _field(parts['gpu'], 'TDP')
+    psu_wattage_raw = _field(parts['psu'], 'Wattage')
+    cpu_tdp = _numbers(cpu_tdp_raw)
+    gpu_tdp = _numbers(gpu_tdp_raw)
+    psu_wattage = _numbers(psu_wattage_raw)
+    report(psu_wattage < cpu_tdp + gpu_tdp + PSU_HEADROOM_W, warnings, 'psu_wattage', lambda i: (
+        f"PSU Warning: Selected PSU ({_raw(psu_wattage_raw[i])}W) might be underpowered. "
+        f"{_raw(cpu_tdp_raw[i]) + _raw(gpu_tdp_raw[i]) + PSU_HEADROOM_W}W recommended."))
+
+    # Numbers that could not be compared
+    unreadable = np.isnan(gpu_length) | np.isnan(case_length) | np.isnan(cpu_tdp) | np.isnan(gpu_tdp) | np.isnan(psu_wattage)
+    report(unreadable, errors, 'invalid_value',
+           lambda i: "Validation error: TDP, Wattage and length fields must be numbers")
+
+    return [
+        {'isValid': not errors[i], 'errors': errors[i], 'warnings': warnings[i]}
+        for i in range(n)
+    ]
+
+
+def iter_validate(builds, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Validate any iterable of builds chunk by chunk, yielding results in order"""
+    chunk = []
+    for build in builds:
+        chunk.append(build)
+        if len(chunk) == chunk_size:
+            yield from validate_chunk(chunk)
+            chunk = []
+    if chunk:
+        yield from validate_chunk(chunk)
+
+
+def summarize(results):
+    return {
+        'builds': len(results),
+        'valid': sum(1 for r in results if r['isValid']),
+        'invalid': sum(1 for r in results if not r['isValid']),
+        'with_warnings': sum(1 for r in results if r['warnings']),
+    }
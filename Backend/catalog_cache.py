@@ -0,0 +1,198 @@
+# Catalog Cache for Manual Build Mode
+# Each catalog collection (cpus, gpus, motherboards, ...) is read once from
+# its component store (see component_store.py) and kept in memory with
+# indexes on the fields the /api/manual/* routes filter by. All filtering
+# then happens locally instead of one Firestore round trip per request.
+#
+# Refresh:
+# - TTL: a collection is re-read on the next request after `ttl` seconds
+# - Version: if the store reports a version (FirestoreStore with a
+#   version document), it is checked every `version_check_interval`
+#   seconds and the whole cache is dropped when it changes
+# - Explicit: invalidate() (exposed as POST /api/manual/cache/invalidate)
+
+import bisect
+import hashlib
+import json
+import threading
+import time
+
+# Fields indexed for each collection (equality / array-contains filters)
+INDEXED_FIELDS = {
+    'cpus': [],
+    'motherboards': ['Socket'],
+    'gpus': [],
+    'ram': ['RAM_Type'],
+    'coolers': ['Supported_Sockets'],
+    'storage': [],
+    'psus': [],
+    'cases': ['Form_Factor'],
+}
+
+# Numeric fields kept sorted for range filters (>=)
+RANGE_FIELDS = {
+    'cases': ['Max_GPU_Length_cm'],
+}
+
+DEFAULT_TTL = 300  # seconds
+
+
+class _CollectionSnapshot:
+    """All documents of one collection plus their indexes"""
+
+    def __init__(self, name, docs, loaded_at):
+        self.name = name
+        self.docs = docs
+        self.loaded_at = loaded_at
+        self.memo = {}
+
+        # {field: {value: [positions]}}, list values are indexed per element
+        self.indexes = {}
+        for field in INDEXED_FIELDS.get(name, []):
+            index = {}
+            for position, doc in enumerate(docs):
+                value = doc.get(field)
+                values = value if isinstance(value, list) else [value]
+                for v in values:
+                    try:
+                        index.setdefault(v, []).append(position)
+                    except TypeError:
+                        continue  # unhashable value, can't be matched with ==
+            self.indexes[field] = index
+
+        # {field: (sorted values, positions)}, missing values count as 0
+        # and non-numeric values are left out
+        self.ranges = {}
+        for field in RANGE_FIELDS.get(name, []):
+            pairs = sorted(
+                (doc.get(field, 0), position) for position, doc in enumerate(docs)
+                if isinstance(doc.get(field, 0), (int, float))
+            )
+            self.ranges[field] = ([v for v, _ in pairs], [p for _, p in pairs])
+
+    def positions_equal(self, field, value):
+        return self.indexes[field].get(value, [])
+
+    def positions_at_least(self, field, minimum):
+        values, positions = self.ranges[field]
+        return positions[bisect.bisect_left(values, minimum):]
+
+
+class CatalogCache:
+    """In-process cache of the Manual Build catalog"""
+
+    def __init__(self, store, ttl=DEFAULT_TTL, version_check_interval=30, clock=time.monotonic):
+        self.store = store
+        self.backend = store.backend
+        self.ttl = ttl
+        self.version_check_interval = version_check_interval
+        self.clock = clock
+
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._version = None
+        self._version_checked_at = None
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Loading and refresh
+    # ------------------------------------------------------------------
+
+    def _check_version(self):
+        """Drop everything if the store's version changed. The version is
+        fetched (a Firestore read) outside the cache lock by one thread;
+        requests meanwhile are served from the current snapshots."""
+        now = self.clock()
+        with self._lock:
+            if self._version_checked_at is not None and now - self._version_checked_at < self.version_check_interval:
+                return
+            self._version_checked_at = now
+        version = self.store.version()
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._snapshots.clear()
+
+    def _fresh(self, snapshot, now):
+        return snapshot is not None and (self.ttl is None or now - snapshot.loaded_at < self.ttl)
+
+    def snapshot(self, name):
+        """Current snapshot of a collection, loading it if missing or expired"""
+        self._check_version()
+        with self._lock:
+            snapshot = self._snapshots.get(name)
+            if self._fresh(snapshot, self.clock()):
+                self.hits += 1
+                return snapshot
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        # Only one thread streams a given collection; the others wait for it
+        with load_lock:
+            snapshot = self._snapshots.get(name)
+            if self._fresh(snapshot, self.clock()):
+                self.hits += 1
+                return snapshot
+            self.misses += 1
+            snapshot = _CollectionSnapshot(name, self.store.documents(name), self.clock())
+            with self._lock:
+                self._snapshots[name] = snapshot
+            return snapshot
+
+    def invalidate(self, name=None):
+        """Drop one collection (or everything) so it is re-streamed on next use"""
+        with self._lock:
+            if name is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(name, None)
+
+    def data_version(self, name):
+        """Content hash of a collection's current snapshot (ETags)"""
+        snapshot = self.snapshot(name)
+        if 'data_version' not in snapshot.memo:
+            raw = json.dumps(snapshot.docs, sort_keys=True, default=str)
+            snapshot.memo['data_version'] = hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+        return snapshot.memo['data_version']
+
+    def stats(self):
+        now = self.clock()
+        with self._lock:
+            collections = {
+                name: {'documents': len(s.docs), 'age_seconds': round(now - s.loaded_at, 1)}
+                for name, s in self._snapshots.items()
+            }
+        return {'backend': self.backend, 'hits': self.hits, 'misses': self.misses, 'ttl': self.ttl,
+                'collections': collections}
+
+    # ------------------------------------------------------------------
+    # Queries (documents are returned in Firestore stream order)
+    # ------------------------------------------------------------------
+
+    def all(self, name):
+        return self.snapshot(name).docs
+
+    def where(self, name, field, value):
+        """Documents where field == value (or value in field, for lists)"""
+        snapshot = self.snapshot(name)
+        return [snapshot.docs[p] for p in snapshot.positions_equal(field, value)]
+
+    def cpus_by_brand(self, brand):
+        """CPUs whose Name contains the brand (case-insensitive)"""
+        snapshot = self.snapshot('cpus')
+        key = ('brand', brand.lower())
+        if key not in snapshot.memo:
+            snapshot.memo[key] = [
+                doc for doc in snapshot.docs if key[1] in doc.get('Name', '').lower()
+            ]
+        return snapshot.memo[key]
+
+    def cases_for(self, form_factors, gpu_length):
+        """Cases with one of the form factors that fit a GPU of this length"""
+        snapshot = self.snapshot('cases')
+        candidates = set()
+        for form_factor in form_factors:
+            candidates.update(snapshot.positions_equal('Form_Factor', form_factor))
+        fits = candidates.intersection(snapshot.positions_at_least('Max_GPU_Length_cm', gpu_length))
+        return [snapshot.docs[p] for p in sorted(fits)]
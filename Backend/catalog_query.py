@@ -0,0 +1,308 @@
+# Catalog List Queries for Manual Build Mode
+# Shared by the /api/manual/* component list routes:
+#
+# - Filters:    min_<Field>=650, max_<Field>=200, eq_<Field>=ATX (list
+#               fields such as Supported_Sockets match when they contain
+#               the value), q=<text> (case-insensitive search in Name)
+# - Sort:       sort=Price or sort=-Wattage (prices such as "$129.99" sort
+#               as numbers); ties and pages are ordered by document id
+# - Projection: fields=Name,Price (id is always included)
+# - Pages:      limit=50, then cursor=<next_cursor> for the next page
+#
+# Without limit/cursor the response is the plain JSON array the routes
+# always returned. With them it is {"items", "next_cursor", "total"}. The
+# cursor holds the sort key of the last item, so the next page starts right
+# after it even if documents were added or removed in between.
+#
+# With "Accept: application/x-ndjson" the documents are streamed one per
+# line instead (see streaming.py); a paginated query ends with a
+# {"next_cursor", "total"} line.
+#
+# Responses are compressed (brotli when the optional `brotli` package is
+# installed, otherwise gzip) and tagged with an ETag derived from the
+# catalog data version and the query, so the tag is known before anything
+# is serialized: an unchanged page costs a 304. Encoded bodies are kept in
+# a small LRU (PageCache) so a repeated page is not serialized again.
+
+import base64
+import gzip
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+MAX_PAGE_SIZE = 500
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_BYTES = 1024
+
+DEFAULT_PAGE_CACHE_SIZE = 256
+
+_NUMBER = re.compile(r'^\$?\s*-?[\d,]*\.?\d+$')
+
+
+class CatalogQueryError(ValueError):
+    """Invalid query parameter (reported as 400)"""
+
+
+def _sort_value(value):
+    """Comparable key for any field value: numbers (and numeric strings
+    like "$1,299.99") first, then other strings, then missing values"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return [0, float(value), '']
+    if isinstance(value, str):
+        if _NUMBER.match(value.strip()):
+            return [0, float(value.strip().replace('$', '').replace(',', '')), '']
+        return [1, 0.0, value]
+    if value is None:
+        return [2, 0.0, '']
+    return [1, 0.0, str(value)]
+
+
+def _number(value):
+    key = _sort_value(value)
+    return key[1] if key[0] == 0 else None
+
+
+def _equals(value, wanted):
+    """value == wanted (a query string), comparing numbers as numbers"""
+    if _number(wanted) is not None and _number(value) is not None:
+        return _number(value) == _number(wanted)
+    return value is not None and str(value) == wanted
+
+
+def _contains(value, wanted):
+    if isinstance(value, list):
+        return any(_equals(v, wanted) for v in value)
+    return _equals(value, wanted)
+
+
+class CatalogQuery:
+    """Parsed filter/sort/projection/page parameters of one request"""
+
+    def __init__(self, args):
+        """args: request.args (other parameters, such as the route's own
+        brand or socket, are ignored)"""
+        self.fields = [f for f in args.get('fields', '').split(',') if f]
+        self.sort = args.get('sort') or None
+        self.search = (args.get('q') or '').lower()
+        self.cursor = args.get('cursor') or None
+        self.limit = None
+        if 'limit' in args:
+            try:
+                self.limit = int(args['limit'])
+            except ValueError:
+                raise CatalogQueryError("'limit' must be an integer")
+            if not 1 <= self.limit <= MAX_PAGE_SIZE:
+                raise CatalogQueryError(f"'limit' must be between 1 and {MAX_PAGE_SIZE}")
+        elif self.cursor:
+            self.limit = MAX_PAGE_SIZE
+
+        self.filters = []
+        for name, value in sorted(args.items()):
+            for prefix in ('min_', 'max_', 'eq_'):
+                if name.startswith(prefix) and len(name) > len(prefix):
+                    if prefix != 'eq_' and _number(value) is None:
+                        raise CatalogQueryError(f"'{name}' must be a number")
+                    self.filters.append((prefix[:-1], name[len(prefix):], value))
+                    break
+
+        # Checked now, so a bad cursor is a 400 even when the ETag matches
+        self.after = self.decode_cursor() if self.cursor else None
+
+    @property
+    def paginated(self):
+        return self.limit is not None
+
+    # ------------------------------------------------------------------
+    # Cursors
+    # ------------------------------------------------------------------
+
+    def _signature(self):
+        """Cursors only continue the query they came from"""
+        return hashlib.sha1(json.dumps([self.sort, self.search, self.filters]).encode('utf-8')).hexdigest()[:8]
+
+    def _sort_key(self, doc):
+        """[rank, number, text, id]; JSON round-trips it for the cursor"""
+        if not self.sort:
+            return [str(doc.get('id'))]
+        rank, number, text = _sort_value(doc.get(self.sort.lstrip('-')))
+        if self.sort.startswith('-'):
+            # Descending values (missing ones still last): negate numbers
+            # and code points; the end marker puts "abc" before "ab"
+            number, text = -number, [-ord(c) for c in text] + [1]
+        return [rank, number, text, str(doc.get('id'))]
+
+    def encode_cursor(self, doc):
+        raw = json.dumps({'k': self._sort_key(doc), 's': self._signature()})
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self):
+        try:
+            data = json.loads(base64.urlsafe_b64decode(self.cursor.encode('ascii')))
+            key, signature = data['k'], data['s']
+        except (ValueError, TypeError, KeyError):
+            raise CatalogQueryError("Invalid cursor")
+        if signature != self._signature():
+            raise CatalogQueryError("Cursor belongs to a different sort or filter")
+        return key
+
+    # ------------------------------------------------------------------
+    # Applying
+    # ------------------------------------------------------------------
+
+    def _matches(self, doc):
+        if self.search and self.search not in str(doc.get('Name', '')).lower():
+            return False
+        for op, field, value in self.filters:
+            if op == 'eq':
+                if not _contains(doc.get(field), value):
+                    return False
+            else:
+                number = _number(doc.get(field))
+                if number is None:
+                    return False
+                if op == 'min' and number < float(_number(value)):
+                    return False
+                if op == 'max' and number > float(_number(value)):
+                    return False
+        return True
+
+    def _project(self, doc):
+        if not self.fields:
+            return doc
+        return {f: doc[f] for f in ['id'] + self.fields if f in doc}
+
+    def apply(self, docs):
+        """The response body for these documents (list or page dict)"""
+        if self.search or self.filters:
+            docs = [doc for doc in docs if self._matches(doc)]
+        if self.sort or self.paginated:
+            docs = sorted(docs, key=self._sort_key)
+        if not self.paginated:
+            return [self._project(doc) for doc in docs]
+
+        total = len(docs)
+        if self.cursor:
+            try:
+                docs = [doc for doc in docs if self._sort_key(doc) > self.after]
+            except TypeError:
+                raise CatalogQueryError("Invalid cursor")
+        page = docs[:self.limit]
+        next_cursor = self.encode_cursor(page[-1]) if len(docs) > self.limit else None
+        return {'items': [self._project(doc) for doc in page], 'next_cursor': next_cursor, 'total': total}
+
+    def rows(self, docs):
+        """apply() as NDJSON rows: the documents one by one, then for a
+        paginated query a final {"next_cursor", "total"} row
+
+        Unsorted results are filtered and projected while they are sent.
+        Pages are computed up front (they are small), so an invalid cursor
+        is still raised here rather than in the middle of a response.
+        """
+        if self.paginated:
+            page = self.apply(docs)
+            return iter(page['items'] + [{'next_cursor': page['next_cursor'], 'total': page['total']}])
+        if self.search or self.filters:
+            docs = (doc for doc in docs if self._matches(doc))
+        if self.sort:
+            docs = sorted(docs, key=self._sort_key)
+        return (self._project(doc) for doc in docs)
+
+
+# ----------------------------------------------------------------------
+# ETags and compression
+# ----------------------------------------------------------------------
+
+def make_etag(data_version, path, args):
+    """Strong ETag for a list response; args is request.args"""
+    query = sorted((k, v) for k, values in args.lists() for v in values)
+    raw = json.dumps([data_version, path, query], default=str)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:20]
+
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match check; compressed variants are tagged "<etag>-gzip"
+    and "<etag>-br" but match the same tag"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*':
+            return True
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        for suffix in ('-gzip', '-br'):
+            if tag.endswith(suffix):
+                tag = tag[:-len(suffix)]
+        if tag == etag:
+            return True
+    return False
+
+
+def choose_encoding(accept_encoding):
+    """'br', 'gzip' or None for an Accept-Encoding header"""
+    accepted = {}
+    for part in (accept_encoding or '').lower().split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name] = quality
+    if BROTLI_AVAILABLE and accepted.get('br', 0) > 0:
+        return 'br'
+    if accepted.get('gzip', 0) > 0:
+        return 'gzip'
+    return None
+
+
+def encode_body(body, encoding, dumps=json.dumps):
+    """(bytes, encoding actually used); dumps serializes the body
+    (the app passes Flask's, so bodies match jsonify)"""
+    data = dumps(body).encode('utf-8')
+    if encoding is None or len(data) < MIN_COMPRESS_BYTES:
+        return data, None
+    if encoding == 'br':
+        return brotli.compress(data, quality=5), 'br'
+    return gzip.compress(data, compresslevel=6), 'gzip'
+
+
+class PageCache:
+    """LRU of encoded response bodies keyed by (etag, encoding)"""
+
+    def __init__(self, maxsize=DEFAULT_PAGE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,68 @@
+# Compact In-Memory Layout of the Build Dataset
+# final_ruleset_data.csv is held in the narrowest types that fit it:
+#
+# - Text columns with repeated values (cpu, gpu, resolution) are
+#   categoricals: one small integer code per row plus each distinct string
+#   once. A column of mostly distinct strings (the c_number ids) stays as
+#   it is, since a categorical would only add the codes to it
+# - Integer columns use the narrowest signed type for their range
+#   (ram_gb int8, price/fps/power int16, scores int32)
+# - The four is_good_for_* flags are packed into one uint8 column,
+#   `use_cases`, one bit per flag (USE_CASE_BITS)
+#
+# Filters then compare integer codes and test bits instead of comparing
+# Python strings and int64 columns: category_mask() and use_case_mask().
+#
+# Applied to the dataset however it was loaded (CSV or snapshot). The
+# snapshot's text columns are already categorical codes and stay
+# memory-mapped; only the numeric columns are narrowed into (small)
+# private copies.
+
+import numpy as np
+import pandas as pd
+
+# Use-case flag columns of the CSV -> bit in the `use_cases` column
+USE_CASE_BITS = {
+    'is_good_for_gaming': 1,
+    'is_good_for_productivity': 2,
+    'is_good_for_design_render': 4,
+    'is_good_for_workstation': 8,
+}
+USE_CASE_COLUMN = 'use_cases'
+
+
+def compact_builds(df):
+    """The dataset in its compact layout (a new DataFrame)"""
+    columns = {}
+    flags = np.zeros(len(df), dtype=np.uint8)
+    for name in df.columns:
+        column = df[name]
+        if name in USE_CASE_BITS:
+            flags |= np.where(column.to_numpy() == 1, USE_CASE_BITS[name], 0).astype(np.uint8)
+        elif isinstance(column.dtype, pd.CategoricalDtype):
+            columns[name] = column
+        elif pd.api.types.is_integer_dtype(column):
+            columns[name] = pd.to_numeric(column, downcast='integer')
+        elif pd.api.types.is_numeric_dtype(column) or pd.api.types.is_bool_dtype(column):
+            columns[name] = column
+        elif column.nunique() <= len(column) // 2:
+            columns[name] = column.astype('category')
+        else:
+            columns[name] = column
+    if any(name in df.columns for name in USE_CASE_BITS):
+        columns[USE_CASE_COLUMN] = flags
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def category_mask(column, value):
+    """Rows of a categorical column equal to `value`, compared as codes"""
+    categorical = column.array
+    code = categorical.categories.get_indexer([value])[0]
+    if code < 0:
+        return np.zeros(len(column), dtype=bool)
+    return categorical.codes == code
+
+
+def use_case_mask(df, flag_column):
+    """Rows whose is_good_for_* flag (by its CSV column name) is set"""
+    return (df[USE_CASE_COLUMN].to_numpy() & USE_CASE_BITS[flag_column]) != 0
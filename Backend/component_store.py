@@ -0,0 +1,234 @@
+# Component Stores for Manual Build Mode
+# The /api/manual/* routes read the hardware catalog through a component
+# store, so Manual Build works with either backend:
+#
+# - FirestoreStore: the Firebase collections (served through CatalogCache)
+# - SQLiteStore:    a local file (data/catalog.sqlite) with indexes on
+#                   socket, RAM type, form factor and GPU length - works
+#                   offline and needs no Firebase credentials
+#
+# Both expose the same query methods as CatalogCache: all(), where(),
+# cpus_by_brand(), cases_for(), data_version(), invalidate() and stats().
+# Documents are returned as dicts with an 'id' key, ordered by document id.
+#
+# scripts/catalog_snapshot.py copies the Firestore collections into a
+# SQLite store.
+
+import json
+import os
+import sqlite3
+import threading
+
+from metrics import STAGE_SECONDS
+
+COLLECTIONS = ['cpus', 'motherboards', 'gpus', 'ram', 'coolers', 'storage', 'psus', 'cases']
+
+# Document fields stored in their own indexed column
+INDEXED_COLUMNS = {
+    'Name': 'name',
+    'Socket': 'socket',
+    'RAM_Type': 'ram_type',
+    'Form_Factor': 'form_factor',
+    'Max_GPU_Length_cm': 'max_gpu_length_cm',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS components (
+    collection TEXT NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT,
+    socket TEXT,
+    ram_type TEXT,
+    form_factor TEXT,
+    max_gpu_length_cm REAL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (collection, id)
+);
+CREATE INDEX IF NOT EXISTS idx_components_socket ON components (collection, socket, id);
+CREATE INDEX IF NOT EXISTS idx_components_ram_type ON components (collection, ram_type, id);
+CREATE INDEX IF NOT EXISTS idx_components_case_fit ON components (collection, form_factor, max_gpu_length_cm);
+
+-- One row per entry of array fields such as Supported_Sockets
+CREATE TABLE IF NOT EXISTS component_tags (
+    collection TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT NOT NULL,
+    id TEXT NOT NULL,
+    PRIMARY KEY (collection, field, value, id)
+);
+"""
+
+
+class FirestoreStore:
+    """Reads catalog collections from Firestore (wrap in CatalogCache to serve)"""
+
+    backend = 'firestore'
+
+    def __init__(self, db, version_doc=None):
+        self.db = db
+        self.version_doc = version_doc
+
+    def documents(self, collection):
+        docs = []
+        with STAGE_SECONDS.time(stage='firestore_fetch'):
+            for doc in self.db.collection(collection).stream():
+                data = doc.to_dict()
+                data['id'] = doc.id
+                docs.append(data)
+        return docs
+
+    def version(self):
+        """`version` field of the version document, or None if not configured"""
+        if not self.version_doc:
+            return None
+        collection, document = self.version_doc.split('/', 1)
+        snapshot = self.db.collection(collection).document(document).get()
+        return (snapshot.to_dict() or {}).get('version') if snapshot.exists else None
+
+
+def _numeric(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+class SQLiteStore:
+    """Local file-backed catalog"""
+
+    backend = 'sqlite'
+
+    def __init__(self, path, read_only=True):
+        self.path = path
+        self.read_only = read_only
+        self._local = threading.local()
+        self._generation = 0
+
+    # ------------------------------------------------------------------
+    # Connections (one per thread, reopened after invalidate())
+    # ------------------------------------------------------------------
+
+    def _connect(self):
+        if self.read_only:
+            conn = sqlite3.connect(f"file:{os.path.abspath(self.path)}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.executescript(SCHEMA)
+        return conn
+
+    @property
+    def conn(self):
+        if getattr(self._local, 'generation', None) != self._generation:
+            self._local.conn = self._connect()
+            self._local.generation = self._generation
+        return self._local.conn
+
+    # ------------------------------------------------------------------
+    # Writing (used by scripts/catalog_snapshot.py)
+    # ------------------------------------------------------------------
+
+    def replace_collection(self, collection, docs):
+        """Replace every document of a collection with `docs` (dicts with 'id')"""
+        conn = self.conn
+        with conn:
+            conn.execute("DELETE FROM components WHERE collection = ?", (collection,))
+            conn.execute("DELETE FROM component_tags WHERE collection = ?", (collection,))
+            for doc in docs:
+                data = {k: v for k, v in doc.items() if k != 'id'}
+                conn.execute(
+                    "INSERT INTO components (collection, id, name, socket, ram_type, form_factor, "
+                    "max_gpu_length_cm, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        collection, str(doc['id']), data.get('Name'), data.get('Socket'),
+                        data.get('RAM_Type'), data.get('Form_Factor'),
+                        _numeric(data.get('Max_GPU_Length_cm', 0)),
+                        json.dumps(data, default=str)
+                    )
+                )
+                for field, value in data.items():
+                    if isinstance(value, list):
+                        conn.executemany(
+                            "INSERT OR IGNORE INTO component_tags (collection, field, value, id) VALUES (?, ?, ?, ?)",
+                            [(collection, field, str(v), str(doc['id'])) for v in value]
+                        )
+
+    # ------------------------------------------------------------------
+    # Queries (same interface as CatalogCache)
+    # ------------------------------------------------------------------
+
+    def _documents(self, sql, params):
+        docs = []
+        with STAGE_SECONDS.time(stage='sqlite_query'):
+            for doc_id, data in self.conn.execute(sql, params):
+                doc = json.loads(data)
+                doc['id'] = doc_id
+                docs.append(doc)
+        return docs
+
+    def documents(self, collection):
+        return self.all(collection)
+
+    def all(self, collection):
+        return self._documents(
+            "SELECT id, data FROM components WHERE collection = ? ORDER BY id", (collection,)
+        )
+
+    def where(self, collection, field, value):
+        """Documents where field == value (or value in field, for lists)"""
+        if field in INDEXED_COLUMNS:
+            return self._documents(
+                f"SELECT id, data FROM components WHERE collection = ? AND {INDEXED_COLUMNS[field]} = ? ORDER BY id",
+                (collection, value)
+            )
+        is_array_field = self.conn.execute(
+            "SELECT 1 FROM component_tags WHERE collection = ? AND field = ? LIMIT 1", (collection, field)
+        ).fetchone()
+        if is_array_field:
+            return self._documents(
+                "SELECT c.id, c.data FROM component_tags t JOIN components c "
+                "ON c.collection = t.collection AND c.id = t.id "
+                "WHERE t.collection = ? AND t.field = ? AND t.value = ? ORDER BY c.id",
+                (collection, field, str(value))
+            )
+        # Any other scalar field
+        return self._documents(
+            "SELECT id, data FROM components WHERE collection = ? AND json_extract(data, ?) = ? ORDER BY id",
+            (collection, f'$."{field}"', value)
+        )
+
+    def cpus_by_brand(self, brand):
+        """CPUs whose Name contains the brand (case-insensitive)"""
+        return self._documents(
+            "SELECT id, data FROM components WHERE collection = 'cpus' "
+            "AND instr(lower(name), ?) > 0 ORDER BY id",
+            (brand.lower(),)
+        )
+
+    def cases_for(self, form_factors, gpu_length):
+        """Cases with one of the form factors that fit a GPU of this length"""
+        placeholders = ', '.join('?' for _ in form_factors)
+        return self._documents(
+            f"SELECT id, data FROM components WHERE collection = 'cases' "
+            f"AND form_factor IN ({placeholders}) AND max_gpu_length_cm >= ? ORDER BY id",
+            (*form_factors, gpu_length)
+        )
+
+    def invalidate(self, collection=None):
+        """Reopen connections so a replaced database file is picked up"""
+        self._generation += 1
+
+    def data_version(self, collection):
+        """Changes whenever the database file does (ETags)"""
+        parts = []
+        for path in (self.path, self.path + '-wal'):
+            try:
+                stat = os.stat(path)
+                parts.append(f"{stat.st_size}:{stat.st_mtime_ns}")
+            except OSError:
+                parts.append('-')
+        return f"{self._generation}:{':'.join(parts)}"
+
+    def stats(self):
+        counts = dict(self.conn.execute(
+            "SELECT collection, COUNT(*) FROM components GROUP BY collection"
+        ).fetchall())
+        return {'backend': self.backend, 'path': self.path, 'collections': {
+            name: {'documents': count} for name, count in counts.items()
+        }}
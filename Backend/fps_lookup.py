@@ -0,0 +1,167 @@
+# Exact FPS lookup index for Performance Prediction
+# Built once at startup from final_ruleset_data.csv. Replaces the boolean
+# mask scan over every row with a dictionary lookup keyed on
+# (cpu_score bucket, gpu_score bucket, ram_gb).
+#
+# NearestFpsIndex answers near misses from the same data: the k nearest
+# measured builds of a resolution within NEAREST_MAX_DISTANCE, with their
+# FPS interpolated by inverse distance. Distance is in score points over
+# (cpu_score, gpu_score, ram_gb); FPS in the dataset doesn't change with
+# RAM, so a GB only counts RAM_DISTANCE_WEIGHT points and mostly breaks
+# ties. Builds sit on a grid of NEAREST_MAX_DISTANCE-wide cells, so a
+# query only looks at the 3x3 cells around it.
+
+import math
+
+import numpy as np
+
+# Scores match when they differ by less than this amount
+SCORE_TOLERANCE = 0.1
+
+# Measured builds interpolated per nearest-neighbour answer
+NEAREST_NEIGHBOURS = 4
+# Farthest measured build (in score points) used for a nearest-neighbour answer
+NEAREST_MAX_DISTANCE = 2000.0
+# Score points per GB of RAM difference
+RAM_DISTANCE_WEIGHT = 10.0
+
+
+def _bucket(score):
+    return math.floor(score)
+
+
+def _candidate_buckets(score):
+    """Buckets that can hold a score within SCORE_TOLERANCE of this one"""
+    low = _bucket(score - SCORE_TOLERANCE)
+    high = _bucket(score + SCORE_TOLERANCE)
+    return range(low, high + 1)
+
+
+class FpsLookupIndex:
+    """Measured FPS for every (cpu_score, gpu_score, ram_gb, resolution) in the dataset"""
+
+    def __init__(self, df):
+        self.buckets = {}
+        columns = zip(
+            df['cpu_score'].tolist(), df['gpu_score'].tolist(), df['ram_gb'].tolist(),
+            df['resolution'].tolist(), df['fps'].tolist()
+        )
+        for row, (cpu_score, gpu_score, ram_gb, resolution, fps) in enumerate(columns):
+            key = (_bucket(cpu_score), _bucket(gpu_score), ram_gb)
+            self.buckets.setdefault(key, []).append((row, cpu_score, gpu_score, resolution, fps))
+
+    def lookup_all(self, cpu_score, gpu_score, ram_gb):
+        """Measured FPS for every resolution of this build, as {"1080P": fps, ...}"""
+        found = {}
+        first_row = {}
+        for cpu_bucket in _candidate_buckets(cpu_score):
+            for gpu_bucket in _candidate_buckets(gpu_score):
+                for row, c, g, resolution, fps in self.buckets.get((cpu_bucket, gpu_bucket, ram_gb), ()):
+                    if abs(c - cpu_score) >= SCORE_TOLERANCE or abs(g - gpu_score) >= SCORE_TOLERANCE:
+                        continue
+                    # Same as the old scan: the first matching CSV row wins
+                    if resolution not in found or row < first_row[resolution]:
+                        found[resolution] = fps
+                        first_row[resolution] = row
+        return found
+
+    def lookup(self, cpu_score, gpu_score, ram_gb, resolution):
+        """Measured FPS for one resolution ("1080P", "1440P", "4K"), or None"""
+        return self.lookup_all(cpu_score, gpu_score, ram_gb).get(resolution)
+
+
+class NearestFpsIndex:
+    """k nearest measured builds per resolution, on a grid of cells
+    max_distance wide"""
+
+    def __init__(self, df, k=NEAREST_NEIGHBOURS, max_distance=NEAREST_MAX_DISTANCE,
+                 ram_weight=RAM_DISTANCE_WEIGHT):
+        self.k = k
+        self.max_distance = max_distance
+        self.ram_weight = ram_weight
+        points = {}  # resolution -> {(cpu cell, gpu cell): [(row, cpu_score, gpu_score, ram_gb, fps), ...]}
+        seen = set()
+        columns = zip(
+            df['cpu_score'].tolist(), df['gpu_score'].tolist(), df['ram_gb'].tolist(),
+            df['resolution'].tolist(), df['fps'].tolist()
+        )
+        for row, (cpu_score, gpu_score, ram_gb, resolution, fps) in enumerate(columns):
+            # One point per measured build (the first CSV row, as for exact matches)
+            if (cpu_score, gpu_score, ram_gb, resolution) in seen:
+                continue
+            seen.add((cpu_score, gpu_score, ram_gb, resolution))
+            cells = points.setdefault(resolution, {})
+            cells.setdefault(self._cell(cpu_score, gpu_score), []).append((row, cpu_score, gpu_score, ram_gb, fps))
+
+        # Each cell holds every point of the 3x3 cells around it as arrays,
+        # so a query is one dict lookup and one vectorized distance. Points
+        # stay in CSV order, so of equally distant builds the first CSV row
+        # comes first
+        self.cells = {}
+        for resolution, cells in points.items():
+            around = {}
+            for (cpu_cell, gpu_cell), cell_points in cells.items():
+                for c in (cpu_cell - 1, cpu_cell, cpu_cell + 1):
+                    for g in (gpu_cell - 1, gpu_cell, gpu_cell + 1):
+                        around.setdefault((c, g), []).extend(cell_points)
+            self.cells[resolution] = {}
+            for cell, cell_points in around.items():
+                cell_points.sort()
+                self.cells[resolution][cell] = (
+                    np.array([p[1:4] for p in cell_points], dtype=float),
+                    np.array([p[4] for p in cell_points], dtype=float),
+                )
+
+    def _cell(self, cpu_score, gpu_score):
+        return math.floor(cpu_score / self.max_distance), math.floor(gpu_score / self.max_distance)
+
+    def _nearest(self, cpu_score, gpu_score, ram_gb, resolution):
+        """(squared distances, points, fps) of up to k nearest measured
+        builds within max_distance, nearest first (CSV order on ties)"""
+        cells = self.cells.get(resolution)
+        if not cells or self.max_distance <= 0:
+            return None
+        found = cells.get(self._cell(cpu_score, gpu_score))
+        if found is None:
+            return None
+        points, fps = found
+        squared = ((points[:, 0] - cpu_score) ** 2 + (points[:, 1] - gpu_score) ** 2 +
+                   ((points[:, 2] - ram_gb) * self.ram_weight) ** 2)
+        within = np.flatnonzero(squared <= self.max_distance * self.max_distance)
+        if len(within) == 0:
+            return None
+        nearest = within[np.argsort(squared[within], kind='stable')[:self.k]]
+        return squared[nearest], points[nearest], fps[nearest]
+
+    def neighbours(self, cpu_score, gpu_score, ram_gb, resolution):
+        """Up to k nearest measured builds within max_distance, nearest
+        first, as [{"cpu_score", "gpu_score", "ram_gb", "fps", "distance"}]"""
+        found = self._nearest(cpu_score, gpu_score, ram_gb, resolution)
+        if found is None:
+            return []
+        squared, points, fps = found
+        return [
+            {"cpu_score": c, "gpu_score": g, "ram_gb": int(r), "fps": int(f), "distance": math.sqrt(d)}
+            for d, (c, g, r), f in zip(squared.tolist(), points.tolist(), fps.tolist())
+        ]
+
+    def interpolate(self, cpu_score, gpu_score, ram_gb, resolution):
+        """Inverse-distance weighted FPS of the nearest measured builds
+        (rounded), or None when there are none within max_distance"""
+        found = self._nearest(cpu_score, gpu_score, ram_gb, resolution)
+        if found is None:
+            return None
+        squared, _, fps = found
+        if squared[0] == 0:
+            return int(fps[0])
+        weights = 1.0 / np.sqrt(squared)
+        return int(round(float(np.dot(weights, fps) / weights.sum())))
+
+    def interpolate_all(self, cpu_score, gpu_score, ram_gb, resolutions):
+        """{resolution: FPS} for the resolutions that have nearby measured builds"""
+        found = {}
+        for resolution in resolutions:
+            fps = self.interpolate(cpu_score, gpu_score, ram_gb, resolution)
+            if fps is not None:
+                found[resolution] = fps
+        return found
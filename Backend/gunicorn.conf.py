@@ -0,0 +1,35 @@
+# Gunicorn Settings for Production
+# Run from the Backend folder:
+#
+#   gunicorn -c gunicorn.conf.py "wsgi:create_app()"
+#
+# The app is loaded once in the master (preload_app) and the workers are
+# forked from it, so datasets, indexes, models and the prediction table
+# are shared by all workers instead of loaded by each one (see wsgi.py).
+# Each worker then opens its own Firebase client.
+#
+# Settings can be overridden with environment variables:
+#   HOST, PORT          listen address (default 0.0.0.0:5000)
+#   WEB_CONCURRENCY     worker processes (default: one per CPU core)
+#   GUNICORN_THREADS    threads per worker (default 4)
+#   GUNICORN_TIMEOUT    seconds before a silent worker is restarted (default 30)
+#   GUNICORN_PRELOAD    "off" loads the app separately in every worker
+# or with gunicorn's own command-line options, which take precedence.
+
+import os
+
+# Firebase clients are connected in each worker, never in the master
+os.environ.setdefault('ASSET_PER_PROCESS', 'worker')
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'on') != 'off'
+
+
+def post_worker_init(worker):
+    # After fork and after the app is loaded: connect this worker's
+    # Firebase client (never inherited from the master)
+    import wsgi
+    wsgi.load_worker_assets()
@@ -0,0 +1,109 @@
+# Hardware Name Resolver for Performance Prediction
+# Turns user-typed CPU/GPU names ("Intel Core i5-12400F", "rtx 3060") into
+# scores from hardware_lookup.csv. Everything that can be prepared ahead of
+# time (normalized names, model-number index, compiled regexes) is built
+# once when the lookup table is loaded, and resolved names are cached.
+#
+# Matching order (first step that matches wins):
+# 1. Exact match after normalization (lowercase, no spaces or hyphens)
+# 2. Substring match - the longest database name inside the input, else
+#    the shortest database name that contains the input
+# 3. Model-number match - i5-12400, Ryzen 5 5600, RTX3060, RX6600, ...
+# Remaining ties always go to the earliest row in hardware_lookup.csv.
+
+import logging
+import re
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# Model-number patterns, most specific first
+MODEL_PATTERNS = [re.compile(p) for p in [
+    r'i[3579]\d+',           # Intel i3, i5, i7, i9 (i512400)
+    r'ryzen[3579]\d{4}',     # AMD Ryzen with model number (ryzen55600)
+    r'ryzen[3579]',          # AMD Ryzen 3, 5, 7, 9
+    r'rtx\d+',               # NVIDIA RTX
+    r'gtx\d+',               # NVIDIA GTX
+    r'rx\d+',                # AMD RX
+]]
+
+# Number of resolved names kept in memory
+RESOLVER_CACHE_SIZE = 4096
+
+
+def normalize_name(name):
+    """Lowercase and drop spaces/hyphens so "i5-12400 F" == "i512400f" """
+    return str(name).lower().replace(" ", "").replace("-", "")
+
+
+class HardwareNameResolver:
+    """Resolves hardware names to scores using indexes built at load time"""
+
+    def __init__(self, hw_db, cache_size=RESOLVER_CACHE_SIZE):
+        # (normalized name, original key, score) in CSV order
+        self.entries = [(normalize_name(name), name, score) for name, score in hw_db.items()]
+
+        # 1. Normalized exact map (earliest CSV row wins)
+        self.exact = {}
+        for clean_name, name, score in self.entries:
+            self.exact.setdefault(clean_name, (name, score))
+
+        # 3. Model-number index: one {token: (name, score)} map per pattern
+        self.model_index = []
+        for pattern in MODEL_PATTERNS:
+            tokens = {}
+            for clean_name, name, score in self.entries:
+                match = pattern.search(clean_name)
+                if match:
+                    tokens.setdefault(match.group(), (name, score))
+            self.model_index.append((pattern, tokens))
+
+        self._resolve_cached = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def resolve(self, part_name):
+        """Return (matched database name, score, match type) or None"""
+        if not part_name:
+            return None
+        return self._resolve_cached(normalize_name(part_name))
+
+    def score(self, part_name):
+        """Score for a part name, or 0 if it can't be resolved"""
+        match = self.resolve(part_name)
+        return match[1] if match else 0
+
+    def cache_info(self):
+        return self._resolve_cached.cache_info()
+
+    def _resolve(self, clean_input):
+        # 1. Exact match
+        found = self.exact.get(clean_input)
+        if found:
+            return found[0], found[1], 'exact'
+
+        # 2. Database name contained in the input or vice versa
+        # "intelcorei512400f" should pick i5-12400F over i5-12400
+        inside_input = None
+        contains_input = None
+        for entry in self.entries:
+            clean_name = entry[0]
+            if clean_name in clean_input:
+                if inside_input is None or len(clean_name) > len(inside_input[0]):
+                    inside_input = entry
+            elif clean_input in clean_name:
+                if contains_input is None or len(clean_name) < len(contains_input[0]):
+                    contains_input = entry
+        found = inside_input or contains_input
+        if found:
+            logger.debug("Matched '%s' with '%s' (score: %s)", clean_input, found[1], found[2])
+            return found[1], found[2], 'partial'
+
+        # 3. Key parts such as model numbers
+        for pattern, tokens in self.model_index:
+            match = pattern.search(clean_input)
+            if match and match.group() in tokens:
+                name, score = tokens[match.group()]
+                logger.debug("Pattern matched '%s' with '%s' (score: %s)", clean_input, name, score)
+                return name, score, 'pattern'
+
+        logger.debug("No match found for: %s", clean_input)
+        return None
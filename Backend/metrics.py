@@ -0,0 +1,186 @@
+# Metrics for the Flask backend
+# A small in-process registry of counters and histograms, rendered in the
+# Prometheus text format by GET /metrics.
+#
+# - Counter:   inc(amount, **labels)
+# - Histogram: observe(seconds, **labels) or `with histogram.time(**labels):`
+# - Collectors: functions called at scrape time for numbers that are kept
+#   elsewhere anyway (cache statistics), so the hot path pays nothing
+#
+# Numbers are per process: under gunicorn every worker has its own, and a
+# scrape reaches whichever worker answers. Label sets are small and fixed
+# (route templates, stage names, cache names), never user input.
+#
+# The metrics shared by the whole backend are defined at the bottom.
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; request latencies and pipeline stages both fit in this range
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_text(names, values):
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def _number_text(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} needs labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(labels[name] for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items(), key=lambda item: [str(v) for v in item[0]])
+            lines.extend(self._samples(items))
+        return lines
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self, items):
+        return [f"{self.name}{_label_text(self.labelnames, key)} {_number_text(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                # [count per bucket..., sum]
+                counts = self._values[key] = [0] * len(self.buckets) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels):
+        counts = self._values.get(self._key(labels))
+        return sum(counts[:-1]) if counts else 0
+
+    def _samples(self, items):
+        lines = []
+        names = self.labelnames + ('le',)
+        for key, counts in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_label_text(names, key + (_number_text(bound),))} {cumulative}")
+            labels = _label_text(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_number_text(counts[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Metrics plus scrape-time collectors, rendered together"""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name, documentation, labelnames=()):
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, function):
+        """function() returns [(name, type, help, [({labels}, value), ...])];
+        a failing collector is skipped"""
+        self._collectors.append(function)
+        return function
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for function in self._collectors:
+            try:
+                families = function()
+            except Exception:
+                continue
+            for name, kind, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_label_text(list(labels), list(labels.values()))} {_number_text(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+# ----------------------------------------------------------------------
+# Backend metrics
+# ----------------------------------------------------------------------
+
+REGISTRY = Registry()
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    'unicorn_http_request_duration_seconds', 'Request latency by route',
+    ['method', 'route', 'status'])
+
+# score_lookup, csv_match, model_inference, firestore_fetch, json_serialization, ...
+STAGE_SECONDS = REGISTRY.histogram(
+    'unicorn_stage_duration_seconds', 'Time spent in each stage of request handling', ['stage'])
+
+CACHE_EVENTS = REGISTRY.counter(
+    'unicorn_cache_events_total', 'Cache lookups by cache and result', ['cache', 'result'])
+
+NAME_MATCHES = REGISTRY.counter(
+    'unicorn_hardware_name_matches_total',
+    'CPU/GPU name lookups by how they matched (exact, partial, pattern, none)', ['match'])
@@ -0,0 +1,269 @@
+# Compiled ML Models
+# The sklearn estimators in models/*.pkl can be compiled into plain NumPy
+# arrays and evaluated without sklearn:
+#
+#   models/compiled/gaming_model.npz
+#
+# - Tree models (RandomForest / ExtraTrees / DecisionTree, classifier or
+#   regressor): the nodes of every tree are flattened into shared arrays
+#   (left, right, feature, threshold, leaf value). All rows walk all trees
+#   together, one tree level per step
+# - Linear models (LinearRegression, Ridge, Lasso, ElasticNet,
+#   LogisticRegression): the coefficient vector and intercept
+#
+# Predictions are identical to the pickled estimator's: inputs are cast to
+# float32 like sklearn's trees do, leaf probabilities are normalized the
+# same way and the trees are summed in the same order. Loading needs only
+# NumPy, so a worker never imports sklearn, and a single-row predict skips
+# sklearn's input validation and per-tree dispatch.
+#
+# A compiled model is only used while it is newer than its .pkl; otherwise
+# the pickle is loaded as before. Pickles are read with plain pickle.load
+# (load_pickle), the same way for serving and for compiling, so a model the
+# app can't unpickle is never compiled either.
+#
+# Compile with: python scripts/compile_models.py
+
+import json
+import os
+import pickle
+
+import numpy as np
+
+COMPILED_DIR = 'models/compiled'
+# 2: compiled from pickle.load (format 1 files came from joblib.load and are ignored)
+COMPILED_FORMAT = 2
+
+TREE_MODELS = {
+    'RandomForestClassifier', 'ExtraTreesClassifier', 'DecisionTreeClassifier', 'ExtraTreeClassifier',
+    'RandomForestRegressor', 'ExtraTreesRegressor', 'DecisionTreeRegressor', 'ExtraTreeRegressor',
+}
+LINEAR_MODELS = {'LinearRegression', 'Ridge', 'Lasso', 'ElasticNet', 'LogisticRegression'}
+
+
+class UnsupportedModelError(TypeError):
+    """Estimator type the compiler doesn't handle (keep using the pickle)"""
+
+
+def compiled_path(pkl_path, compiled_dir=COMPILED_DIR):
+    """Compiled file for a pickle ("models/x.pkl" -> "models/compiled/x.npz")"""
+    return os.path.join(compiled_dir, os.path.splitext(os.path.basename(pkl_path))[0] + '.npz')
+
+
+def load_pickle(pkl_path):
+    """The estimator in a .pkl, read with pickle.load as app.py always has"""
+    with open(pkl_path, 'rb') as f:
+        return pickle.load(f)
+
+
+def is_current(path, pkl_path):
+    """True if the compiled model exists and was written after the pickle last changed"""
+    if not os.path.exists(path):
+        return False
+    return not os.path.exists(pkl_path) or os.path.getmtime(path) >= os.path.getmtime(pkl_path)
+
+
+# ============================================================================
+# Compiling (needs the unpickled estimator, so sklearn is imported here)
+# ============================================================================
+
+def _flatten_trees(trees):
+    """Concatenate sklearn Tree objects into one node table
+
+    Child indexes are made global. Leaves point to themselves, so walking
+    max_depth steps from the roots always ends on a leaf.
+    """
+    left, right, feature, threshold, value, roots = [], [], [], [], [], []
+    offset = 0
+    for tree in trees:
+        if tree.n_outputs != 1:
+            raise UnsupportedModelError("Multi-output trees are not supported")
+        nodes = np.arange(tree.node_count)
+        is_leaf = tree.children_left == -1
+        left.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+        right.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(tree.threshold)
+        value.append(tree.value[:, 0, :])
+        roots.append(offset)
+        offset += tree.node_count
+    return {
+        'left': np.concatenate(left).astype(np.int32),
+        'right': np.concatenate(right).astype(np.int32),
+        'feature': np.concatenate(feature).astype(np.int32),
+        'threshold': np.concatenate(threshold).astype(np.float64),
+        'value': np.concatenate(value).astype(np.float64),
+        'roots': np.array(roots, dtype=np.int32),
+        'max_depth': np.array(max(tree.max_depth for tree in trees), dtype=np.int32),
+    }
+
+
+def compile_estimator(estimator):
+    """(meta, arrays) for a fitted estimator; raises UnsupportedModelError"""
+    name = type(estimator).__name__
+    meta = {
+        'format': COMPILED_FORMAT,
+        'estimator': name,
+        'n_features': int(estimator.n_features_in_),
+        'feature_names': [str(f) for f in getattr(estimator, 'feature_names_in_', [])],
+    }
+    is_classifier = hasattr(estimator, 'classes_')
+
+    if name in TREE_MODELS:
+        estimators = getattr(estimator, 'estimators_', [estimator])
+        arrays = _flatten_trees([e.tree_ for e in estimators])
+        if is_classifier:
+            # Leaf probabilities exactly as DecisionTreeClassifier.predict_proba
+            proba = arrays['value']
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            arrays['value'] = proba / normalizer
+            arrays['classes'] = np.asarray(estimator.classes_)
+        meta['kind'] = 'tree_classifier' if is_classifier else 'tree_regressor'
+        return meta, arrays
+
+    if name in LINEAR_MODELS:
+        arrays = {
+            'coef': np.asarray(estimator.coef_, dtype=np.float64),
+            'intercept': np.asarray(estimator.intercept_, dtype=np.float64),
+        }
+        if is_classifier:
+            arrays['classes'] = np.asarray(estimator.classes_)
+        meta['kind'] = 'linear_classifier' if is_classifier else 'linear_regressor'
+        return meta, arrays
+
+    raise UnsupportedModelError(f"Can't compile {name}")
+
+
+def save_compiled(meta, arrays, path):
+    """Write one .npz (replaced as a whole)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, meta=np.array(json.dumps(meta)), **arrays)
+    os.replace(tmp_path, path)
+
+
+# ============================================================================
+# Evaluating (NumPy only)
+# ============================================================================
+
+class _CompiledModel:
+    def __init__(self, meta, arrays):
+        self.meta = meta
+        self.n_features_in_ = meta['n_features']
+        if 'classes' in arrays:
+            self.classes_ = arrays['classes']
+
+    def _check(self, X, dtype):
+        X = np.asarray(X, dtype=dtype)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has {X.shape[-1]} features, but {self.meta['estimator']} "
+                             f"is expecting {self.n_features_in_} features as input")
+        return X
+
+    def __repr__(self):
+        return f"Compiled{self.meta['estimator']}()"
+
+
+class CompiledTrees(_CompiledModel):
+    """Forest (or single tree) as flat node arrays"""
+
+    def __init__(self, meta, arrays):
+        super().__init__(meta, arrays)
+        left, right = arrays['left'].astype(np.intp), arrays['right'].astype(np.intp)
+        # children[2 * node + went_left]: one lookup per step instead of two
+        self.children = np.empty(2 * len(left), dtype=np.intp)
+        self.children[0::2] = right
+        self.children[1::2] = left
+        self.is_leaf = left == np.arange(len(left))
+        self.feature = arrays['feature'].astype(np.intp)
+        self.threshold = arrays['threshold']
+        self.value = arrays['value']
+        self.roots = arrays['roots'].astype(np.intp)
+        self.max_depth = int(arrays['max_depth'])
+        self.is_classifier = meta['kind'] == 'tree_classifier'
+
+    def _leaves(self, X):
+        """Leaf index per (tree, row)"""
+        n_rows, n_trees = len(X), len(self.roots)
+        leaves = np.repeat(self.roots, n_rows)
+        # float32 inputs (as sklearn's trees use them) compared in float64,
+        # like Tree.apply compares them with the float64 thresholds
+        X = X.astype(np.float64).ravel()
+        offsets = np.tile(np.arange(n_rows) * self.n_features_in_, n_trees)
+        # Walk only the (tree, row) pairs that haven't reached a leaf yet
+        active = np.arange(len(leaves))
+        nodes = leaves.copy()
+        for _ in range(self.max_depth):
+            went_left = X[offsets + self.feature[nodes]] <= self.threshold[nodes]
+            nodes = self.children[(nodes << 1) + went_left]
+            done = self.is_leaf[nodes]
+            if done.any():
+                leaves[active[done]] = nodes[done]
+                keep = np.flatnonzero(~done)
+                if not len(keep):
+                    break
+                active, nodes, offsets = active[keep], nodes[keep], offsets[keep]
+        return leaves.reshape(n_trees, n_rows)
+
+    def _mean_value(self, X):
+        leaf_values = self.value[self._leaves(self._check(X, np.float32))]
+        # Summing over the leading (tree) axis adds the trees one after the
+        # other, in the same order as sklearn's forests, so the floats match
+        total = leaf_values.sum(axis=0)
+        total /= len(leaf_values)
+        return total
+
+    def predict_proba(self, X):
+        if not self.is_classifier:
+            raise AttributeError("predict_proba is only available for classifiers")
+        return self._mean_value(X)
+
+    def predict(self, X):
+        values = self._mean_value(X)
+        if self.is_classifier:
+            return self.classes_.take(np.argmax(values, axis=1), axis=0)
+        return values[:, 0]
+
+
+class CompiledLinear(_CompiledModel):
+    """Coefficient vector + intercept"""
+
+    def __init__(self, meta, arrays):
+        super().__init__(meta, arrays)
+        self.coef = arrays['coef']
+        self.intercept = arrays['intercept']
+        self.is_classifier = meta['kind'] == 'linear_classifier'
+
+    def decision_function(self, X):
+        return self._check(X, np.float64) @ self.coef.T + self.intercept
+
+    def predict(self, X):
+        scores = self.decision_function(X)
+        if not self.is_classifier:
+            return scores
+        if scores.shape[1] == 1:
+            scores = scores.reshape(-1)
+        indices = (scores > 0).astype(int) if scores.ndim == 1 else scores.argmax(axis=1)
+        return self.classes_[indices]
+
+
+MODEL_TYPES = {
+    'tree_classifier': CompiledTrees,
+    'tree_regressor': CompiledTrees,
+    'linear_classifier': CompiledLinear,
+    'linear_regressor': CompiledLinear,
+}
+
+
+def load_compiled(path):
+    """Model with sklearn's predict() interface from a compiled .npz"""
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data['meta']))
+        if meta.get('format') != COMPILED_FORMAT:
+            raise ValueError(f"{path}: unsupported compiled model format {meta.get('format')}")
+        arrays = {key: data[key] for key in data.files if key != 'meta'}
+    return MODEL_TYPES[meta['kind']](meta, arrays)
@@ -0,0 +1,206 @@
+# Precomputed Performance Predictions
+# The hardware universe is small (the scores in hardware_lookup.csv, the
+# RAM sizes of the dataset, three resolutions), so the full output of
+# /api/performance/predict can be computed ahead of time for every
+# combination and stored as dense arrays:
+#
+#   models/prediction_table/manifest.json     scores, RAM sizes, resolutions
+#   models/prediction_table/fps.npy           [cpu, gpu, ram, resolution]
+#   models/prediction_table/gaming.npy        [cpu, gpu, ram, resolution] (1 = Excellent)
+#   models/prediction_table/suitability.npy   [cpu, gpu, ram, resolution]
+#   models/prediction_table/bottleneck_pct.npy   [cpu, gpu, ram]
+#   models/prediction_table/bottleneck_type.npy  [cpu, gpu, ram] (index into BOTTLENECK_TYPES)
+#
+# Both axes hold every score in hardware_lookup.csv (the file doesn't say
+# which parts are CPUs). The arrays are memory-mapped, so gunicorn workers
+# share one copy. A build whose scores and RAM are all in the table is a
+# lookup; anything else is predicted live.
+#
+# The manifest records a hash of everything the predictions were computed
+# from: the datasets, the models (pickled and compiled), asset_snapshot.py,
+# compact_dataset.py, fps_lookup.py, model_runtime.py, and the prediction
+# functions and constants of app.py.
+# Only those definitions of app.py count (parsed, without docstrings), so
+# editing a route or a comment elsewhere keeps the table. A table whose
+# inputs have changed since it was built is not used.
+#
+# Build with: python scripts/build_prediction_table.py
+
+import ast
+import hashlib
+import json
+import logging
+import os
+import shutil
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TABLE_DIR = 'models/prediction_table'
+TABLE_FORMAT = 1
+
+BOTTLENECK_TYPES = ['CPU', 'GPU', 'Balanced']
+
+
+def input_fingerprint(paths, definitions=None):
+    """Content hash of the files a table is computed from (missing files
+    count too), plus the named top-level definitions of some source files:
+    {path: [function or constant name, ...]}"""
+    digest = hashlib.sha1()
+    for path in paths:
+        digest.update(path.encode('utf-8') + b'\0')
+        try:
+            with open(path, 'rb') as f:
+                digest.update(hashlib.sha1(f.read()).digest())
+        except OSError:
+            digest.update(b'missing')
+    for path, names in sorted((definitions or {}).items()):
+        digest.update(path.encode('utf-8') + b'\0')
+        for name, code in zip(names, definition_code(path, names)):
+            digest.update(f"{name}={code}".encode('utf-8') + b'\0')
+    return digest.hexdigest()
+
+
+def definition_code(path, names):
+    """Parsed form of top-level functions/assignments of a Python file, one
+    string per name ('missing' if it isn't defined). Comments, formatting
+    and docstrings don't change it."""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    found = {}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            body = node.body
+            if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) \
+                    and isinstance(body[0].value.value, str):
+                node.body = body[1:] or [ast.Pass()]
+            found[node.name] = ast.dump(node)
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    found[target.id] = ast.dump(node.value)
+    return [found.get(name, 'missing') for name in names]
+
+
+def encode_predictions(predictions, n_resolutions):
+    """Arrays for a list of /api/performance/predict bodies (same order)"""
+    count = len(predictions)
+    arrays = {
+        'fps': np.zeros((count, n_resolutions), dtype=np.int32),
+        'gaming': np.zeros((count, n_resolutions), dtype=np.uint8),
+        'suitability': np.zeros((count, n_resolutions), dtype=np.int16),
+        'bottleneck_pct': np.zeros(count, dtype=np.int16),
+        'bottleneck_type': np.zeros(count, dtype=np.uint8),
+    }
+    for i, prediction in enumerate(predictions):
+        results = prediction['results']
+        for r, result in enumerate(results):
+            arrays['fps'][i, r] = result['fps']
+            arrays['gaming'][i, r] = result['gaming_rating'] == 'Excellent'
+            arrays['suitability'][i, r] = result['suitability_score']
+        # The bottleneck is computed once per build (at 1080p)
+        arrays['bottleneck_pct'][i] = results[0]['bottleneck_pct']
+        arrays['bottleneck_type'][i] = BOTTLENECK_TYPES.index(results[0]['bottleneck_type'])
+    return arrays
+
+
+# ============================================================================
+# Writing
+# ============================================================================
+
+def write_table(path, manifest, arrays):
+    """Write the table folder (replaced as a whole)"""
+    tmp_path = path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_path, f'{name}.npy'), array)
+    with open(os.path.join(tmp_path, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump({**manifest, 'format': TABLE_FORMAT}, f, indent=2)
+
+    old_path = path + '.old'
+    shutil.rmtree(old_path, ignore_errors=True)
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+# ============================================================================
+# Reading
+# ============================================================================
+
+class PredictionTable:
+    """Memory-mapped prediction table; lookup() answers like the live path"""
+
+    ARRAYS = ('fps', 'gaming', 'suitability', 'bottleneck_pct', 'bottleneck_type')
+
+    def __init__(self, path=TABLE_DIR):
+        with open(os.path.join(path, 'manifest.json'), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('format') != TABLE_FORMAT:
+            raise ValueError(f"Unsupported prediction table format in {path}: {self.manifest.get('format')}")
+        self.fingerprint = self.manifest['fingerprint']
+        self.resolutions = self.manifest['resolutions']
+        self.score_index = {score: i for i, score in enumerate(self.manifest['scores'])}
+        self.ram_index = {ram: i for i, ram in enumerate(self.manifest['rams'])}
+        # Sorted axes for vectorized lookups
+        self.score_axis = np.array(self.manifest['scores'], dtype=float)
+        self.ram_axis = np.array(self.manifest['rams'], dtype=float)
+        for name in self.ARRAYS:
+            # Plain ndarray views of the memmaps (cheaper to index)
+            setattr(self, name, np.asarray(np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')))
+
+    def __len__(self):
+        return len(self.score_index) ** 2 * len(self.ram_index)
+
+    def lookup_fps(self, c_scores, g_scores, rams):
+        """(fps [build, resolution], found) for arrays of scores and RAM
+        sizes; rows that aren't in the table have found == False"""
+        c, c_found = self._positions(self.score_axis, c_scores)
+        g, g_found = self._positions(self.score_axis, g_scores)
+        r, r_found = self._positions(self.ram_axis, rams)
+        found = c_found & g_found & r_found
+        fps = self.fps[c, g, r].astype(np.int64)
+        fps[~found] = 0
+        return fps, found
+
+    @staticmethod
+    def _positions(axis, values):
+        values = np.asarray(values, dtype=float)
+        positions = np.minimum(np.searchsorted(axis, values), len(axis) - 1)
+        return positions, axis[positions] == values
+
+    def lookup(self, build):
+        """Prediction body for a scored build (see score_build), or None
+        when its scores or RAM size are not in the table"""
+        c = self.score_index.get(build['c_score'])
+        g = self.score_index.get(build['g_score'])
+        r = self.ram_index.get(build['ram'])
+        if c is None or g is None or r is None:
+            return None
+        fps = self.fps[c, g, r].tolist()
+        gaming = self.gaming[c, g, r].tolist()
+        suitability = self.suitability[c, g, r].tolist()
+        bottleneck_pct = int(self.bottleneck_pct[c, g, r])
+        bottleneck_type = BOTTLENECK_TYPES[self.bottleneck_type[c, g, r]]
+        return {
+            "build_info": {
+                "cpu": build['cpu'],
+                "gpu": build['gpu'],
+                "ram": build['ram'],
+                "total_score": int(build['c_score'] + build['g_score'])
+            },
+            "results": [
+                {
+                    "resolution": resolution,
+                    "fps": fps[i],
+                    "gaming_rating": "Excellent" if gaming[i] else "Average",
+                    "suitability_score": suitability[i],
+                    "bottleneck_pct": bottleneck_pct,
+                    "bottleneck_type": bottleneck_type
+                }
+                for i, resolution in enumerate(self.resolutions)
+            ]
+        }
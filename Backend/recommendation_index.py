@@ -0,0 +1,272 @@
+# Recommendation Index for Intelligent Build Mode
+# Built once at startup from final_ruleset_data.csv so that each
+# /api/intelligent/recommend call does a binary search on a pre-sorted
+# partition instead of filtering, copying and sorting the whole dataset.
+#
+# Tie-breaking: when several builds within budget share the best score
+# (and FPS), the answer must be the one the original DataFrame scan picked.
+# That scan sorted with pandas' default (unstable) quicksort, so the tied
+# build it returned depends on all the candidates. Each partition counts
+# ties per budget; a tied lookup repeats the original sorts (same NumPy
+# quicksort calls pandas makes) on just the partition's builds within
+# budget (_scan_order).
+#
+# Each partition also keeps its price/performance Pareto frontiers, so
+# those are answered without sorting per request.
+#
+# Expects the compact dataset layout (compact_dataset.py): partitions are
+# picked by use-case bits and resolution codes, not string comparisons.
+
+import numpy as np
+import pandas as pd
+
+from compact_dataset import use_case_mask
+
+# Ranking strategy for each use case
+# Gaming focuses on GPU, Productivity on CPU, others on combined score
+USE_CASE_LOGIC = {
+    'Gaming': {'filter_col': 'is_good_for_gaming', 'rank_by': 'gpu_score'},
+    'Productivity': {'filter_col': 'is_good_for_productivity', 'rank_by': 'cpu_score'},
+    'Design/Render': {'filter_col': 'is_good_for_design_render', 'rank_by': 'combined_score'},
+    'Workstation': {'filter_col': 'is_good_for_workstation', 'rank_by': 'combined_score'}
+}
+
+
+def _prefix_best(ranks):
+    """For each position of a price-sorted partition: the position of the
+    highest rank seen so far, and how many positions share that rank"""
+    best = np.empty(len(ranks), dtype=np.int64)
+    ties = np.empty(len(ranks), dtype=np.int64)
+    best_position = -1
+    best_rank = None
+    count = 0
+    for i in range(len(ranks)):
+        rank = ranks[i]
+        if best_position < 0 or rank > best_rank:
+            best_position = i
+            best_rank = rank
+            count = 1
+        elif rank == best_rank:
+            count += 1
+        best[i] = best_position
+        ties[i] = count
+    return best, ties
+
+
+def _quicksort_order(values, ascending):
+    """Order pandas' default sort_values (quicksort) gives a NaN-free column"""
+    if ascending:
+        return values.argsort(kind='quicksort')
+    # Descending: pandas sorts the reversed column and reverses the result
+    reverse = np.arange(len(values))[::-1]
+    return reverse[values[::-1].argsort(kind='quicksort')][::-1]
+
+
+def _scan_order(ranks, fps=None, target=None):
+    """Positions (into dataset-ordered arrays) in the order the original
+    per-request DataFrame scan ranked them: the same sorts on the same
+    int64 values, so builds with equal keys come out the same way. With an
+    FPS target only builds that reach it are returned."""
+    ranks = ranks.astype(np.int64)
+    if target is None:
+        return _quicksort_order(ranks, ascending=False)
+    fps = fps.astype(np.int64)
+    meets = np.flatnonzero(fps >= target)
+    fps_diff = abs(fps[meets] - target)
+    # sort_values('fps_diff'), then a (stable) two-column sort of that
+    by_diff = _quicksort_order(fps_diff, ascending=True)
+    order = by_diff[np.lexsort((-ranks[meets][by_diff], fps_diff[by_diff]))]
+    return meets[order]
+
+
+def _pareto_front(prices, values, rows):
+    """(prices, rows) of the Pareto-optimal builds of a price-sorted
+    partition: each one strictly beats every cheaper build on `values`.
+    One sweep; among equal prices the highest value (then earliest row) counts."""
+    front_prices = []
+    front_rows = []
+    best_value = None
+    i = 0
+    n = len(prices)
+    while i < n:
+        # Best build among those sharing this price
+        j = i
+        pick = i
+        while j < n and prices[j] == prices[i]:
+            if values[j] > values[pick] or (values[j] == values[pick] and rows[j] < rows[pick]):
+                pick = j
+            j += 1
+        if best_value is None or values[pick] > best_value:
+            best_value = values[pick]
+            front_prices.append(prices[pick])
+            front_rows.append(rows[pick])
+        i = j
+    return np.array(front_prices, dtype=prices.dtype), np.array(front_rows, dtype=np.int64)
+
+
+class _PricePartition:
+    """A set of builds sorted by price, with the best build for every budget"""
+
+    def __init__(self, rows, prices, rank_values):
+        # Sort by price, keeping dataset order for equal prices
+        order = np.lexsort((rows, prices))
+        self.order = order
+        self.rows = rows[order]
+        self.prices = prices[order]
+        self.ranks = rank_values[order]
+        best, self.ties = _prefix_best(self.ranks)
+        self.best = self.rows[best]
+
+    def count_within(self, budget):
+        """Number of builds with price <= budget"""
+        return int(np.searchsorted(self.prices, budget, side='right'))
+
+    def unique_best_within(self, budget):
+        """Row of the best build with price <= budget, or None if there is
+        no such build or several share the best rank"""
+        n = self.count_within(budget)
+        if n == 0 or self.ties[n - 1] > 1:
+            return None
+        return int(self.best[n - 1])
+
+
+class _Partition(_PricePartition):
+    """All builds for one (use case, resolution) pair"""
+
+    def __init__(self, rows, prices, rank_values, fps_values, with_fps_levels):
+        super().__init__(rows, prices, rank_values)
+        self.min_price = int(self.prices[0])
+
+        # Running max FPS over the price-sorted builds (for error messages)
+        self.fps = fps_values[self.order]
+        self.max_fps = np.maximum.accumulate(self.fps)
+        # Price-sorted positions in dataset order (the scan's row order)
+        self.by_row = np.argsort(self.rows)
+
+        # Pareto frontiers (price vs. score, price vs. FPS)
+        self.fronts = {
+            'score': _pareto_front(self.prices, self.ranks, self.rows),
+            'fps': _pareto_front(self.prices, self.fps, self.rows),
+        }
+
+        # Secondary structure for FPS targets: one price partition per
+        # distinct FPS value, sorted by FPS
+        self.fps_levels = None
+        if with_fps_levels:
+            levels = np.unique(fps_values)
+            self.fps_levels = levels
+            self.level_partitions = []
+            for level in levels:
+                mask = fps_values == level
+                self.level_partitions.append(
+                    _PricePartition(rows[mask], prices[mask], rank_values[mask])
+                )
+            self.level_min_price = np.array([p.prices[0] for p in self.level_partitions])
+
+    def max_fps_within(self, budget):
+        return self.max_fps[self.count_within(budget) - 1]
+
+    def ranking(self, budget, fps=None):
+        """Rows within budget (reaching the FPS target, if given) in the
+        original scan's ranking order. Sorts them, so only used for ties
+        and top-K lists (a NumPy array)."""
+        by_row = self.by_row[self.by_row < self.count_within(budget)]
+        order = _scan_order(self.ranks[by_row], self.fps[by_row], fps)
+        return self.rows[by_row[order]]
+
+    def best_within(self, budget):
+        """Row of the best build with price <= budget, or None"""
+        if self.count_within(budget) == 0:
+            return None
+        row = self.unique_best_within(budget)
+        return row if row is not None else int(self.ranking(budget)[0])
+
+    def best_for_fps(self, budget, fps):
+        """Row of the build closest to (but not below) the FPS target
+        within budget, or None if no build reaches the target"""
+        start = int(np.searchsorted(self.fps_levels, fps, side='left'))
+        # The lowest FPS level that has any build within budget is the
+        # closest match to the target
+        affordable = np.nonzero(self.level_min_price[start:] <= budget)[0]
+        if len(affordable) == 0:
+            return None
+        row = self.level_partitions[start + affordable[0]].unique_best_within(budget)
+        return row if row is not None else int(self.ranking(budget, fps)[0])
+
+    def top_within(self, budget, k):
+        """Rows of the k best builds within budget (first one = best_within)"""
+        return [int(row) for row in self.ranking(budget)[:k]]
+
+    def top_for_fps(self, budget, fps, k):
+        """Rows of the k builds closest to (not below) the FPS target within
+        budget, best score first among equal FPS (first one = best_for_fps)"""
+        return [int(row) for row in self.ranking(budget, fps)[:k]]
+
+    def fps_level_for(self, fps):
+        """Lowest FPS level that meets the target (None if none does); all
+        targets with the same level get the same answers"""
+        start = int(np.searchsorted(self.fps_levels, fps, side='left'))
+        return int(self.fps_levels[start]) if start < len(self.fps_levels) else None
+
+    def budget_curve(self, fps=None):
+        """Best build for every budget as a step function: [(min_budget, row)]
+        where row is the answer for budgets from min_budget up to the next step.
+
+        The answer can only change where a price is first reached, so it is
+        looked up once per distinct price with the same single-budget
+        lookups (best_within / best_for_fps)."""
+        steps = []
+        ends = np.append(np.flatnonzero(np.diff(self.prices)) + 1, len(self.prices))
+        for end in ends:
+            price = int(self.prices[end - 1])
+            row = self.best_within(price) if fps is None else self.best_for_fps(price, fps)
+            if row is not None and (not steps or steps[-1][1] != row):
+                steps.append((price, row))
+        return steps
+
+    def pareto_within(self, budget, metric='score'):
+        """Rows of the builds within budget that no cheaper (or equally
+        priced) build beats on `metric` ('score' or 'fps'), cheapest first"""
+        front_prices, front_rows = self.fronts[metric]
+        n = int(np.searchsorted(front_prices, budget, side='right'))
+        return [int(row) for row in front_rows[:n]]
+
+
+class RecommendationIndex:
+    """Pre-sorted partitions of the build dataset, one per (use case, resolution)"""
+
+    def __init__(self, df):
+        self.df = df
+        self.partitions = {}
+        self.resolutions = {}
+
+        rows = np.arange(len(df))
+        prices = df['price'].to_numpy()
+        fps_values = df['fps'].to_numpy()
+        rank_columns = {
+            'gpu_score': df['gpu_score'].to_numpy(),
+            'cpu_score': df['cpu_score'].to_numpy(),
+            'combined_score': (df['cpu_score'] + df['gpu_score']).to_numpy(),
+        }
+        resolution_codes = df['resolution'].cat.codes.to_numpy()
+        resolution_names = df['resolution'].cat.categories
+
+        for use_case, logic in USE_CASE_LOGIC.items():
+            in_use_case = use_case_mask(df, logic['filter_col'])
+            # Resolutions in order of first appearance (used in suggestions)
+            codes = [code for code in pd.unique(resolution_codes[in_use_case]) if code >= 0]
+            self.resolutions[use_case] = [resolution_names[code] for code in codes]
+            rank_values = rank_columns[logic['rank_by']]
+
+            for code, resolution in zip(codes, self.resolutions[use_case]):
+                mask = in_use_case & (resolution_codes == code)
+                self.partitions[(use_case, resolution)] = _Partition(
+                    rows[mask], prices[mask], rank_values[mask], fps_values[mask],
+                    with_fps_levels=(use_case == 'Gaming')
+                )
+
+    def available_resolutions(self, use_case):
+        return self.resolutions.get(use_case, [])
+
+    def partition(self, use_case, resolution):
+        return self.partitions.get((use_case, resolution))
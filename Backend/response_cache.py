@@ -0,0 +1,176 @@
+# Response Cache for the deterministic API endpoints
+# /api/intelligent/recommend and /api/performance/predict(/batch) always
+# return the same answer for the same inputs and the same loaded
+# data/models, so computed responses are cached:
+#
+# - In-process LRU (bounded by number of entries)
+# - Optional shared SQLite file (RESPONSE_CACHE_PATH) so all gunicorn
+#   workers on a machine reuse each other's results
+#
+# Keys are canonical tuples built by the caller (ints for budget/RAM/FPS,
+# hardware scores instead of raw names). Every entry is stored with the
+# version tag of the data/models it was computed from; an entry whose tag
+# differs from the current one is dropped on lookup, so reloading a CSV
+# or model invalidates the affected responses automatically.
+#
+# Cached values are shared between requests - callers must not modify them.
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 4096
+
+# Shared-file entries kept before the oldest are pruned
+DEFAULT_SHARED_SIZE = 100000
+
+
+class SQLiteCacheBackend:
+    """Cache entries in a local SQLite file shared by worker processes"""
+
+    def __init__(self, path, max_entries=DEFAULT_SHARED_SIZE):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, version TEXT NOT NULL, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+
+    @property
+    def conn(self):
+        # One connection per thread; WAL lets workers read while one writes
+        if getattr(self._local, 'conn', None) is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+        return self._local.conn
+
+    def get(self, key):
+        """(version, value) or None"""
+        row = self.conn.execute("SELECT version, value FROM responses WHERE key = ?", (key,)).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def put(self, key, version, value):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, version, value, stored_at) VALUES (?, ?, ?, ?)",
+                (key, version, json.dumps(value), time.time())
+            )
+        self._writes += 1
+        if self._writes % 1000 == 0:
+            self.prune()
+
+    def prune(self):
+        """Drop the oldest entries beyond max_entries"""
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                "ORDER BY stored_at DESC LIMIT -1 OFFSET ?)", (self.max_entries,)
+            )
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM responses")
+
+
+class ResponseCache:
+    """Bounded LRU of computed responses, tagged with a data/model version"""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE, shared=None):
+        self.maxsize = maxsize
+        self.shared = shared
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    @staticmethod
+    def make_key(*parts):
+        """Canonical string key (also used by the shared backend)"""
+        return json.dumps(parts, separators=(',', ':'))
+
+    def get(self, key, version):
+        """Cached value for key computed under `version`, or None"""
+        if not self.maxsize:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == version:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                # Computed from data/models that have since been reloaded
+                del self._entries[key]
+                self.stale += 1
+
+        if self.shared is not None:
+            try:
+                entry = self.shared.get(key)
+            except sqlite3.Error as e:
+                logger.warning("Shared response cache read failed: %s", e)
+                entry = None
+            if entry is not None and entry[0] == version:
+                self._store(key, version, entry[1])
+                with self._lock:
+                    self.shared_hits += 1
+                return entry[1]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, version, value):
+        if not self.maxsize:
+            return
+        self._store(key, version, value)
+        if self.shared is not None:
+            try:
+                self.shared.put(key, version, value)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning("Shared response cache write failed: %s", e)
+
+    def get_or_compute(self, key, version, compute):
+        value = self.get(key, version)
+        if value is None:
+            value = compute()
+            self.put(key, version, value)
+        return value
+
+    def _store(self, key, version, value):
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'shared': self.shared.path if self.shared is not None else None,
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'stale': self.stale,
+                'hit_rate': round((self.hits + self.shared_hits) / lookups, 4) if lookups else None,
+            }
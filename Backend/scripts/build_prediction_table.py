@@ -0,0 +1,135 @@
+# Build the precomputed prediction table (see prediction_table.py)
+#
+# Run from the Backend folder after changing the datasets, the models or
+# the prediction code in app.py:
+#   python scripts/build_prediction_table.py                  # -> models/prediction_table/
+#   python scripts/build_prediction_table.py --workers 8      # process pool size
+#   python scripts/build_prediction_table.py --out /tmp/table # somewhere else
+#
+# Every combination is computed by app.py's own live prediction code, one
+# CPU score per task, spread over a process pool. The datasets and models
+# are loaded once before the pool starts, so forked workers share them.
+# Afterwards a random sample of combinations is predicted live again and
+# must match the table exactly, otherwise nothing is written.
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+# The live path only: no existing table, no cached responses
+os.environ['PREDICTION_TABLE'] = 'off'
+os.environ['RESPONSE_CACHE_SIZE'] = '0'
+os.environ.pop('RESPONSE_CACHE_PATH', None)
+os.environ.setdefault('ASSET_LOADING', 'lazy')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+import multiprocessing  # noqa: E402
+
+import numpy as np  # noqa: E402
+
+import app  # noqa: E402
+from prediction_table import (  # noqa: E402
+    TABLE_DIR, PredictionTable, encode_predictions, write_table,
+)
+
+DEFAULT_SAMPLE = 2000
+
+
+def table_axes():
+    """(scores, rams): every score in hardware_lookup.csv, every RAM size in the dataset"""
+    scores = sorted({int(score) for score in app.assets.get('hw_db').values() if score})
+    rams = sorted(int(ram) for ram in app.assets.get('intelligent_df')['ram_gb'].unique())
+    return scores, rams
+
+
+def scored_build(c_score, g_score, ram):
+    return {"cpu": "", "gpu": "", "ram": ram, "c_score": c_score, "g_score": g_score}
+
+
+def predict_cpu_row(args):
+    """Arrays for one CPU score x every GPU score x every RAM size"""
+    c_score, scores, rams = args
+    builds = [scored_build(c_score, g_score, ram) for g_score in scores for ram in rams]
+    return encode_predictions(app._predict_uncached(builds), len(app.PREDICTION_RESOLUTIONS))
+
+
+def build(scores, rams, workers):
+    n_scores, n_rams, n_res = len(scores), len(rams), len(app.PREDICTION_RESOLUTIONS)
+    tasks = [(c_score, scores, rams) for c_score in scores]
+    # fork shares the loaded datasets/models with the workers; elsewhere
+    # each worker imports app.py (lazy loading) and loads what it needs
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        rows = list(pool.map(predict_cpu_row, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+    shapes = {'fps': (n_res,), 'gaming': (n_res,), 'suitability': (n_res,), 'bottleneck_pct': (), 'bottleneck_type': ()}
+    return {
+        name: np.stack([row[name] for row in rows]).reshape((n_scores, n_scores, n_rams) + shape)
+        for name, shape in shapes.items()
+    }
+
+
+def verify(path, scores, rams, sample):
+    """Combinations where the table differs from a fresh live prediction"""
+    table = PredictionTable(path)
+    rng = random.Random(0)
+    builds = [scored_build(rng.choice(scores), rng.choice(scores), rng.choice(rams)) for _ in range(sample)]
+    live = app._predict_uncached(builds)
+    return [b for b, expected in zip(builds, live) if table.lookup(b) != expected]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute /api/performance/predict for every known CPU x GPU x RAM")
+    parser.add_argument('--out', default=os.environ.get('PREDICTION_TABLE_DIR', TABLE_DIR),
+                        help=f"Output folder (default {TABLE_DIR})")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Worker processes (default: CPU count)")
+    parser.add_argument('--sample', type=int, default=DEFAULT_SAMPLE,
+                        help=f"Combinations re-predicted live to verify the table (default {DEFAULT_SAMPLE})")
+    args = parser.parse_args()
+
+    # Load everything the prediction code uses before forking
+    fingerprint = app.prediction_table_fingerprint()
+    for name in ('fps_lookup_index', 'fps_nearest_index', 'fps_model', 'gaming_model'):
+        app.assets.get(name)
+    scores, rams = table_axes()
+    print(f"  {len(scores)} scores x {len(scores)} scores x {len(rams)} RAM sizes "
+          f"({len(scores) ** 2 * len(rams)} builds), {args.workers} workers")
+
+    start = time.perf_counter()
+    arrays = build(scores, rams, args.workers)
+    seconds = time.perf_counter() - start
+    manifest = {
+        'fingerprint': fingerprint,
+        'inputs': app.PREDICTION_TABLE_INPUTS,
+        'code': app.PREDICTION_TABLE_CODE,
+        'scores': scores,
+        'rams': rams,
+        'resolutions': [res['name'] for res in app.PREDICTION_RESOLUTIONS],
+    }
+
+    # Verify a copy before replacing the live table
+    tmp_path = args.out + '.check'
+    write_table(tmp_path, manifest, arrays)
+    mismatches = verify(tmp_path, scores, rams, args.sample)
+    if mismatches:
+        print(f"FAILED: {len(mismatches)} of {args.sample} sampled builds differ from live predictions, "
+              f"e.g. {mismatches[0]}")
+        sys.exit(1)
+    shutil.rmtree(args.out, ignore_errors=True)
+    os.replace(tmp_path, args.out)
+    size = sum(array.nbytes for array in arrays.values())
+    print(f"  Built in {seconds:.1f}s, {size / 1024:.0f} KB, {args.sample} sampled builds match live predictions")
+    print(f"SUCCESS: Prediction table written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# Catalog snapshot tool for the local Manual Build store
+#
+# Copies the Firestore catalog collections into a SQLite component store
+# (see component_store.py) so Manual Build can run without Firebase, and
+# moves snapshots in and out as plain JSON for air-gapped machines.
+#
+# Run from the Backend folder:
+#   python scripts/catalog_snapshot.py snapshot                 # Firestore -> data/catalog.sqlite
+#   python scripts/catalog_snapshot.py export-json catalog.json # SQLite -> JSON
+#   python scripts/catalog_snapshot.py import-json catalog.json # JSON -> SQLite
+#
+# The SQLite file is written next to the target and swapped in atomically,
+# so running servers never see a half-written catalog. Call
+# POST /api/manual/cache/invalidate afterwards to make them reopen it.
+
+import argparse
+import json
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+from component_store import COLLECTIONS, FirestoreStore, SQLiteStore  # noqa: E402
+
+DEFAULT_DB = os.environ.get('CATALOG_SQLITE_PATH', 'data/catalog.sqlite')
+
+
+def write_store(path, catalog):
+    """Write {collection: [docs]} to a new SQLite file and swap it into place"""
+    tmp_path = path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    store = SQLiteStore(tmp_path, read_only=False)
+    for collection, docs in catalog.items():
+        store.replace_collection(collection, docs)
+        print(f"  {collection}: {len(docs)} documents")
+    store.conn.execute("ANALYZE")
+    store.conn.close()
+    os.replace(tmp_path, path)
+    print(f"SUCCESS: Catalog written to {path}")
+
+
+def snapshot(args):
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+
+    firebase_admin.initialize_app(credentials.Certificate(args.credentials))
+    store = FirestoreStore(firestore.client())
+    catalog = {collection: store.documents(collection) for collection in COLLECTIONS}
+    write_store(args.db, catalog)
+
+
+def export_json(args):
+    store = SQLiteStore(args.db)
+    catalog = {collection: store.all(collection) for collection in COLLECTIONS}
+    with open(args.file, 'w', encoding='utf-8') as f:
+        json.dump(catalog, f, indent=2)
+    print(f"SUCCESS: Catalog exported to {args.file}")
+
+
+def import_json(args):
+    with open(args.file, encoding='utf-8') as f:
+        catalog = json.load(f)
+    write_store(args.db, catalog)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot the Manual Build catalog into a local SQLite store")
+    parser.add_argument('--db', default=DEFAULT_DB, help=f"SQLite catalog path (default {DEFAULT_DB})")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    cmd = commands.add_parser('snapshot', help="Copy Firestore collections into the SQLite store")
+    cmd.add_argument('--credentials', default='serviceAccountKey.json')
+    cmd.set_defaults(func=snapshot)
+
+    cmd = commands.add_parser('export-json', help="Write the SQLite store to a JSON file")
+    cmd.add_argument('file')
+    cmd.set_defaults(func=export_json)
+
+    cmd = commands.add_parser('import-json', help="Replace the SQLite store with a JSON file")
+    cmd.add_argument('file')
+    cmd.set_defaults(func=import_json)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
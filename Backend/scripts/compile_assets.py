@@ -0,0 +1,39 @@
+# Compile the CSV datasets into binary snapshots (see asset_snapshot.py)
+#
+# Run from the Backend folder after changing anything in data/:
+#   python scripts/compile_assets.py                   # -> models/snapshot/
+#   python scripts/compile_assets.py --out /tmp/snap   # somewhere else
+#
+# app.py picks the snapshot up automatically while it is newer than the
+# CSV it came from (set ASSET_SNAPSHOT=off to always read the CSVs).
+
+import argparse
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+from asset_snapshot import SNAPSHOT_DIR, compile_csv  # noqa: E402
+
+DATASETS = ['data/final_ruleset_data.csv', 'data/hardware_lookup.csv']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the CSV datasets into memory-mappable snapshots")
+    parser.add_argument('--out', default=os.environ.get('ASSET_SNAPSHOT_DIR', SNAPSHOT_DIR),
+                        help=f"Snapshot folder (default {SNAPSHOT_DIR})")
+    parser.add_argument('csv', nargs='*', default=DATASETS, help="CSV files to compile (default: all datasets)")
+    args = parser.parse_args()
+
+    for csv_path in args.csv:
+        path, manifest = compile_csv(csv_path, args.out)
+        categorical = [c['name'] for c in manifest['columns'] if c['kind'] == 'categorical']
+        print(f"  {csv_path}: {manifest['rows']} rows, {len(manifest['columns'])} columns "
+              f"(categorical: {', '.join(categorical) or 'none'}) -> {path}")
+    print(f"SUCCESS: Snapshots written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
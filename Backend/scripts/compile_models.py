@@ -0,0 +1,125 @@
+# Compile the sklearn models into NumPy-only files (see model_runtime.py)
+#
+# Run from the Backend folder after replacing anything in models/:
+#   python scripts/compile_models.py                      # -> models/compiled/
+#   python scripts/compile_models.py --out /tmp/compiled  # somewhere else
+#
+# Every compiled model is checked against the pickle before it is written:
+# predictions must be identical on the dataset's feature rows, on random
+# rows across the feature ranges and on rows that sit exactly on split
+# thresholds (where a float32 rounding difference would show). A model that fails the
+# check, or can't be compiled, is skipped and keeps loading from its pickle.
+# So is one that plain pickle.load can't read: the app can't load it either,
+# and compiling it would switch on a model the app doesn't use.
+#
+# app.py picks the compiled models up automatically while they are newer
+# than their .pkl (set COMPILED_MODELS=off to always unpickle).
+
+import argparse
+import os
+import sys
+import warnings
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from model_runtime import (  # noqa: E402
+    COMPILED_DIR, CompiledTrees, UnsupportedModelError, compile_estimator, compiled_path, load_compiled, load_pickle,
+    save_compiled,
+)
+
+MODELS = ['models/fps_model.pkl', 'models/gaming_model.pkl', 'models/render_model.pkl']
+DATASET = 'data/final_ruleset_data.csv'
+RESOLUTION_FPS_MULTIPLIERS = [1.0, 0.65, 0.42]  # 1080p, 1440p, 4K (as in app.py)
+
+
+def dataset_features(path=DATASET):
+    """(cpu_score, gpu_score, ram_gb, multiplier) rows like the app builds them"""
+    df = pd.read_csv(path)
+    scores = df[['cpu_score', 'gpu_score', 'ram_gb']].to_numpy(dtype=float)
+    return np.vstack([np.column_stack([scores, np.full(len(scores), m)]) for m in RESOLUTION_FPS_MULTIPLIERS])
+
+
+def parity_inputs(model, base, n_random=20000, seed=0):
+    """Rows to compare on: the dataset, random rows spanning its ranges,
+    and rows that sit exactly on split thresholds"""
+    rng = np.random.default_rng(seed)
+    low, high = base.min(axis=0), base.max(axis=0)
+    rows = [base, rng.uniform(low - 0.1 * (high - low), high + 0.1 * (high - low), size=(n_random, base.shape[1]))]
+    if isinstance(model, CompiledTrees):
+        internal = np.flatnonzero(~model.is_leaf)
+        picks = rng.choice(internal, size=min(n_random, len(internal)), replace=False)
+        on_split = base[rng.integers(len(base), size=len(picks))].copy()
+        on_split[np.arange(len(picks)), model.feature[picks]] = model.threshold[picks]
+        rows.append(on_split)
+    return np.vstack(rows)
+
+
+def check_parity(estimator, compiled, X):
+    """Number of rows where the compiled model disagrees with the pickle"""
+    with warnings.catch_warnings():
+        # Pickles fitted on DataFrames warn about plain arrays
+        warnings.simplefilter('ignore', UserWarning)
+        expected = estimator.predict(X)
+        mismatches = int(np.sum(compiled.predict(X) != expected))
+        if isinstance(compiled, CompiledTrees) and compiled.is_classifier:
+            # Forests with n_jobs sum their trees in thread completion order,
+            # so probabilities can differ from run to run in the last bit
+            proba_differs = ~np.isclose(compiled.predict_proba(X), estimator.predict_proba(X), rtol=0, atol=1e-12)
+            mismatches += int(np.sum(np.any(proba_differs, axis=1)))
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the sklearn models into NumPy-only files")
+    parser.add_argument('--out', default=os.environ.get('COMPILED_MODEL_DIR', COMPILED_DIR),
+                        help=f"Output folder (default {COMPILED_DIR})")
+    parser.add_argument('pkl', nargs='*', default=MODELS, help="Pickled models to compile (default: all models)")
+    args = parser.parse_args()
+
+    base = dataset_features()
+    failed = False
+    for pkl_path in args.pkl:
+        if not os.path.exists(pkl_path):
+            print(f"  {pkl_path}: not found, skipped")
+            continue
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                estimator = load_pickle(pkl_path)
+        except Exception as e:
+            print(f"  {pkl_path}: can't be unpickled ({e}), skipped")
+            continue
+        try:
+            meta, arrays = compile_estimator(estimator)
+        except UnsupportedModelError as e:
+            print(f"  {pkl_path}: {e}, skipped (the pickle stays in use)")
+            continue
+
+        path = compiled_path(pkl_path, args.out)
+        tmp_path = path + '.check.npz'
+        save_compiled(meta, arrays, tmp_path)
+        compiled = load_compiled(tmp_path)
+        X = parity_inputs(compiled, base)
+        mismatches = check_parity(estimator, compiled, X)
+        if mismatches:
+            os.remove(tmp_path)
+            failed = True
+            print(f"  {pkl_path}: FAILED parity check ({mismatches} of {len(X)} rows differ), not written")
+            continue
+        os.replace(tmp_path, path)
+        print(f"  {pkl_path}: {meta['estimator']} ({meta['kind']}), {len(X)} rows identical, "
+              f"{os.path.getsize(path) / 1024:.0f} KB -> {path}")
+
+    if failed:
+        print("FAILED: Some models did not match their pickle")
+        sys.exit(1)
+    print(f"SUCCESS: Compiled models written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
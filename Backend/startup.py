@@ -0,0 +1,377 @@
+# Startup Asset Loader
+# Datasets, indexes, ML models and the Firebase client are registered as
+# named assets with their dependencies. They can be loaded:
+#
+# - eager:      all at once in a thread pool, waiting until done (default)
+# - background: all at once in a thread pool, serving requests meanwhile
+#               (a request that needs an asset waits for just that asset)
+# - lazy:       each asset on first use
+#
+# Per-asset status and load timings are reported by /readyz.
+#
+# Every loaded asset also gets a version tag: a hash of its source files
+# (path, size, mtime) and of its dependencies' tags. Processes that load
+# the same files agree on the tag, so it can key caches shared between
+# gunicorn workers.
+#
+# Hot reload: reload() loads fresh copies of assets (and of everything
+# that depends on them) next to the live ones and swaps the whole set in
+# at once. A request pins the set that was live when it started (pin() /
+# unpin()), so it never mixes old and new data; the old set is freed when
+# the last request using it finishes. If a fresh copy of a working asset
+# fails to load, nothing is swapped. watch() reloads automatically when
+# source files change.
+#
+# Assets marked per_process (e.g. the Firebase client) are never shared
+# across fork(): a gunicorn worker that inherits one from a preloading
+# master loads its own copy on first use. Everything else is loaded once
+# in the master and shared copy-on-write by the workers (see wsgi.py,
+# which loads only the shared assets before fork).
+
+import hashlib
+import itertools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+LOADING_MODES = ('eager', 'background', 'lazy')
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+LOADING = 'loading'
+READY = 'ready'
+FAILED = 'failed'
+
+
+class _Asset:
+    def __init__(self, name, loader, depends_on, required, per_process, sources):
+        self.name = name
+        self.loader = loader
+        self.depends_on = list(depends_on)
+        self.required = required
+        self.per_process = per_process
+        self.sources = list(sources)
+        self.reset()
+
+    def reset(self):
+        self.state = PENDING
+        self.value = None
+        self.error = None
+        self.seconds = None
+        self.pid = None
+        self.version = None
+        self.fingerprint = None
+        self.done = threading.Event()
+
+    def fresh_copy(self):
+        """Same registration, not loaded yet"""
+        return _Asset(self.name, self.loader, self.depends_on, self.required, self.per_process, self.sources)
+
+
+def _file_fingerprint(path):
+    try:
+        stat = os.stat(path)
+        return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+    except OSError:
+        return f"{path}:missing"
+
+
+def _hash(parts):
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:12]
+
+
+class AssetLoader:
+    """Loads named assets concurrently or on demand, and reloads them live"""
+
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        # Live asset set; replaced as a whole on reload, never edited in place
+        self._assets = {}
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._local = threading.local()
+        self._pool = None
+        self._set_counter = itertools.count(1)
+        self._swap_callbacks = []
+        self._watcher_pid = None
+        self._rejected = {}
+        self.generation = 1
+        self.last_reload = None
+
+    def register(self, name, loader, depends_on=(), required=False, per_process=False, sources=()):
+        """loader(*dependency_values) returns the asset value or raises;
+        sources are the files it reads (version tag and change detection)"""
+        self._assets[name] = _Asset(name, loader, depends_on, required, per_process, sources)
+
+    def names(self, per_process=None):
+        """Registered asset names; per_process=True/False keeps only the
+        per-process / only the shared ones"""
+        return [name for name, asset in self._assets.items()
+                if per_process is None or asset.per_process == per_process]
+
+    # ------------------------------------------------------------------
+    # Per-request view
+    # ------------------------------------------------------------------
+
+    def pin(self):
+        """Serve this thread from the current asset set until unpin()"""
+        self._local.assets = self._assets
+
+    def unpin(self):
+        self._local.assets = None
+
+    def _view(self):
+        return getattr(self._local, 'assets', None) or self._assets
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _claim(self, asset):
+        with self._lock:
+            if asset.per_process and asset.pid not in (None, os.getpid()):
+                asset.reset()  # inherited through fork - load again here
+            if asset.state != PENDING:
+                return False
+            asset.state = LOADING
+            asset.pid = os.getpid()
+            return True
+
+    def _run(self, asset, view):
+        values = [self._get_from(view, dep) for dep in asset.depends_on]
+        # Fingerprint before reading, so a file changed mid-load gets a new tag later
+        asset.fingerprint = [_file_fingerprint(path) for path in asset.sources]
+        asset.version = _hash(asset.fingerprint + [view[dep].version or '' for dep in asset.depends_on])
+        start = time.perf_counter()
+        try:
+            asset.value = asset.loader(*values)
+            asset.state = READY
+        except Exception as e:
+            asset.error = str(e)
+            asset.state = FAILED
+            logger.error("Loading '%s' failed: %s", asset.name, e)
+        asset.seconds = time.perf_counter() - start
+        asset.done.set()
+        self._schedule_dependents(asset)
+
+    def _load_if_pending(self, asset):
+        if self._claim(asset):
+            self._run(asset, self._assets)
+
+    def _schedule_dependents(self, asset):
+        if self._pool is None:
+            return
+        assets = self._assets
+        for other in assets.values():
+            if asset.name in other.depends_on and other.state == PENDING and all(
+                assets[dep].done.is_set() for dep in other.depends_on
+            ):
+                self._pool.submit(self._load_if_pending, other)
+
+    def start(self, names=None):
+        """Start loading in the background (all assets unless names are given)"""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='asset-loader')
+        assets = self._assets
+        for name in names or list(assets):
+            asset = assets[name]
+            if all(assets[dep].done.is_set() for dep in asset.depends_on):
+                self._pool.submit(self._load_if_pending, asset)
+            else:
+                # Dependencies go first; this one is submitted when they finish
+                self.start(asset.depends_on)
+
+    def wait(self, names=None, timeout=None):
+        """Block until the given assets (default: all) have finished loading"""
+        assets = self._assets
+        for name in names or list(assets):
+            if not assets[name].done.wait(timeout):
+                return False
+        return True
+
+    def load(self, mode='eager', names=None):
+        """Load according to one of LOADING_MODES"""
+        if mode not in LOADING_MODES:
+            raise ValueError(f"Unknown loading mode '{mode}'. Choose from {LOADING_MODES}")
+        if mode == 'lazy':
+            return
+        self.start(names)
+        if mode == 'eager':
+            self.wait(names)
+            # No threads left behind for a preloading master to fork
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def _get_from(self, view, name):
+        asset = view[name]
+        if self._claim(asset):
+            self._run(asset, view)
+        asset.done.wait()
+        return asset.value
+
+    def get(self, name):
+        """Value of an asset, loading it now if nobody has started it (None if it failed)"""
+        return self._get_from(self._view(), name)
+
+    def peek(self, name):
+        """Value of an asset if it has loaded, without ever loading it"""
+        asset = self._view().get(name)
+        return asset.value if asset is not None and asset.state == READY else None
+
+    def set(self, name, value):
+        """Replace an asset's value directly (benchmarks, scripts)"""
+        asset = self._assets[name]
+        with self._lock:
+            asset.value = value
+            asset.state = READY
+            asset.error = None
+            asset.pid = os.getpid()
+            asset.version = f"set-{os.getpid()}-{next(self._set_counter)}"
+            asset.done.set()
+
+    def version(self, *names):
+        """Combined version tag of the given assets (loading them if needed)"""
+        view = self._view()
+        for name in names:
+            self._get_from(view, name)
+        return _hash([f"{name}={view[name].version}" for name in names])
+
+    # ------------------------------------------------------------------
+    # Hot reload
+    # ------------------------------------------------------------------
+
+    def on_swap(self, callback):
+        """callback(reloaded_names) runs after every successful reload"""
+        self._swap_callbacks.append(callback)
+
+    def _with_dependents(self, names):
+        """names plus everything that (indirectly) depends on them,
+        dependencies before dependents"""
+        found = list(names)
+        for name in found:
+            for other in self._assets.values():
+                if name in other.depends_on and other.name not in found:
+                    found.append(other.name)
+
+        depths = {}
+
+        def depth(name):
+            if name not in depths:
+                depths[name] = 1 + max((depth(dep) for dep in self._assets[name].depends_on), default=0)
+            return depths[name]
+        return sorted(found, key=depth)
+
+    def reload(self, names=None):
+        """Load fresh copies of the given assets (default: every asset with
+        source files) and their dependents, then swap them in together.
+        Returns {name: error} for fresh copies that failed; if one of them
+        replaced a working asset, nothing is swapped."""
+        with self._reload_lock:
+            current = self._assets
+            requested = list(names) if names else [n for n, a in current.items() if a.sources]
+            unknown = [n for n in requested if n not in current]
+            if unknown:
+                return {n: 'unknown asset' for n in unknown}
+            targets = self._with_dependents(requested)
+
+            fresh = dict(current)
+            for name in targets:
+                fresh[name] = current[name].fresh_copy()
+
+            start = time.perf_counter()
+            errors = {}
+            for name in targets:
+                # Assets nobody has used yet (lazy mode) stay lazy
+                if current[name].state == PENDING and name not in requested:
+                    continue
+                asset = fresh[name]
+                if self._claim(asset):
+                    self._run(asset, fresh)
+                if asset.state == FAILED:
+                    errors[name] = asset.error
+            # Failing again where the old copy failed too is not a regression
+            blocking = {n: e for n, e in errors.items() if current[n].state == READY}
+
+            self.last_reload = {
+                'assets': targets,
+                'seconds': round(time.perf_counter() - start, 4),
+                'errors': errors,
+                'swapped': not blocking,
+                'at': time.time(),
+            }
+            if blocking:
+                logger.error("Reload failed, keeping the current assets: %s", blocking)
+                # Don't retry the same broken files on every watcher poll
+                for name in requested:
+                    self._rejected[name] = fresh[name].fingerprint
+                return errors
+
+            # Atomic swap; requests that pinned the old set keep it until they finish
+            self._assets = fresh
+            self.generation += 1
+            logger.info("Reloaded %s (generation %s)", ', '.join(targets), self.generation)
+        for callback in self._swap_callbacks:
+            callback(targets)
+        return errors
+
+    def reload_in_background(self, names=None):
+        thread = threading.Thread(target=self.reload, args=(names,), name='asset-reload', daemon=True)
+        thread.start()
+        return thread
+
+    def changed(self):
+        """Loaded assets whose source files differ from what was loaded"""
+        changed = []
+        for name, a in self._assets.items():
+            if not a.sources or a.fingerprint is None:
+                continue
+            fingerprint = [_file_fingerprint(path) for path in a.sources]
+            if fingerprint != a.fingerprint and fingerprint != self._rejected.get(name):
+                changed.append(name)
+        return changed
+
+    def watch(self, interval):
+        """Poll source files every `interval` seconds and reload what changed.
+        Cheap to call on every request: starts one thread per process."""
+        if not interval or self._watcher_pid == os.getpid():
+            return
+        with self._lock:
+            if self._watcher_pid == os.getpid():
+                return
+            self._watcher_pid = os.getpid()
+
+        def poll():
+            while True:
+                time.sleep(interval)
+                try:
+                    changed = self.changed()
+                    if changed:
+                        logger.info("Asset files changed: %s - reloading", ', '.join(changed))
+                        self.reload(changed)
+                except Exception:
+                    logger.exception("Asset watcher failed")
+
+        threading.Thread(target=poll, name='asset-watcher', daemon=True).start()
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def ready(self):
+        """True once every required asset has loaded successfully"""
+        return all(a.state == READY for a in self._assets.values() if a.required)
+
+    def report(self):
+        return {
+            name: {
+                'state': a.state,
+                'required': a.required,
+                'seconds': round(a.seconds, 4) if a.seconds is not None else None,
+                'version': a.version,
+                'error': a.error,
+            }
+            for name, a in self._assets.items()
+        }
@@ -0,0 +1,61 @@
+# Streaming NDJSON Responses
+# Large list responses (component lists, batch prediction and validation
+# results) can be sent as NDJSON - one JSON value per line - instead of a
+# single JSON document. Clients opt in with "Accept: application/x-ndjson".
+#
+# Rows are serialized one at a time and sent in chunks of about
+# DEFAULT_CHUNK_BYTES as they are produced, so a request never holds the
+# whole serialized body and the first bytes leave before the last row is
+# computed. Compressed streams are flushed chunk by chunk for the same
+# reason.
+
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Bytes of serialized rows collected before a chunk is sent
+DEFAULT_CHUNK_BYTES = 16 * 1024
+
+
+def ndjson_chunks(rows, dumps, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Encoded NDJSON for an iterable of rows, in chunks of about chunk_bytes
+
+    The first row goes out on its own, so time to first byte doesn't wait
+    for a full chunk.
+    """
+    buffer = []
+    size = 0
+    first = True
+    for row in rows:
+        line = (dumps(row) + '\n').encode('utf-8')
+        buffer.append(line)
+        size += len(line)
+        if first or size >= chunk_bytes:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+            first = False
+    if buffer:
+        yield b''.join(buffer)
+
+
+def compress_chunks(chunks, encoding):
+    """Compress a stream of chunks ('gzip', 'br' or None), flushing after
+    each chunk so the client can decode what has arrived"""
+    if encoding == 'gzip':
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+    elif encoding == 'br':
+        compressor = brotli.Compressor(quality=5)
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+    else:
+        yield from chunks
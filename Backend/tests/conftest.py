@@ -0,0 +1,21 @@
+# Tests run from the Backend folder: python -m pytest tests
+# (the app reads its data files relative to it)
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+# fake_firestore.py lives with the benchmarks
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'benchmarks'))
+os.chdir(BACKEND_DIR)
+# Importing app.py loads nothing up front; tests set the assets they use
+os.environ['ASSET_LOADING'] = 'lazy'
+
+
+@pytest.fixture(scope='session')
+def backend():
+    """The app module (assets load on first use)"""
+    import app
+    return app
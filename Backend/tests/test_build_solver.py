@@ -0,0 +1,99 @@
+# /api/manual/complete: input checks, and solver indexes built once per
+# catalog version give the same builds as indexes built per request.
+
+import pytest
+
+from build_solver import COMPONENTS, BuildSolver
+from catalog_cache import CatalogCache
+from component_store import FirestoreStore
+from fake_firestore import FakeFirestore, sample_catalog
+
+
+class FakeResolver:
+    """Deterministic hardware scores for the sample catalog's made-up names"""
+
+    @staticmethod
+    def score(name):
+        return sum(map(ord, name or '')) % 97
+
+
+@pytest.fixture
+def catalog(backend):
+    firestore = FakeFirestore(sample_catalog())
+    catalog = CatalogCache(FirestoreStore(firestore))
+    backend.assets.set('catalog', catalog)
+    backend.assets.set('hw_resolver', FakeResolver())
+    backend._solver_indexes.clear()
+    yield firestore, catalog
+    backend.assets.set('catalog', None)
+    backend.assets.set('hw_resolver', backend.build_hw_resolver(backend.assets.get('hw_db')))
+    backend._solver_indexes.clear()
+
+
+@pytest.fixture
+def client(backend, catalog):
+    return backend.app.test_client()
+
+
+def fresh_solve(backend, catalog, partial, budget, objective):
+    """The build an uncached solver finds for the same request"""
+    candidates = {}
+    for component, collection in backend.COMPONENT_COLLECTIONS.items():
+        docs = catalog.all(collection)
+        chosen = partial.get(component)
+        candidates[component] = [doc for doc in docs if doc['id'] == chosen] if chosen else docs
+    best, _ = BuildSolver(candidates, FakeResolver.score).solve(budget, objective, time_limit=5)
+    return best
+
+
+@pytest.mark.parametrize('body', [
+    {'budget': 'nan'},
+    {'budget': 'inf'},
+    {'budget': True},
+    {'budget': 1500, 'time_limit': 'nan'},
+    {'budget': 1500, 'time_limit': '-inf'},
+    {'budget': 1500, 'time_limit': -1},
+    {'budget': 1500, 'time_limit': 0},
+    {'budget': 1500, 'time_limit': True},
+])
+def test_bad_numbers_are_rejected(client, body):
+    response = client.post('/api/manual/complete', json=body)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+@pytest.mark.parametrize('objective', ['performance', 'gaming', 'productivity', 'cheapest'])
+@pytest.mark.parametrize('budget', [900, 1500, 2500, 4000])
+def test_cached_indexes_match_a_fresh_solver(backend, client, catalog, objective, budget):
+    _, cache = catalog
+    for partial in [{}, {'cpu': 'cpus_00003'}, {'case': 'cases_00001', 'ram': 'ram_00002'}]:
+        response = client.post('/api/manual/complete',
+                               json={'build': partial, 'budget': budget, 'objective': objective, 'time_limit': 5})
+        expected = fresh_solve(backend, cache, partial, budget, objective)
+        if expected is None:
+            assert response.status_code == 404
+            continue
+        result = response.get_json()
+        assert response.status_code == 200, result
+        assert result['build'] == expected['build']
+        assert result['total_price'] == expected['total_price']
+        assert result['score'] == expected['score']
+
+
+def test_indexes_are_reused_until_the_catalog_changes(backend, client, catalog):
+    firestore, cache = catalog
+    body = {'budget': 2000, 'time_limit': 5}
+    assert client.post('/api/manual/complete', json=body).status_code == 200
+    first = {component: backend._solver_indexes[component][1] for component in COMPONENTS}
+    assert client.post('/api/manual/complete', json=body).status_code == 200
+    assert all(backend._solver_indexes[component][1] is first[component] for component in COMPONENTS)
+
+    # A new GPU: only the GPU index is rebuilt, and the new part is searched
+    firestore.collection('gpus').document('gpus_99999').set(
+        {'Name': 'GPU 0001', 'TDP': 115, 'Length_cm': 17.0, 'Price': '$1.00'})
+    cache.invalidate('gpus')
+    response = client.post('/api/manual/complete', json={**body, 'objective': 'cheapest'})
+    assert backend._solver_indexes['gpu'][1] is not first['gpu']
+    assert all(backend._solver_indexes[component][1] is first[component]
+               for component in COMPONENTS if component != 'gpu')
+    assert response.get_json()['build']['gpu']['id'] == 'gpus_99999'
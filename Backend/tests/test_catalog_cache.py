@@ -0,0 +1,269 @@
+# CatalogCache over FirestoreStore (catalog_cache.py, component_store.py),
+# checked against a local fake Firestore client: results match direct
+# Firestore queries, repeated reads don't touch Firestore, and TTL,
+# version and explicit invalidation re-read it.
+
+import threading
+
+import pytest
+
+from catalog_cache import CatalogCache
+from component_store import FirestoreStore, SQLiteStore
+from fake_firestore import FakeFirestore, sample_catalog
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def firestore_query(db, collection, *filters):
+    """Documents as a plain Firestore query returns them (with 'id')"""
+    query = db.collection(collection)
+    for field, op, value in filters:
+        query = query.where(field, op, value)
+    return [dict(doc.to_dict(), id=doc.id) for doc in query.stream()]
+
+
+@pytest.fixture
+def db():
+    return FakeFirestore(sample_catalog(scale=2))
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def cache(db, clock):
+    return CatalogCache(FirestoreStore(db), ttl=300, clock=clock)
+
+
+# ----------------------------------------------------------------------------
+# Filters match Firestore
+# ----------------------------------------------------------------------------
+
+@pytest.mark.parametrize('collection', ['cpus', 'gpus', 'storage', 'psus'])
+def test_all_documents_in_stream_order(db, cache, collection):
+    assert cache.all(collection) == firestore_query(db, collection)
+
+
+@pytest.mark.parametrize('collection, field, value', [
+    ('motherboards', 'Socket', 'LGA1700'),
+    ('motherboards', 'Socket', 'AM5'),
+    ('ram', 'RAM_Type', 'DDR5'),
+    ('cases', 'Form_Factor', 'Mini-ITX'),
+    ('motherboards', 'Socket', 'no such socket'),
+])
+def test_where_equal(db, cache, collection, field, value):
+    assert cache.where(collection, field, value) == firestore_query(db, collection, (field, '==', value))
+
+
+@pytest.mark.parametrize('socket', ['LGA1200', 'AM4', 'AM5'])
+def test_where_array_contains(db, cache, socket):
+    expected = firestore_query(db, 'coolers', ('Supported_Sockets', 'array_contains', socket))
+    assert expected
+    assert cache.where('coolers', 'Supported_Sockets', socket) == expected
+
+
+@pytest.mark.parametrize('brand', ['Intel', 'amd', 'Other'])
+def test_cpus_by_brand(db, cache, brand):
+    expected = [doc for doc in firestore_query(db, 'cpus') if brand.lower() in doc['Name'].lower()]
+    assert cache.cpus_by_brand(brand) == expected
+
+
+@pytest.mark.parametrize('gpu_length', [0, 25.0, 33.3, 50])
+def test_cases_for(db, cache, gpu_length):
+    form_factors = ['ATX', 'Micro-ATX']
+    expected = firestore_query(db, 'cases', ('Form_Factor', 'in', form_factors),
+                               ('Max_GPU_Length_cm', '>=', gpu_length))
+    assert cache.cases_for(form_factors, gpu_length) == expected
+
+
+# ----------------------------------------------------------------------------
+# Hits and refresh
+# ----------------------------------------------------------------------------
+
+def test_one_firestore_read_per_collection(db, cache):
+    cache.where('motherboards', 'Socket', 'AM4')
+    calls = db.calls
+    for socket in ['AM4', 'AM5', 'LGA1700']:
+        cache.where('motherboards', 'Socket', socket)
+    cache.all('motherboards')
+    assert db.calls == calls
+    assert cache.misses == 1 and cache.hits == 4
+
+
+def test_ttl_expiry(db, cache, clock):
+    cache.all('gpus')
+    db.collection('gpus').document('gpus_99999').set({'Name': 'New GPU', 'Price': '$1.00'})
+
+    clock.now = 299
+    assert 'gpus_99999' not in [doc['id'] for doc in cache.all('gpus')]
+    clock.now = 300
+    assert 'gpus_99999' in [doc['id'] for doc in cache.all('gpus')]
+    assert cache.misses == 2
+
+
+def test_no_ttl_keeps_snapshots(db, clock):
+    cache = CatalogCache(FirestoreStore(db), ttl=None, clock=clock)
+    cache.all('psus')
+    clock.now = 10 ** 9
+    cache.all('psus')
+    assert cache.misses == 1
+
+
+def test_invalidate_one_collection(db, cache):
+    cache.all('gpus')
+    cache.all('cpus')
+    db.collection('gpus').document('gpus_00000').set({'Name': 'Renamed GPU', 'Price': '$1.00'})
+
+    cache.invalidate('gpus')
+    assert cache.all('gpus')[0]['Name'] == 'Renamed GPU'
+    assert set(cache.stats()['collections']) == {'gpus', 'cpus'}
+    assert cache.misses == 3
+
+
+def test_invalidate_everything(cache):
+    cache.all('gpus')
+    cache.all('cpus')
+    cache.invalidate()
+    assert cache.stats()['collections'] == {}
+    cache.all('gpus')
+    assert cache.misses == 3
+
+
+def test_version_document(db, clock):
+    db.collection('meta').document('catalog').set({'version': 1})
+    cache = CatalogCache(FirestoreStore(db, version_doc='meta/catalog'), ttl=None,
+                         version_check_interval=30, clock=clock)
+    cache.all('cases')
+    db.collection('cases').document('cases_00000').set({'Name': 'New Case', 'Form_Factor': 'ATX'})
+
+    # Not checked again before the interval; unchanged version keeps the cache
+    clock.now = 29
+    assert cache.all('cases')[0]['Name'] != 'New Case'
+    clock.now = 30
+    assert cache.all('cases')[0]['Name'] != 'New Case'
+
+    db.collection('meta').document('catalog').set({'version': 2})
+    clock.now = 60
+    assert cache.all('cases')[0]['Name'] == 'New Case'
+    assert cache.misses == 2
+
+
+def test_version_without_document(db):
+    assert FirestoreStore(db).version() is None
+    assert FirestoreStore(db, version_doc='meta/missing').version() is None
+
+
+def test_data_version_follows_content(db, cache):
+    before = cache.data_version('psus')
+    assert cache.data_version('psus') == before
+    db.collection('psus').document('psus_00000').set({'Name': 'Changed PSU', 'Price': '$1.00'})
+    cache.invalidate('psus')
+    assert cache.data_version('psus') != before
+
+
+# ----------------------------------------------------------------------------
+# App: catalog backend selection and routes
+# ----------------------------------------------------------------------------
+
+@pytest.fixture(autouse=True)
+def no_catalog_left(backend):
+    yield
+    backend.assets.set('catalog', None)
+
+
+def test_open_catalog_firestore(backend, db, monkeypatch):
+    monkeypatch.setattr(backend, 'CATALOG_BACKEND', 'auto')
+    catalog = backend.open_catalog(db)
+    assert isinstance(catalog, CatalogCache) and catalog.backend == 'firestore'
+
+
+def test_open_catalog_falls_back_to_sqlite(backend, tmp_path, monkeypatch):
+    path = str(tmp_path / 'catalog.sqlite')
+    SQLiteStore(path, read_only=False).replace_collection('gpus', [{'id': 'gpu-1', 'Name': 'GPU'}])
+    monkeypatch.setattr(backend, 'CATALOG_SQLITE_PATH', path)
+
+    monkeypatch.setattr(backend, 'CATALOG_BACKEND', 'auto')
+    catalog = backend.open_catalog(None)
+    assert isinstance(catalog, SQLiteStore)
+    assert catalog.all('gpus') == [{'Name': 'GPU', 'id': 'gpu-1'}]
+
+    monkeypatch.setattr(backend, 'CATALOG_BACKEND', 'firestore')
+    with pytest.raises(RuntimeError):
+        backend.open_catalog(None)
+
+
+def test_manual_routes_served_from_cache(backend, db):
+    catalog = CatalogCache(FirestoreStore(db))
+    backend.assets.set('catalog', catalog)
+    client = backend.app.test_client()
+
+    response = client.get('/api/manual/ram?ram_type=DDR4')
+    assert response.status_code == 200
+    assert response.get_json() == firestore_query(db, 'ram', ('RAM_Type', '==', 'DDR4'))
+    calls = db.calls
+    for url in ['/api/manual/ram?ram_type=DDR5', '/api/manual/ram?ram_type=DDR4']:
+        assert client.get(url).status_code == 200
+    assert db.calls == calls
+
+
+def test_invalidate_route(backend, db, monkeypatch):
+    monkeypatch.setattr(backend, 'ADMIN_TOKEN', 'secret')
+    catalog = CatalogCache(FirestoreStore(db))
+    backend.assets.set('catalog', catalog)
+    client = backend.app.test_client()
+    client.get('/api/manual/gpus')
+
+    assert client.post('/api/manual/cache/invalidate', json={'collection': 'gpus'}).status_code == 401
+    response = client.post('/api/manual/cache/invalidate', json={'collection': 'gpus'},
+                           headers={'X-Admin-Token': 'secret'})
+    assert response.status_code == 200
+    assert response.get_json()['invalidated'] == 'gpus'
+    assert 'gpus' not in catalog.stats()['collections']
+
+
+class SlowVersionStore(FirestoreStore):
+    """version() blocks until released, like a slow Firestore read"""
+
+    def __init__(self, db):
+        super().__init__(db, version_doc='meta/catalog')
+        self.fetching = threading.Event()
+        self.release = threading.Event()
+
+    def version(self):
+        self.fetching.set()
+        assert self.release.wait(5)
+        return super().version()
+
+
+def test_slow_version_check_does_not_block_hits(db, clock):
+    db.collection('meta').document('catalog').set({'version': 1})
+    store = SlowVersionStore(db)
+    store.release.set()
+    cache = CatalogCache(store, ttl=None, version_check_interval=30, clock=clock)
+    cache.all('cpus')
+
+    store.release.clear()
+    store.fetching.clear()
+    clock.now = 60
+    checking = threading.Thread(target=cache.all, args=('gpus',))
+    checking.start()
+    assert store.fetching.wait(5)
+
+    # While the version read hangs, another collection is still served
+    hit = threading.Thread(target=cache.all, args=('cpus',))
+    hit.start()
+    hit.join(2)
+    blocked = hit.is_alive()
+    store.release.set()
+    checking.join(5)
+    hit.join(5)
+    assert not blocked
+    assert cache.hits == 1 and cache.misses == 2
@@ -0,0 +1,71 @@
+# The build dataset as the app holds it (asset_snapshot.py +
+# compact_dataset.py): compiled to a snapshot, read back and compacted, it
+# still holds exactly what pd.read_csv reads from the CSV.
+
+import pandas as pd
+import pytest
+
+from asset_snapshot import compile_csv, read_dataset, snapshot_path
+from compact_dataset import USE_CASE_BITS, USE_CASE_COLUMN, category_mask, compact_builds, use_case_mask
+
+DATASETS = ['data/final_ruleset_data.csv', 'data/hardware_lookup.csv']
+
+
+def expand(compact, columns):
+    """A snapshot or compact frame back in the CSV's layout: strings, int64
+    and one 0/1 column per use-case flag, in the CSV's column order"""
+    data = {}
+    for name in columns:
+        if name in USE_CASE_BITS and USE_CASE_COLUMN in compact:
+            data[name] = ((compact[USE_CASE_COLUMN].to_numpy() & USE_CASE_BITS[name]) != 0).astype('int64')
+        elif isinstance(compact[name].dtype, pd.CategoricalDtype):
+            data[name] = compact[name].astype(object)
+        elif pd.api.types.is_integer_dtype(compact[name]):
+            data[name] = compact[name].astype('int64')
+        else:
+            data[name] = compact[name]
+    return pd.DataFrame(data, index=compact.index)
+
+
+@pytest.fixture(scope='module')
+def snapshot_dir(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('snapshot'))
+    for csv_path in DATASETS:
+        compile_csv(csv_path, path)
+    return path
+
+
+@pytest.mark.parametrize('csv_path', DATASETS)
+def test_snapshot_reads_like_the_csv(snapshot_dir, csv_path):
+    df, source = read_dataset(csv_path, snapshot_dir)
+    assert source == snapshot_path(csv_path, snapshot_dir)
+    expected = pd.read_csv(csv_path)
+    assert list(df.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(expand(df, expected.columns), expected)
+
+
+@pytest.mark.parametrize('use_snapshot', [True, False])
+def test_compact_builds_round_trip(snapshot_dir, use_snapshot):
+    csv_path = 'data/final_ruleset_data.csv'
+    df, _ = read_dataset(csv_path, snapshot_dir, use_snapshot=use_snapshot)
+    compact = compact_builds(df)
+    expected = pd.read_csv(csv_path)
+    assert USE_CASE_COLUMN in compact.columns
+    assert not any(name in compact.columns for name in USE_CASE_BITS)
+    pd.testing.assert_frame_equal(expand(compact, expected.columns), expected)
+
+
+def test_masks_match_csv_comparisons(snapshot_dir):
+    csv_path = 'data/final_ruleset_data.csv'
+    compact = compact_builds(read_dataset(csv_path, snapshot_dir)[0])
+    expected = pd.read_csv(csv_path)
+    for value in ['1080P', '1440P', '4K', '8K']:
+        assert (category_mask(compact['resolution'], value) == (expected['resolution'] == value).to_numpy()).all()
+    for flag in USE_CASE_BITS:
+        assert (use_case_mask(compact, flag) == (expected[flag] == 1).to_numpy()).all()
+
+
+def test_app_dataset_matches_the_csv(backend):
+    """What the app loaded, from whichever source it used"""
+    expected = pd.read_csv('data/final_ruleset_data.csv')
+    pd.testing.assert_frame_equal(expand(backend.assets.get('intelligent_df'), expected.columns), expected)
@@ -0,0 +1,225 @@
+# Measured FPS for Performance Prediction (fps_lookup.py): exact matches
+# checked against the original linear scan, nearest measured builds and
+# their interpolated FPS checked against a brute-force search over
+# final_ruleset_data.csv, and the "neighbours" field of
+# /api/performance/predict.
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fps_lookup import (NEAREST_MAX_DISTANCE, NEAREST_NEIGHBOURS, RAM_DISTANCE_WEIGHT, FpsLookupIndex,
+                        NearestFpsIndex)
+
+RESOLUTIONS = ['1080P', '1440P', '4K']
+
+
+@pytest.fixture(scope='module')
+def csv_df():
+    return pd.read_csv('data/final_ruleset_data.csv')
+
+
+@pytest.fixture(scope='module')
+def nearest_index(csv_df):
+    return NearestFpsIndex(csv_df)
+
+
+@pytest.fixture(scope='module')
+def measured(csv_df):
+    """{resolution: (scores [cpu, gpu, ram], fps)} of every measured build,
+    first CSV row of each, in CSV order"""
+    found = {}
+    for resolution in RESOLUTIONS:
+        rows = csv_df[csv_df['resolution'] == resolution].drop_duplicates(['cpu_score', 'gpu_score', 'ram_gb'])
+        found[resolution] = (rows[['cpu_score', 'gpu_score', 'ram_gb']].to_numpy(dtype=float),
+                             rows['fps'].to_numpy())
+    return found
+
+
+# ----------------------------------------------------------------------------
+# Exact matches (FpsLookupIndex)
+# ----------------------------------------------------------------------------
+
+def linear_scan(fps_lookup_df, cpu_score, gpu_score, ram_gb, resolution_name):
+    """find_exact_fps_from_csv as it was before the index (minus the print)"""
+    resolution_csv_format = resolution_name.upper().replace('P', 'P')  # "1080p" -> "1080P"
+    tolerance = 0.1
+    matches = fps_lookup_df[
+        (abs(fps_lookup_df['cpu_score'] - cpu_score) < tolerance) &
+        (abs(fps_lookup_df['gpu_score'] - gpu_score) < tolerance) &
+        (fps_lookup_df['ram_gb'] == ram_gb) &
+        (fps_lookup_df['resolution'] == resolution_csv_format)
+    ]
+    if len(matches) > 0:
+        return int(matches.iloc[0]['fps'])
+    return None
+
+
+def exact_queries(df, n=150, seed=0):
+    """Measured builds (every one measured more than once, and a sample of
+    the rest), the same scores nudged around the 0.1 tolerance, other RAM
+    sizes, and measured CPUs and GPUs that were never measured together"""
+    rng = np.random.default_rng(seed)
+    keys = df[['cpu_score', 'gpu_score', 'ram_gb']]
+    repeated = keys[keys.duplicated(keep=False)].drop_duplicates()
+    sample = keys.drop_duplicates().sample(n, random_state=seed)
+    queries = [tuple(row) for row in pd.concat([repeated, sample]).itertuples(index=False)]
+    for c, g, ram in sample.head(n // 3).itertuples(index=False):
+        for dc, dg in [(0.05, 0), (0, -0.0999), (0.1, 0), (0, -0.1), (-0.05, 0.05), (0.5, 0), (1, 1)]:
+            queries.append((c + dc, g + dg, ram))
+        for other_ram in (12, float(ram), ram * 2):
+            queries.append((c, g, other_ram))
+    cpus, gpus = df['cpu_score'].unique(), df['gpu_score'].unique()
+    for c, g in zip(rng.choice(cpus, n // 3), rng.choice(gpus, n // 3)):
+        queries.append((c, g, rng.choice([8, 16, 32, 64])))
+    return queries
+
+
+def test_exact_lookup_matches_linear_scan(csv_df):
+    index = FpsLookupIndex(csv_df)
+    found = 0
+    for cpu_score, gpu_score, ram_gb in exact_queries(csv_df):
+        measured = index.lookup_all(cpu_score, gpu_score, ram_gb)
+        for resolution in RESOLUTIONS:
+            expected = linear_scan(csv_df, cpu_score, gpu_score, ram_gb, resolution)
+            assert measured.get(resolution) == expected, (cpu_score, gpu_score, ram_gb, resolution)
+            assert index.lookup(cpu_score, gpu_score, ram_gb, resolution) == expected
+            found += expected is not None
+    assert found > 0
+
+
+def test_app_exact_match_matches_linear_scan(backend, csv_df):
+    """The app's index is built from the compact dataset, and takes
+    resolution names in any case"""
+    for cpu_score, gpu_score, ram_gb in exact_queries(csv_df, n=60, seed=1):
+        for resolution in ('1080p', '1440P', '4k'):
+            assert backend.find_exact_fps_from_csv(cpu_score, gpu_score, ram_gb, resolution) == \
+                linear_scan(csv_df, cpu_score, gpu_score, ram_gb, resolution)
+
+
+# ----------------------------------------------------------------------------
+# Nearest measured builds (NearestFpsIndex)
+# ----------------------------------------------------------------------------
+
+def brute_force_neighbours(measured, cpu_score, gpu_score, ram_gb, resolution):
+    """[(squared distance, cpu_score, gpu_score, ram_gb, fps)] of the k
+    nearest measured builds within the distance limit, nearest first,
+    first CSV row first on ties"""
+    points, fps = measured[resolution]
+    squared = ((points[:, 0] - cpu_score) ** 2 + (points[:, 1] - gpu_score) ** 2 +
+               ((points[:, 2] - ram_gb) * RAM_DISTANCE_WEIGHT) ** 2)
+    order = [i for i in np.argsort(squared, kind='stable') if squared[i] <= NEAREST_MAX_DISTANCE ** 2]
+    return [(squared[i], *points[i], fps[i]) for i in order[:NEAREST_NEIGHBOURS]]
+
+
+def brute_force_fps(measured, cpu_score, gpu_score, ram_gb, resolution):
+    found = brute_force_neighbours(measured, cpu_score, gpu_score, ram_gb, resolution)
+    if not found:
+        return None
+    if found[0][0] == 0:
+        return int(found[0][4])
+    weights = [1.0 / math.sqrt(point[0]) for point in found]
+    return int(round(sum(w * point[4] for w, point in zip(weights, found)) / sum(weights)))
+
+
+def query_grid(df, n=12, seed=0):
+    """Dataset builds, builds a little off the measured scores, and mixes
+    of measured CPUs and GPUs that were never measured together"""
+    rng = np.random.default_rng(seed)
+    cpus = df['cpu_score'].unique()
+    gpus = df['gpu_score'].unique()
+    queries = []
+    for c in rng.choice(cpus, n, replace=False):
+        for g in rng.choice(gpus, n, replace=False):
+            for ram in (8, 16, 32):
+                queries.append((float(c), float(g), ram))
+                queries.append((float(c) + rng.uniform(-900, 900), float(g) + rng.uniform(-900, 900), ram))
+    return queries
+
+
+def test_neighbours_match_brute_force(csv_df, measured, nearest_index):
+    for cpu_score, gpu_score, ram_gb in query_grid(csv_df):
+        for resolution in RESOLUTIONS:
+            expected = brute_force_neighbours(measured, cpu_score, gpu_score, ram_gb, resolution)
+            found = nearest_index.neighbours(cpu_score, gpu_score, ram_gb, resolution)
+            assert [(n['cpu_score'], n['gpu_score'], n['ram_gb'], n['fps']) for n in found] == \
+                [(c, g, r, f) for _, c, g, r, f in expected]
+            assert [n['distance'] for n in found] == pytest.approx([math.sqrt(p[0]) for p in expected])
+
+
+def test_interpolated_fps_matches_brute_force(csv_df, measured, nearest_index):
+    for cpu_score, gpu_score, ram_gb in query_grid(csv_df, seed=1):
+        for resolution in RESOLUTIONS:
+            assert nearest_index.interpolate(cpu_score, gpu_score, ram_gb, resolution) == \
+                brute_force_fps(measured, cpu_score, gpu_score, ram_gb, resolution)
+
+
+def test_nothing_beyond_max_distance(nearest_index):
+    assert nearest_index.neighbours(1e7, 1e7, 16, '1080P') == []
+    assert nearest_index.interpolate(1e7, 1e7, 16, '1080P') is None
+
+
+def test_predicted_fps_uses_nearest_measured_builds(backend, csv_df, measured):
+    """Live predictions (no table, no cache): the exact CSV row where there
+    is one, otherwise the interpolated FPS, and the formula only when
+    neither is there or the measured values don't fall with resolution"""
+    if backend.assets.get('fps_model') is not None:
+        pytest.skip("expected values use the formula that stands in for a missing FPS model")
+    queries = query_grid(csv_df, n=8, seed=2) + [(1e7, 1e7, 16)]
+    builds = [{'cpu': 'cpu', 'gpu': 'gpu', 'ram': ram, 'c_score': c, 'g_score': g} for c, g, ram in queries]
+    predictions = backend._predict_uncached(builds)
+    interpolated = 0
+    for (c, g, ram), prediction in zip(queries, predictions):
+        found = {}
+        for resolution in RESOLUTIONS:
+            exact = csv_df[(abs(csv_df['cpu_score'] - c) < 0.1) & (abs(csv_df['gpu_score'] - g) < 0.1) &
+                           (csv_df['ram_gb'] == ram) & (csv_df['resolution'] == resolution)]
+            fps = int(exact['fps'].iloc[0]) if len(exact) else brute_force_fps(measured, c, g, ram, resolution)
+            if fps is not None:
+                found[resolution] = fps
+                interpolated += not len(exact)
+        n_cpu = min(c / backend.MAX_CPU_SCORE, 1.0)
+        n_gpu = min(g / backend.MAX_GPU_SCORE, 1.0)
+        expected = backend.resolution_fps(found, 120 * (n_gpu * 0.6 + n_cpu * 0.4))
+        assert [result['fps'] for result in prediction['results']] == expected
+    assert interpolated > 0
+
+
+# ----------------------------------------------------------------------------
+# "neighbours" in /api/performance/predict
+# ----------------------------------------------------------------------------
+
+BUILD = {'cpu': 'Ryzen 5 5600X', 'gpu': 'RTX 3060', 'ram': 16}
+
+
+def test_predict_neighbours_opt_in(backend, nearest_index):
+    client = backend.app.test_client()
+    plain = client.post('/api/performance/predict', json=BUILD).get_json()
+    assert 'neighbours' not in plain
+
+    response = client.post('/api/performance/predict', json={**BUILD, 'neighbours': True})
+    assert response.status_code == 200
+    body = response.get_json()
+    neighbours = body.pop('neighbours')
+    assert body == plain
+    c_score, g_score = backend.get_score(BUILD['cpu']), backend.get_score(BUILD['gpu'])
+    assert neighbours == {res: nearest_index.neighbours(c_score, g_score, 16, res) for res in RESOLUTIONS}
+    assert neighbours['1080P'][0]['distance'] == 0
+
+
+def test_predict_neighbours_must_be_boolean(backend):
+    client = backend.app.test_client()
+    response = client.post('/api/performance/predict', json={**BUILD, 'neighbours': 'yes'})
+    assert response.status_code == 400
+
+
+def test_batch_neighbours_per_build(backend):
+    client = backend.app.test_client()
+    builds = [{**BUILD, 'neighbours': True}, BUILD, {**BUILD, 'neighbours': 1}]
+    results = client.post('/api/performance/predict/batch', json={'builds': builds}).get_json()['results']
+    single = client.post('/api/performance/predict', json=builds[0]).get_json()
+    assert results[0] == single
+    assert 'neighbours' not in results[1]
+    assert results[2] == {"error": "'neighbours' must be true or false"}
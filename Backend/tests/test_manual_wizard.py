@@ -0,0 +1,85 @@
+# /api/manual/wizard: the same lists and the same input errors as the
+# single /api/manual/<component> routes, and one query pool per process.
+
+import threading
+import time
+
+import pytest
+
+from catalog_cache import CatalogCache
+from component_store import FirestoreStore
+from fake_firestore import FakeFirestore, sample_catalog
+
+
+@pytest.fixture
+def client(backend):
+    backend.assets.set('catalog', CatalogCache(FirestoreStore(FakeFirestore(sample_catalog()))))
+    yield backend.app.test_client()
+    backend.assets.set('catalog', None)
+
+
+def test_lists_match_the_single_routes(client):
+    query = {'brand': 'Intel', 'socket': 'AM5', 'ram_type': 'DDR5', 'form_factor': 'Micro-ATX', 'gpu_length': '30'}
+    response = client.get('/api/manual/wizard', query_string=query)
+    assert response.status_code == 200
+    lists = response.get_json()
+    singles = {
+        'cpus': '/api/manual/cpus?brand=Intel',
+        'motherboards': '/api/manual/motherboards?socket=AM5',
+        'gpus': '/api/manual/gpus',
+        'ram': '/api/manual/ram?ram_type=DDR5',
+        'coolers': '/api/manual/coolers?socket=AM5',
+        'storage': '/api/manual/storage',
+        'psus': '/api/manual/psus',
+        'cases': '/api/manual/cases?form_factor=Micro-ATX&gpu_length=30',
+    }
+    assert set(lists) == set(singles)
+    for component, url in singles.items():
+        assert lists[component] == client.get(url).get_json(), component
+
+
+def test_zero_gpu_length_lists_cases(client):
+    lists = client.get('/api/manual/wizard?form_factor=ATX&gpu_length=0').get_json()
+    assert lists['cases'] == client.get('/api/manual/cases?form_factor=ATX&gpu_length=0').get_json()
+
+
+@pytest.mark.parametrize('query', [
+    'form_factor=ATX&gpu_length=abc',
+    'form_factor=ATX&gpu_length=nan',
+    'form_factor=ATX&gpu_length=-1',
+    'form_factor=ATX',
+    'gpu_length=30',
+])
+def test_bad_case_filters_are_rejected(client, query):
+    wizard = client.get(f'/api/manual/wizard?brand=Intel&{query}')
+    cases = client.get(f'/api/manual/cases?{query}')
+    assert wizard.status_code == cases.status_code == 400
+    assert wizard.get_json() == cases.get_json()
+
+
+def test_one_pool_per_process(backend, monkeypatch):
+    monkeypatch.setattr(backend, '_wizard_pool', None)
+    monkeypatch.setattr(backend, '_wizard_pool_pid', None)
+    created = []
+    real_executor = backend.ThreadPoolExecutor
+
+    def counting_executor(*args, **kwargs):
+        created.append(1)
+        time.sleep(0.05)  # widen the window for a second pool
+        return real_executor(*args, **kwargs)
+    monkeypatch.setattr(backend, 'ThreadPoolExecutor', counting_executor)
+
+    start = threading.Barrier(8)
+    pools = []
+
+    def first_request():
+        start.wait()
+        pools.append(backend.wizard_pool())
+    threads = [threading.Thread(target=first_request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(created) == 1
+    assert all(pool is pools[0] for pool in pools)
+    pools[0].shutdown()
@@ -0,0 +1,125 @@
+# Compiled models (model_runtime.py) must predict exactly what the sklearn
+# estimators they were compiled from predict. Small estimators are fitted
+# here on data shaped like the app's inputs (cpu_score, gpu_score, ram_gb,
+# resolution multiplier), since the shipped pickles can't be unpickled.
+
+import pickle
+
+import numpy as np
+import pytest
+
+from model_runtime import (
+    COMPILED_FORMAT, CompiledTrees, UnsupportedModelError, compile_estimator, compiled_path, is_current,
+    load_compiled, load_pickle, save_compiled,
+)
+
+sklearn = pytest.importorskip('sklearn')
+from sklearn.ensemble import (  # noqa: E402
+    ExtraTreesClassifier, RandomForestClassifier, RandomForestRegressor,
+)
+from sklearn.linear_model import LinearRegression, LogisticRegression, Ridge  # noqa: E402
+from sklearn.neighbors import KNeighborsRegressor  # noqa: E402
+from sklearn.tree import DecisionTreeClassifier, DecisionTreeRegressor  # noqa: E402
+
+
+def training_data(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([
+        rng.integers(2000, 60000, n), rng.integers(2000, 40000, n),
+        rng.choice([8, 16, 32, 64], n), rng.choice([1.0, 0.65, 0.42], n),
+    ]).astype(float)
+    fps = (X[:, 1] / 250 + X[:, 0] / 1000 + X[:, 2]) * X[:, 3] + rng.normal(0, 5, n)
+    return X, fps, (fps > 60).astype(int)
+
+
+def parity_rows(compiled, X, n_random=2000, seed=1):
+    """Training rows, random rows and rows sitting exactly on split thresholds"""
+    rng = np.random.default_rng(seed)
+    rows = [X, rng.uniform(X.min(axis=0), X.max(axis=0), size=(n_random, X.shape[1]))]
+    if isinstance(compiled, CompiledTrees):
+        internal = np.flatnonzero(~compiled.is_leaf)
+        on_split = X[rng.integers(len(X), size=len(internal))].copy()
+        on_split[np.arange(len(internal)), compiled.feature[internal]] = compiled.threshold[internal]
+        rows.append(on_split)
+    return np.vstack(rows)
+
+
+def compile_and_load(estimator, tmp_path):
+    path = str(tmp_path / 'model.npz')
+    save_compiled(*compile_estimator(estimator), path)
+    return load_compiled(path)
+
+
+X, FPS, GAMING = training_data()
+
+REGRESSORS = [
+    RandomForestRegressor(n_estimators=20, max_depth=10, random_state=0),
+    DecisionTreeRegressor(random_state=0),
+    LinearRegression(),
+    Ridge(alpha=1.0),
+]
+CLASSIFIERS = [
+    RandomForestClassifier(n_estimators=20, random_state=0),
+    ExtraTreesClassifier(n_estimators=20, random_state=0),
+    DecisionTreeClassifier(random_state=0),
+]
+
+
+@pytest.mark.parametrize('estimator', REGRESSORS, ids=lambda e: type(e).__name__)
+def test_regressor_parity(estimator, tmp_path):
+    estimator.fit(X, FPS)
+    compiled = compile_and_load(estimator, tmp_path)
+    rows = parity_rows(compiled, X)
+    np.testing.assert_array_equal(compiled.predict(rows), estimator.predict(rows))
+
+
+@pytest.mark.parametrize('estimator', CLASSIFIERS, ids=lambda e: type(e).__name__)
+def test_tree_classifier_parity(estimator, tmp_path):
+    estimator.fit(X, GAMING)
+    compiled = compile_and_load(estimator, tmp_path)
+    rows = parity_rows(compiled, X)
+    np.testing.assert_array_equal(compiled.predict(rows), estimator.predict(rows))
+    np.testing.assert_array_equal(compiled.predict_proba(rows), estimator.predict_proba(rows))
+
+
+def test_logistic_regression_parity(tmp_path):
+    estimator = LogisticRegression(max_iter=1000).fit(X / 10000, GAMING)
+    compiled = compile_and_load(estimator, tmp_path)
+    rows = parity_rows(compiled, X / 10000)
+    np.testing.assert_array_equal(compiled.predict(rows), estimator.predict(rows))
+
+
+def test_single_row_and_feature_count(tmp_path):
+    estimator = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, FPS)
+    compiled = compile_and_load(estimator, tmp_path)
+    assert compiled.predict(X[0]).tolist() == estimator.predict(X[:1]).tolist()
+    with pytest.raises(ValueError):
+        compiled.predict(X[:, :3])
+
+
+def test_unsupported_estimator():
+    with pytest.raises(UnsupportedModelError):
+        compile_estimator(KNeighborsRegressor().fit(X, FPS))
+
+
+def test_compiled_from_pickle_load(tmp_path):
+    estimator = DecisionTreeClassifier(random_state=0).fit(X, GAMING)
+    pkl_path = tmp_path / 'gaming_model.pkl'
+    with open(pkl_path, 'wb') as f:
+        pickle.dump(estimator, f)
+    path = compiled_path(str(pkl_path), str(tmp_path / 'compiled'))
+    assert path == str(tmp_path / 'compiled' / 'gaming_model.npz')
+    assert not is_current(path, str(pkl_path))
+
+    save_compiled(*compile_estimator(load_pickle(str(pkl_path))), path)
+    assert is_current(path, str(pkl_path))
+    np.testing.assert_array_equal(load_compiled(path).predict(X), estimator.predict(X))
+
+
+def test_other_format_rejected(tmp_path):
+    meta, arrays = compile_estimator(LinearRegression().fit(X, FPS))
+    meta['format'] = COMPILED_FORMAT - 1
+    path = str(tmp_path / 'old.npz')
+    save_compiled(meta, arrays, path)
+    with pytest.raises(ValueError):
+        load_compiled(path)
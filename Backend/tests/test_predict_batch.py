@@ -0,0 +1,80 @@
+# /api/performance/predict/batch: every result is exactly what
+# /api/performance/predict returns for that build, in input order, for JSON
+# and NDJSON responses alike.
+
+import json
+import random
+
+import pandas as pd
+import pytest
+
+
+def sample_builds(seed=0, n=60):
+    """Builds over hardware_lookup.csv names (spelled a few ways), plus
+    unknown parts and bad inputs the single route rejects"""
+    rng = random.Random(seed)
+    names = pd.read_csv('data/hardware_lookup.csv')['name'].tolist()
+    cpus = [name for name in names if not name.upper().startswith(('RTX', 'GTX', 'RX', 'ARC'))]
+    gpus = [name for name in names if name not in cpus]
+    spellings = [lambda s: s, str.lower, lambda s: f"  {s} ", lambda s: s.replace('-', ' ')]
+    builds = []
+    for _ in range(n):
+        build = {'cpu': rng.choice(spellings)(rng.choice(cpus)), 'gpu': rng.choice(spellings)(rng.choice(gpus))}
+        ram = rng.choice([None, 8, 16, 32, 64, 12, '32'])
+        if ram is not None:
+            build['ram'] = ram
+        if rng.random() < 0.2:
+            build['neighbours'] = True
+        builds.append(build)
+    builds += [
+        builds[0],  # the same build twice
+        {'cpu': 'No Such CPU 9000', 'gpu': gpus[0]},
+        {'cpu': cpus[0], 'gpu': 'No Such GPU 9000'},
+        {'cpu': 'No Such CPU 9000', 'gpu': 'No Such GPU 9000'},
+        {'cpu': cpus[0], 'gpu': gpus[0], 'neighbours': 'yes'},
+        {'cpu': cpus[0], 'gpu': gpus[0], 'ram': 'lots'},
+        {},
+    ]
+    return builds
+
+
+@pytest.fixture(scope='module')
+def client(backend):
+    return backend.app.test_client()
+
+
+@pytest.fixture(scope='module')
+def builds():
+    return sample_builds()
+
+
+@pytest.fixture(scope='module')
+def singles(client, builds):
+    return [client.post('/api/performance/predict', json=build).get_json() for build in builds]
+
+
+def test_batch_matches_single_route(client, builds, singles):
+    response = client.post('/api/performance/predict/batch', json={'builds': builds})
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert len(results) == len(builds)
+    for i, (result, single) in enumerate(zip(results, singles)):
+        assert result == single, (i, builds[i])
+
+
+def test_ndjson_matches_single_route(client, builds, singles):
+    response = client.post('/api/performance/predict/batch', json={'builds': builds},
+                           headers={'Accept': 'application/x-ndjson'})
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row.pop('index') for row in rows] == list(range(len(builds)))
+    assert rows == singles
+
+
+def test_ndjson_body_matches_single_route(client, builds, singles):
+    body = '\n'.join(json.dumps(build) for build in builds)
+    response = client.post('/api/performance/predict/batch', data=body,
+                           content_type='application/x-ndjson')
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row.pop('index') for row in rows] == list(range(len(builds)))
+    assert rows == singles
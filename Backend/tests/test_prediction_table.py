@@ -0,0 +1,78 @@
+# Precomputed predictions (prediction_table.py): table answers are exactly
+# the live _predict_uncached answers, and every module the live path runs
+# is part of the table's fingerprint.
+
+import os
+
+import numpy as np
+import pytest
+
+from prediction_table import PredictionTable, encode_predictions, write_table
+
+
+def scored_build(c_score, g_score, ram):
+    return {'cpu': 'some cpu', 'gpu': 'some gpu', 'ram': ram, 'c_score': c_score, 'g_score': g_score}
+
+
+def table_axes(backend, every=9):
+    """Every `every`-th hardware_lookup.csv score and every dataset RAM size"""
+    scores = sorted({int(score) for score in backend.assets.get('hw_db').values() if score})[::every]
+    rams = sorted(int(ram) for ram in backend.assets.get('intelligent_df')['ram_gb'].unique())
+    return scores, rams
+
+
+@pytest.fixture(scope='module')
+def small_table(backend, tmp_path_factory):
+    """A table over part of the axes, built the way build_prediction_table.py does"""
+    scores, rams = table_axes(backend)
+    n_res = len(backend.PREDICTION_RESOLUTIONS)
+    builds = [scored_build(c, g, ram) for c in scores for g in scores for ram in rams]
+    encoded = encode_predictions(backend._predict_uncached(builds), n_res)
+    shapes = {'fps': (n_res,), 'gaming': (n_res,), 'suitability': (n_res,), 'bottleneck_pct': (), 'bottleneck_type': ()}
+    arrays = {name: encoded[name].reshape((len(scores), len(scores), len(rams)) + shape)
+              for name, shape in shapes.items()}
+    path = str(tmp_path_factory.mktemp('prediction_table') / 'table')
+    manifest = {'fingerprint': backend.prediction_table_fingerprint(), 'scores': scores, 'rams': rams,
+                'resolutions': [res['name'] for res in backend.PREDICTION_RESOLUTIONS]}
+    write_table(path, manifest, arrays)
+    return PredictionTable(path), builds
+
+
+def test_lookup_matches_live(backend, small_table):
+    table, builds = small_table
+    live = backend._predict_uncached(builds)
+    assert [table.lookup(build) for build in builds] == live
+
+
+def test_lookup_fps_matches_live(backend, small_table):
+    table, builds = small_table
+    off_axis = [scored_build(b['c_score'] + 1, b['g_score'], b['ram']) for b in builds[:50]] + \
+        [scored_build(b['c_score'], b['g_score'], b['ram'] + 1) for b in builds[:50]]
+    queries = builds + off_axis
+    fps, found = table.lookup_fps([b['c_score'] for b in queries], [b['g_score'] for b in queries],
+                                  [b['ram'] for b in queries])
+    assert found.tolist() == [True] * len(builds) + [False] * len(off_axis)
+    live = [[result['fps'] for result in prediction['results']] for prediction in backend._predict_uncached(builds)]
+    assert fps[:len(builds)].tolist() == live
+    assert all(table.lookup(build) is None for build in off_axis)
+
+
+def test_built_table_matches_live(backend):
+    """The table in PREDICTION_TABLE_DIR, when it is there and current"""
+    if not os.path.exists(os.path.join(backend.PREDICTION_TABLE_DIR, 'manifest.json')):
+        pytest.skip("no prediction table built (scripts/build_prediction_table.py)")
+    table = PredictionTable(backend.PREDICTION_TABLE_DIR)
+    if table.fingerprint != backend.prediction_table_fingerprint():
+        pytest.skip("prediction table is out of date, the app predicts live")
+    rng = np.random.default_rng(0)
+    scores, rams = table.manifest['scores'], table.manifest['rams']
+    builds = [scored_build(int(c), int(g), int(ram)) for c, g, ram in
+              zip(rng.choice(scores, 500), rng.choice(scores, 500), rng.choice(rams, 500))]
+    assert [table.lookup(build) for build in builds] == backend._predict_uncached(builds)
+
+
+def test_prediction_modules_are_fingerprinted(backend):
+    """Modules that shape the data or the numbers behind a prediction"""
+    for module in ('asset_snapshot.py', 'compact_dataset.py', 'fps_lookup.py', 'model_runtime.py'):
+        assert module in backend.PREDICTION_TABLE_INPUTS
+
@@ -0,0 +1,143 @@
+# /api/intelligent/recommend answers from RecommendationIndex must be the
+# ones the original per-request DataFrame scan gave, ties included.
+# baseline_recommendation() below is that scan, unchanged, run on the
+# dataset as read from the CSV.
+
+import pandas as pd
+import pytest
+
+from recommendation_index import USE_CASE_LOGIC
+
+RESOLUTIONS = ['1080P', '1440P', '4K']
+BUDGETS = list(range(150, 4200, 53)) + [444, 999, 1500, 2500]
+FPS_TARGETS = [None, 30, 45, 60, 90, 120, 144, 240]
+
+
+def baseline_recommendation(intelligent_df, budget, resolution, use_case, fps=None):
+    """get_recommendation as it was before the index (app.py, unmodified)"""
+    if intelligent_df is None:
+        return {"error": "Dataset not loaded"}
+
+    use_case_logic = {
+        'Gaming': {'filter_col': 'is_good_for_gaming', 'rank_by': 'gpu_score'},
+        'Productivity': {'filter_col': 'is_good_for_productivity', 'rank_by': 'cpu_score'},
+        'Design/Render': {'filter_col': 'is_good_for_design_render', 'rank_by': 'combined_score'},
+        'Workstation': {'filter_col': 'is_good_for_workstation', 'rank_by': 'combined_score'}
+    }
+
+    if use_case not in use_case_logic:
+        return {"error": f"Invalid use_case. Choose from {list(use_case_logic.keys())}"}
+
+    logic = use_case_logic[use_case]
+
+    use_case_df = intelligent_df[intelligent_df[logic['filter_col']] == 1].copy()
+    if use_case_df.empty:
+        return {"error": f"No PC found for '{use_case}' in dataset."}
+
+    resolution_filtered = use_case_df[use_case_df['resolution'] == resolution].copy()
+    if resolution_filtered.empty:
+        return {
+            "error": f"No {use_case} PC found for {resolution} resolution.",
+            "suggestion": f"Try a different resolution. Available: {', '.join(use_case_df['resolution'].unique())}"
+        }
+
+    filtered_df = resolution_filtered[resolution_filtered['price'] <= budget].copy()
+    if filtered_df.empty:
+        cheapest = resolution_filtered.sort_values('price').iloc[0]
+        cheapest_price = int(cheapest['price'])
+        shortage = cheapest_price - budget
+        return {
+            "error": f"No {use_case} PC found for {resolution} within ${budget} budget.",
+            "suggestion": f"Cheapest {use_case} PC for {resolution} is ${cheapest_price} (shortage: ${shortage})"
+        }
+
+    if use_case == 'Gaming' and fps is not None:
+        filtered_df['fps_diff'] = abs(filtered_df['fps'] - fps)
+        meets_target = filtered_df[filtered_df['fps'] >= fps].copy()
+
+        if not meets_target.empty:
+            meets_target = meets_target.sort_values('fps_diff')
+            filtered_df = meets_target
+        else:
+            max_fps_available = filtered_df['fps'].max()
+            return {
+                "error": f"Cannot achieve {fps} FPS at {resolution} within ${budget} budget.",
+                "suggestion": f"Maximum achievable: {int(max_fps_available)} FPS at {resolution}. Increase budget or lower FPS target."
+            }
+
+    rank_col = logic['rank_by']
+    if rank_col == 'combined_score':
+        filtered_df['combined_score'] = filtered_df['cpu_score'] + filtered_df['gpu_score']
+
+    if use_case == 'Gaming' and fps is not None:
+        ranked_df = filtered_df.sort_values(by=['fps_diff', rank_col], ascending=[True, False])
+    else:
+        ranked_df = filtered_df.sort_values(by=rank_col, ascending=False)
+
+    best_pc = ranked_df.iloc[0]
+
+    recommendation = {
+        'CPU': best_pc['cpu'],
+        'GPU': best_pc['gpu'],
+        'RAM': f"{best_pc['ram_gb']}GB",
+        'Price': f"${best_pc['price']}",
+        'Resolution': best_pc['resolution'],
+        'CPU_Score': float(best_pc['cpu_score']),
+        'GPU_Score': float(best_pc['gpu_score']),
+        'FPS': int(best_pc['fps']) if use_case == 'Gaming' else None,
+        'ram_gb': int(best_pc['ram_gb'])
+    }
+
+    return recommendation
+
+
+@pytest.fixture(scope='module')
+def csv_df():
+    return pd.read_csv('data/final_ruleset_data.csv')
+
+
+@pytest.mark.parametrize('use_case', list(USE_CASE_LOGIC) + ['Office'])
+@pytest.mark.parametrize('resolution', RESOLUTIONS + ['8K'])
+def test_same_answers_as_the_dataframe_scan(backend, csv_df, use_case, resolution):
+    targets = FPS_TARGETS if use_case == 'Gaming' else [None, 60]
+    differences = []
+    for budget in BUDGETS:
+        for fps in targets:
+            expected = baseline_recommendation(csv_df, budget, resolution, use_case, fps)
+            actual = backend.get_recommendation(budget, resolution, use_case, fps)
+            if actual != expected:
+                differences.append((budget, fps, expected, actual))
+    assert not differences, f"{len(differences)} answers differ, first: {differences[0]}"
+
+
+def test_tie_resolved_like_the_scan(backend, csv_df):
+    # Several 1080P gaming builds within $444 share the best GPU score
+    expected = baseline_recommendation(csv_df, 444, '1080P', 'Gaming', 30)
+    assert backend.get_recommendation(444, '1080P', 'Gaming', 30) == expected
+
+
+@pytest.mark.parametrize('use_case, fps', [('Gaming', None), ('Gaming', 60), ('Productivity', None)])
+def test_top_builds_start_with_the_recommendation(backend, use_case, fps):
+    for budget in BUDGETS[::4]:
+        result = backend.get_recommendation(budget, '1440P', use_case, fps, top_k=5)
+        if 'error' in result:
+            continue
+        top = result.pop('Top_Builds')
+        assert top[0] == result
+        assert 1 <= len(top) <= 5
+
+
+@pytest.mark.parametrize('use_case, fps', [('Gaming', None), ('Gaming', 55), ('Gaming', 60), ('Workstation', None)])
+def test_budget_curve_matches_recommendations(backend, use_case, fps):
+    client = backend.app.test_client()
+    response = client.get('/api/intelligent/budget-curve',
+                          query_string={'use_case': use_case, 'resolution': '4K', **({'fps': fps} if fps else {})})
+    assert response.status_code == 200
+    steps = response.get_json()['steps']
+    for step, following in zip(steps, steps[1:] + [None]):
+        budgets = [step['min_budget']]
+        if following is not None:
+            budgets.append(following['min_budget'] - 1)
+        for budget in budgets:
+            build = {key: value for key, value in step.items() if key != 'min_budget'}
+            assert backend.get_recommendation(budget, '4K', use_case, fps) == build
@@ -0,0 +1,45 @@
+# /api/performance/upgrades: input checks, and every upgrade's FPS is what
+# /api/performance/predict returns for the upgraded build.
+
+import pytest
+
+BUILD = {'cpu': 'i5-11400', 'gpu': 'RTX3050', 'ram': 16}
+
+
+@pytest.fixture(scope='module')
+def client(backend):
+    return backend.app.test_client()
+
+
+@pytest.mark.parametrize('body', [
+    {},
+    {'budget': 'x'},
+    {'budget': True},
+    {'budget': False},
+    {'budget': 'nan'},
+    {'budget': 'inf'},
+    {'budget': -1},
+    {'budget': 100, 'limit': True},
+    {'budget': 100, 'limit': False},
+    {'budget': 100, 'limit': 0},
+    {'budget': 100, 'limit': 'x'},
+    {'budget': 100, 'ram': 0},
+    {'budget': 100, 'parts': ['RAM']},
+    {'budget': 100, 'resolution': '8K'},
+])
+def test_bad_input_is_rejected(client, body):
+    response = client.post('/api/performance/upgrades', json={**BUILD, **body})
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_upgrades_match_predict(client):
+    response = client.post('/api/performance/upgrades', json={**BUILD, 'budget': 400, 'limit': 5})
+    assert response.status_code == 200
+    upgrades = response.get_json()['upgrades']
+    assert upgrades
+    for upgrade in upgrades:
+        part = 'cpu' if upgrade['part'] == 'CPU' else 'gpu'
+        predicted = client.post('/api/performance/predict', json={**BUILD, part: upgrade['name']}).get_json()
+        assert [r['fps'] for r in upgrade['results']] == [r['fps'] for r in predicted['results']]
+        assert upgrade['results'][0]['bottleneck_pct'] == predicted['results'][0]['bottleneck_pct']
@@ -0,0 +1,157 @@
+# Upgrade Candidates for the "what-if" Upgrade Analyzer
+# Built once at load time from hardware_lookup.csv (scores) and
+# final_ruleset_data.csv (which parts are CPUs/GPUs, and prices).
+#
+# The dataset only prices whole builds, so part prices are estimated with
+# an additive least-squares fit: build price = CPU + GPU + RAM (+ a
+# constant). Only differences between two parts of the same kind are
+# used (the upgrade cost), and those don't depend on how the constant is
+# split between the parts. Parts in hardware_lookup.csv that never appear
+# in the dataset have no kind or price and are not candidates.
+#
+# Parts that are only ever built together with each other (e.g. a few
+# entry-level CPUs and GPUs) form a separate block: how their prices
+# compare to the rest isn't in the data, so upgrades are only offered
+# within the current part's block.
+#
+# Each kind keeps its parts sorted by estimated price, so the parts within
+# a budget are one binary search and a request only ever evaluates those.
+
+import numpy as np
+import pandas as pd
+
+PART_KINDS = {'CPU': 'cpu', 'GPU': 'gpu'}  # kind -> dataset column
+
+
+def clean_part_name(name):
+    """Same key as hw_db (lowercase, no spaces)"""
+    return str(name).lower().replace(" ", "")
+
+
+# Backfitting stops when no estimate moves by more than this many dollars
+PRICE_FIT_TOLERANCE = 1e-4
+PRICE_FIT_MAX_ROUNDS = 1000
+
+
+def estimate_part_prices(df):
+    """{(kind, clean name): (estimated price, block)} from whole-build prices
+
+    Least squares by backfitting: each part's price is the mean of what
+    its builds cost minus everything else in them, repeated until nothing
+    moves. Every round is a few bincounts over the builds, so the fit
+    stays cheap as the hardware table grows.
+    """
+    builds = df.drop_duplicates(['cpu', 'gpu', 'ram_gb'])
+    price = builds['price'].to_numpy(dtype=float)
+    groups = []
+    # Spellings of one part ("RTX3060TI", "RTX3060Ti") share one price
+    for values in [builds[column].map(clean_part_name) for column in PART_KINDS.values()] + [builds['ram_gb']]:
+        codes, levels = pd.factorize(values)
+        groups.append((codes, levels, np.bincount(codes, minlength=len(levels)), np.zeros(len(levels))))
+
+    residual = price - price.mean()
+    for _ in range(PRICE_FIT_MAX_ROUNDS):
+        moved = 0.0
+        for codes, levels, counts, effects in groups:
+            # Put this column's effects back, then refit them
+            residual += effects[codes]
+            new_effects = np.bincount(codes, weights=residual, minlength=len(levels)) / counts
+            moved = max(moved, float(np.abs(new_effects - effects).max()))
+            effects[:] = new_effects
+            residual -= effects[codes]
+        if moved < PRICE_FIT_TOLERANCE:
+            break
+
+    blocks = _part_blocks(groups[0][0], groups[1][0], len(groups[0][1]), len(groups[1][1]))
+    prices = {}
+    for kind, (codes, levels, counts, effects), kind_blocks in zip(PART_KINDS, groups, blocks):
+        for key, effect, block in zip(levels, effects.tolist(), kind_blocks.tolist()):
+            prices[(kind, key)] = (effect, block)
+    return prices
+
+
+def _part_blocks(cpu_codes, gpu_codes, n_cpus, n_gpus):
+    """(cpu blocks, gpu blocks): connected parts of the CPU-GPU graph,
+    labelled by their lowest CPU code"""
+    cpu_blocks = np.arange(n_cpus)
+    while True:
+        gpu_blocks = np.full(n_gpus, n_cpus)
+        np.minimum.at(gpu_blocks, gpu_codes, cpu_blocks[cpu_codes])
+        new_cpu_blocks = cpu_blocks.copy()
+        np.minimum.at(new_cpu_blocks, cpu_codes, gpu_blocks[gpu_codes])
+        if np.array_equal(new_cpu_blocks, cpu_blocks):
+            return cpu_blocks, gpu_blocks
+        cpu_blocks = new_cpu_blocks
+
+
+class _KindCandidates:
+    """Parts of one kind sorted by estimated price"""
+
+    def __init__(self, names, keys, scores, prices, blocks):
+        order = np.lexsort((np.array(names, dtype=object).astype(str), prices))
+        self.names = np.array(names, dtype=object)[order]
+        self.keys = [keys[i] for i in order]
+        self.scores = np.asarray(scores, dtype=np.int64)[order]
+        self.prices = np.asarray(prices, dtype=float)[order]
+        self.blocks = np.asarray(blocks, dtype=np.int64)[order]
+        self.position = {key: i for i, key in enumerate(self.keys)}
+
+
+class UpgradeCandidates:
+    """Priced CPU and GPU candidates; select() picks upgrades within a budget"""
+
+    def __init__(self, df, hw_db):
+        prices = estimate_part_prices(df)
+        self.kinds = {}
+        for kind, column in PART_KINDS.items():
+            names, keys, scores, part_prices, blocks = [], [], [], [], []
+            seen = set()
+            for name in pd.unique(df[column]):
+                key = clean_part_name(name)
+                if key in hw_db and (kind, key) in prices and key not in seen:
+                    seen.add(key)
+                    names.append(name)
+                    keys.append(key)
+                    scores.append(hw_db[key])
+                    part_prices.append(prices[(kind, key)][0])
+                    blocks.append(prices[(kind, key)][1])
+            self.kinds[kind] = _KindCandidates(names, keys, scores, part_prices, blocks)
+
+    def __len__(self):
+        return sum(len(c.keys) for c in self.kinds.values())
+
+    def price(self, kind, key):
+        """Estimated price of a part (hw_db key), or None if it isn't priced"""
+        candidates = self.kinds[kind]
+        i = candidates.position.get(key)
+        return None if i is None else float(candidates.prices[i])
+
+    def select(self, kind, current_key, current_score, budget):
+        """(names, scores, costs) of the parts of this kind (in the current
+        part's block) that score higher than the current one and cost at
+        most `budget` more. Costs are the estimated price difference (a
+        faster part can be cheaper)."""
+        candidates = self.kinds[kind]
+        i = candidates.position[current_key]
+        current_price = candidates.prices[i]
+        end = int(np.searchsorted(candidates.prices, current_price + budget, side='right'))
+        picked = np.flatnonzero((candidates.scores[:end] > current_score) &
+                                (candidates.blocks[:end] == candidates.blocks[i]))
+        return (candidates.names[picked], candidates.scores[picked],
+                candidates.prices[picked] - current_price)
+
+
+def gain_per_dollar(gains, costs):
+    """FPS gain per dollar of extra cost; inf where the upgrade costs
+    nothing (a faster part estimated cheaper than the current one)"""
+    costs = np.asarray(costs, dtype=float).reshape((-1,) + (1,) * (np.ndim(gains) - 1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(costs > 0, gains / np.maximum(costs, 1.0), np.inf)
+
+
+def rank_upgrades(gains, costs):
+    """Order of the candidates that gain FPS: free upgrades first, then by
+    FPS gain per dollar (costs below $1 count as $1), then by gain"""
+    per_dollar = gain_per_dollar(gains, costs)
+    keep = np.flatnonzero(gains > 0)
+    return keep[np.lexsort((-gains[keep], -per_dollar[keep]))]
@@ -0,0 +1,54 @@
+# Production WSGI Entry Point
+# App factory for gunicorn (settings in gunicorn.conf.py):
+#
+#   gunicorn -c gunicorn.conf.py "wsgi:create_app()"
+#
+# With preload_app (the default in gunicorn.conf.py) the app is imported
+# and create_app() runs once in the gunicorn master, before the workers
+# are forked:
+#
+# - every shared asset (datasets, indexes, models, prediction table) is
+#   loaded there, so all workers use the master's copy. The snapshots and
+#   the prediction table are memory-mapped files, the compiled models are
+#   NumPy arrays; neither is written to after loading, so their pages
+#   stay shared between the workers
+# - per-process assets (the Firebase client and the Manual Build catalog
+#   built on it) are NOT loaded in the master: gRPC clients don't survive
+#   fork(). ASSET_PER_PROCESS=worker (the default here) keeps them out of
+#   startup loading; each worker connects in load_worker_assets(), called
+#   from the post_worker_init hook
+# - the objects made while loading are moved out of the garbage
+#   collector's reach (gc.freeze), so collections in the workers don't
+#   write to - and so unshare - the pages they live on
+#
+# ASSET_LOADING=eager (the default) and background both finish loading the
+# shared assets before create_app() returns, since the master must not
+# fork with loader threads running. ASSET_LOADING=lazy skips the preload:
+# every worker then loads its own copies on first use.
+
+import gc
+import logging
+import os
+
+os.environ.setdefault('ASSET_LOADING', 'eager')
+os.environ.setdefault('ASSET_PER_PROCESS', 'worker')
+
+import app as backend  # noqa: E402
+
+logger = logging.getLogger('unicorn_pc')
+
+
+def create_app():
+    """The Flask app with every shared asset loaded (unless ASSET_LOADING=lazy)"""
+    if backend.ASSET_LOADING != 'lazy':
+        # Waits for a background load too, and leaves no loader threads behind
+        backend.assets.load('eager', backend.assets.names(per_process=False))
+    gc.collect()
+    gc.freeze()
+    logger.info("Shared assets loaded in process %s (%s objects frozen)", os.getpid(), gc.get_freeze_count())
+    return backend.app
+
+
+def load_worker_assets():
+    """Connect this worker's own Firebase client and catalog (after fork)"""
+    backend.assets.load('eager', backend.assets.names(per_process=True))
@@ -39,7 +39,7 @@ export const intelligentAPI = {
 
     /**
      * Get AI recommendation
-     * @param {Object} data - { budget, resolution, use_case, fps? }
+     * @param {Object} data - { budget, resolution, use_case, fps?, top_k?, pareto? }
      */
     getRecommendation: async (data) => {
         return apiCall('/api/intelligent/recommend', {
@@ -47,6 +47,15 @@ export const intelligentAPI = {
             body: JSON.stringify(data),
         });
     },
+
+    /**
+     * Best build for every budget (step function for the budget slider)
+     * @param {Object} params - { use_case, resolution, fps? }
+     */
+    getBudgetCurve: async (params) => {
+        const query = new URLSearchParams(params).toString();
+        return apiCall(`/api/intelligent/budget-curve?${query}`);
+    },
 };
 
 // ============================================================================
@@ -72,9 +81,11 @@ export const manualAPI = {
 
     /**
      * Get all GPUs
+     * @param {Object} query - optional { sort, fields, limit, cursor, q, min_<Field>, max_<Field>, eq_<Field> }
      */
-    getGPUs: async () => {
-        return apiCall('/api/manual/gpus');
+    getGPUs: async (query = {}) => {
+        const params = new URLSearchParams(query).toString();
+        return apiCall(`/api/manual/gpus${params ? `?${params}` : ''}`);
     },
 
     /**
@@ -95,16 +106,20 @@ export const manualAPI = {
 
     /**
      * Get all storage options
+     * @param {Object} query - optional { sort, fields, limit, cursor, q, min_<Field>, max_<Field>, eq_<Field> }
      */
-    getStorage: async () => {
-        return apiCall('/api/manual/storage');
+    getStorage: async (query = {}) => {
+        const params = new URLSearchParams(query).toString();
+        return apiCall(`/api/manual/storage${params ? `?${params}` : ''}`);
     },
 
     /**
      * Get all PSUs
+     * @param {Object} query - optional { sort, fields, limit, cursor, q, min_<Field>, max_<Field>, eq_<Field> }
      */
-    getPSUs: async () => {
-        return apiCall('/api/manual/psus');
+    getPSUs: async (query = {}) => {
+        const params = new URLSearchParams(query).toString();
+        return apiCall(`/api/manual/psus${params ? `?${params}` : ''}`);
     },
 
     /**
@@ -118,6 +133,30 @@ export const manualAPI = {
         );
     },
 
+    /**
+     * Every component list for the current selections in one request
+     * @param {Object} selections - { brand?, socket?, ram_type?, form_factor?, gpu_length? }
+     */
+    getWizard: async (selections) => {
+        const params = Object.fromEntries(
+            Object.entries(selections).filter(([, value]) => value !== undefined && value !== null && value !== '')
+        );
+        return apiCall(`/api/manual/wizard?${new URLSearchParams(params).toString()}`);
+    },
+
+    /**
+     * Fill in the missing parts of a build
+     * @param {Object} build - Parts chosen so far (same shape as validateBuild)
+     * @param {number} budget - Total budget in dollars
+     * @param {string} objective - 'performance', 'gaming', 'productivity' or 'cheapest'
+     */
+    completeBuild: async (build, budget, objective = 'performance') => {
+        return apiCall('/api/manual/complete', {
+            method: 'POST',
+            body: JSON.stringify({ build, budget, objective }),
+        });
+    },
+
     /**
      * Validate complete build
      * @param {Object} build - Complete build object
@@ -128,6 +167,17 @@ export const manualAPI = {
             body: JSON.stringify(build),
         });
     },
+
+    /**
+     * Validate many complete builds in one request
+     * @param {Array<Object>} builds - Complete build objects (up to 10000)
+     */
+    validateBuilds: async (builds) => {
+        return apiCall('/api/manual/validate/batch', {
+            method: 'POST',
+            body: JSON.stringify({ builds }),
+        });
+    },
 };
 
 // ============================================================================
@@ -145,6 +195,18 @@ export const performanceAPI = {
             body: JSON.stringify(data),
         });
     },
+
+    /**
+     * Predict performance for many builds in one request
+     * @param {Array} builds - [{ cpu, gpu, ram }, ...]
+     * @returns {Object} { results: [...] } in the same order as builds
+     */
+    predictBatch: async (builds) => {
+        return apiCall('/api/performance/predict/batch', {
+            method: 'POST',
+            body: JSON.stringify({ builds }),
+        });
+    },
 };
 
 // ============================================================================